@@ -0,0 +1 @@
+"""Scripts de medicion de rendimiento de la API (no forman parte del despliegue)."""
@@ -0,0 +1,138 @@
+"""PATCH de progreso concurrentes contra un archivo SQLite, con y sin los PRAGMA.
+
+Cada proceso simula un worker de Gunicorn con su propia app. Un proceso lee
+`/movies/?stream=1` lentamente (un cliente con poco ancho de banda), lo que
+mantiene abierta la lectura; el resto envia PATCH de progreso. Sin WAL el
+lector impide confirmar las escrituras y, pasado el timeout de pysqlite (5 s),
+los PATCH fallan con "database is locked". Con `SQLITE_PRAGMAS` todos los
+PATCH deben completarse.
+
+Uso:
+    python -m benchmarks.concurrency --workers 4 --requests 50 --hold 8
+"""
+
+from __future__ import annotations
+
+import argparse
+import multiprocessing
+import tempfile
+import time
+from collections import Counter
+from pathlib import Path
+
+from src import create_app
+from src.config import BaseConfig
+from src.extensions import db
+from src.models import WatchEntry
+from src.seed import SeedPlan, seed_database
+
+
+def make_config(uri: str, pragmas: bool) -> type:
+    return type(
+        "ConcurrencyConfig",
+        (BaseConfig,),
+        {
+            "SQLALCHEMY_DATABASE_URI": uri,
+            "SQLALCHEMY_ENGINE_OPTIONS": {},
+            "SQLITE_PRAGMAS": BaseConfig.SQLITE_PRAGMAS if pragmas else {},
+            "DETAIL_CACHE_MAX_SIZE": 0,
+            "STREAM_CHUNK_SIZE": 50,
+            "SQL_INSTRUMENTATION": False,
+        },
+    )
+
+
+def prepare(uri: str, workers: int) -> None:
+    """Crea el esquema y un usuario con watchlist por worker."""
+    app = create_app(make_config(uri, pragmas=False))
+    with app.app_context():
+        db.create_all()
+        with db.engine.connect() as conn:
+            seed_database(conn, SeedPlan(users=workers, movies=5000, series=300, entries=workers * 150, user_skew=0))
+        db.engine.dispose()
+
+
+def slow_reader(uri: str, pragmas: bool, hold: float) -> None:
+    """Consume el listado en streaming repartiendo la lectura en `hold` segundos."""
+    app = create_app(make_config(uri, pragmas))
+    response = app.test_client().get("/movies/?stream=1", buffered=False)
+    chunks = 5000 // 50
+    for _ in response.response:
+        time.sleep(hold / chunks)
+    response.close()
+
+
+def worker(uri: str, pragmas: bool, user_id: int, requests: int, queue) -> None:
+    app = create_app(make_config(uri, pragmas))
+    with app.app_context():
+        series_ids = [
+            entry.content_id
+            for entry in WatchEntry.query.filter_by(user_id=user_id, content_type="serie").order_by(WatchEntry.id)
+        ]
+        db.session.remove()
+
+    client = app.test_client()
+    headers = {"X-User-Id": str(user_id)}
+    statuses = Counter()
+    locked = 0
+    slowest = 0.0
+    for i in range(requests):
+        series_id = series_ids[i % len(series_ids)]
+        start = time.perf_counter()
+        response = client.patch(
+            f"/progress/series/{series_id}", headers=headers, json={"watched_episodes": i % 2, "current_episode": 1}
+        )
+        slowest = max(slowest, time.perf_counter() - start)
+        statuses[response.status_code] += 1
+        if "locked" in response.get_data(as_text=True):
+            locked += 1
+    queue.put((statuses, locked, slowest))
+
+
+def run(workers: int, requests: int, hold: float, pragmas: bool) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        uri = f"sqlite:///{Path(tmp) / 'concurrency.db'}"
+        prepare(uri, workers)
+
+        queue = multiprocessing.Queue()
+        reader = multiprocessing.Process(target=slow_reader, args=(uri, pragmas, hold))
+        reader.start()
+        time.sleep(1)  # el lector ya tiene la consulta abierta cuando empiezan los PATCH
+        processes = [
+            multiprocessing.Process(target=worker, args=(uri, pragmas, user_id, requests, queue))
+            for user_id in range(1, workers + 1)
+        ]
+        start = time.perf_counter()
+        for process in processes:
+            process.start()
+        results = [queue.get() for _ in processes]
+        for process in processes:
+            process.join()
+        reader.join()
+        elapsed = time.perf_counter() - start
+
+    statuses = sum((result[0] for result in results), Counter())
+    locked = sum(result[1] for result in results)
+    slowest = max(result[2] for result in results)
+    total = workers * requests
+    label = "con PRAGMA (WAL)" if pragmas else "sin PRAGMA"
+    print(
+        f"{label}: {total} PATCH en {elapsed:.1f} s ({total / elapsed:,.0f}/s)"
+        f" | ok={statuses[200]} errores={total - statuses[200]} 'database is locked'={locked}"
+        f" | PATCH mas lento {slowest:.2f} s"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--requests", type=int, default=50)
+    parser.add_argument("--hold", type=float, default=8.0, help="segundos que el lector mantiene abierto el stream")
+    args = parser.parse_args()
+
+    run(args.workers, args.requests, args.hold, pragmas=False)
+    run(args.workers, args.requests, args.hold, pragmas=True)
+
+
+if __name__ == "__main__":
+    main()
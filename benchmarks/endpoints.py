@@ -0,0 +1,353 @@
+"""Mide la latencia y las consultas de cada endpoint con el test client de Flask.
+
+Construye la app con `TestingConfig` (SQLite en memoria), carga un dataset
+sintetico escalable y ejecuta cada ruta de `movies`, `series`, `progress` y
+`health`. Los resultados se comparan contra una linea base en JSON y el
+proceso termina con codigo 1 si alguna ruta empeora mas que el umbral.
+
+Uso:
+    python -m benchmarks.endpoints                       # compara con la linea base
+    python -m benchmarks.endpoints --save                # regenera la linea base
+    python -m benchmarks.endpoints --scale 5 --repeat 100 --baseline /tmp/scale5.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import re
+import statistics
+import sys
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Callable
+
+from sqlalchemy import insert
+
+from src import create_app
+from src.config import TestingConfig
+from src.extensions import db
+from src.models import User, WatchEntry, WatchEvent
+from src.seed import SeedPlan, seed_database
+
+BASELINE_PATH = Path(__file__).resolve().parent / "baselines" / "endpoints.json"
+SERVER_TIMING_QUERIES = re.compile(r'db;dur=[\d.]+;desc="(\d+) queries"')
+
+
+class BenchmarkConfig(TestingConfig):
+    """TestingConfig con la instrumentacion activa y sin avisos en la salida."""
+
+    SQL_INSTRUMENTATION = True
+    SQL_SLOW_QUERY_MS = float("inf")
+    SQL_REPEAT_WARN_THRESHOLD = 0
+
+
+@dataclass(frozen=True)
+class Dataset:
+    """Tamaños del dataset; todos escalan linealmente con `--scale`."""
+
+    users: int
+    movies: int
+    series: int
+    entries: int
+
+    @classmethod
+    def from_scale(cls, scale: float) -> "Dataset":
+        return cls(
+            users=max(int(20 * scale), 2),
+            movies=max(int(1000 * scale), 200),
+            series=max(int(200 * scale), 200),
+            entries=max(int(3000 * scale), 500),
+        )
+
+    @property
+    def writer_id(self) -> int:
+        """Usuario sin entradas, reservado para las altas en la watchlist."""
+        return self.users + 1
+
+
+def seed(dataset: Dataset, seed_value: int) -> None:
+    """Carga el dataset con el mismo generador que `flask seed`.
+
+    El usuario 1 es el de mayor actividad, por lo que su watchlist es el peor
+    caso de lectura; ademas se le agrega un historial de eventos de 60 dias.
+    """
+    plan = SeedPlan(
+        users=dataset.users,
+        movies=dataset.movies,
+        series=dataset.series,
+        entries=dataset.entries,
+        seed=seed_value,
+    )
+    with db.engine.connect() as conn:
+        seed_database(conn, plan)
+        conn.execute(insert(User.__table__), [{"id": dataset.writer_id, "name": "writer"}])
+        now = datetime.now(timezone.utc)
+        events = dataset.entries // 10
+        conn.execute(insert(WatchEvent.__table__), [
+            {
+                "user_id": 1,
+                "content_type": "serie",
+                "content_id": n % dataset.series + 1,
+                "kind": "progress",
+                "status": "watching",
+                "watched_episodes": n % 10 + 1,
+                "episodes_delta": 1,
+                "occurred_at": now - timedelta(days=60) * (events - n) / events,
+            }
+            for n in range(events)
+        ])
+        conn.commit()
+
+
+@dataclass(frozen=True)
+class Case:
+    """Una ruta a medir; `build(i)` arma los argumentos de la iteracion i."""
+
+    name: str
+    build: Callable[[int], dict]
+
+
+def build_cases(dataset: Dataset, user_series: list[int]) -> list[Case]:
+    """Lecturas primero y escrituras despues; los borrados van al final."""
+    reader = {"X-User-Id": "1"}
+    writer = {"X-User-Id": str(dataset.writer_id)}
+    batch = user_series[:50]
+
+    def ndjson(lines: list[dict]) -> dict:
+        return {"data": "\n".join(json.dumps(line) for line in lines), "content_type": "application/x-ndjson"}
+
+    return [
+        Case("GET /health/", lambda i: {"method": "GET", "path": "/health/"}),
+        Case("GET /movies/", lambda i: {"method": "GET", "path": "/movies/"}),
+        Case("GET /movies/?limit=200", lambda i: {"method": "GET", "path": "/movies/?limit=200"}),
+        Case("GET /movies/?fields=id,title", lambda i: {"method": "GET", "path": "/movies/?fields=id,title"}),
+        Case("GET /movies/?stream=1", lambda i: {"method": "GET", "path": "/movies/?stream=1"}),
+        Case(
+            "GET /movies/?genre=&sort=",
+            lambda i: {"method": "GET", "path": "/movies/?genre=drama&year_from=1990&sort=-release_year"},
+        ),
+        Case("GET /movies/<id>", lambda i: {"method": "GET", "path": f"/movies/{i % dataset.movies + 1}"}),
+        Case("GET /series/", lambda i: {"method": "GET", "path": "/series/"}),
+        Case("GET /series/?stream=1", lambda i: {"method": "GET", "path": "/series/?stream=1"}),
+        Case("GET /series/<id>", lambda i: {"method": "GET", "path": f"/series/{i % dataset.series + 1}"}),
+        Case("GET /me/watchlist", lambda i: {"method": "GET", "path": "/me/watchlist", "headers": reader}),
+        Case(
+            "GET /me/watchlist?limit=200",
+            lambda i: {"method": "GET", "path": "/me/watchlist?limit=200", "headers": reader},
+        ),
+        Case("GET /search?q=", lambda i: {"method": "GET", "path": "/search?q=river"}),
+        Case("GET /autocomplete?prefix=", lambda i: {"method": "GET", "path": "/autocomplete?prefix=gol"}),
+        Case("GET /me/stats", lambda i: {"method": "GET", "path": "/me/stats", "headers": reader}),
+        Case("GET /me/summary", lambda i: {"method": "GET", "path": "/me/summary", "headers": reader}),
+        Case("GET /me/history", lambda i: {"method": "GET", "path": "/me/history", "headers": reader}),
+        Case("GET /me/history/daily", lambda i: {"method": "GET", "path": "/me/history/daily", "headers": reader}),
+        Case(
+            "POST /movies/",
+            lambda i: {"method": "POST", "path": "/movies/", "json": {"title": f"New {i}", "genre": "drama", "release_year": 2024}},
+        ),
+        Case(
+            "POST /movies/bulk",
+            lambda i: {
+                "method": "POST",
+                "path": "/movies/bulk",
+                **ndjson([{"title": f"Bulk {i}-{n}", "genre": "drama", "release_year": 2024} for n in range(100)]),
+            },
+        ),
+        Case(
+            "PUT /movies/<id>",
+            lambda i: {"method": "PUT", "path": f"/movies/{i % dataset.movies + 1}", "json": {"title": f"Edited {i}"}},
+        ),
+        Case(
+            "POST /series/",
+            lambda i: {
+                "method": "POST",
+                "path": "/series/",
+                "json": {"title": f"New {i}", "seasons": [{"number": n, "episodes_count": 10} for n in range(1, 4)]},
+            },
+        ),
+        Case(
+            "POST /series/bulk",
+            lambda i: {
+                "method": "POST",
+                "path": "/series/bulk",
+                **ndjson([
+                    {"title": f"Bulk {i}-{n}", "seasons": [{"number": 1, "episodes_count": 8}]} for n in range(100)
+                ]),
+            },
+        ),
+        Case(
+            "PUT /series/<id>",
+            lambda i: {"method": "PUT", "path": f"/series/{i % dataset.series + 1}", "json": {"title": f"Edited {i}"}},
+        ),
+        Case(
+            "POST /series/<id>/seasons",
+            lambda i: {
+                "method": "POST",
+                "path": f"/series/{user_series[i % len(user_series)]}/seasons",
+                "json": {"number": 100 + i, "episodes_count": 10},
+            },
+        ),
+        Case(
+            "POST /watchlist/movies/<id>",
+            lambda i: {"method": "POST", "path": f"/watchlist/movies/{i + 1}", "headers": writer},
+        ),
+        Case(
+            "POST /watchlist/series/<id>",
+            lambda i: {"method": "POST", "path": f"/watchlist/series/{i + 1}", "headers": writer},
+        ),
+        Case(
+            "PATCH /progress/series/<id>",
+            lambda i: {
+                "method": "PATCH",
+                "path": f"/progress/series/{user_series[i % len(user_series)]}",
+                "headers": reader,
+                "json": {"watched_episodes": i % 2, "current_season": 1, "current_episode": i % 2},
+            },
+        ),
+        Case(
+            "PATCH /progress/series",
+            lambda i: {
+                "method": "PATCH",
+                "path": "/progress/series",
+                "headers": reader,
+                "json": [{"series_id": series_id, "watched_episodes": i % 2} for series_id in batch],
+            },
+        ),
+        Case("DELETE /movies/<id>", lambda i: {"method": "DELETE", "path": f"/movies/{dataset.movies - i}"}),
+        Case("DELETE /series/<id>", lambda i: {"method": "DELETE", "path": f"/series/{dataset.series - i}"}),
+    ]
+
+
+def percentile(sorted_values: list[float], pct: float) -> float:
+    """Percentil por rango mas cercano sobre valores ya ordenados."""
+    index = max(int(round(pct / 100 * len(sorted_values))) - 1, 0)
+    return sorted_values[min(index, len(sorted_values) - 1)]
+
+
+def _timed_request(client, case: Case, i: int):
+    kwargs = case.build(i)
+    start = time.perf_counter()
+    response = client.open(**kwargs)
+    response.get_data()  # consume el cuerpo de las respuestas en streaming
+    return (time.perf_counter() - start) * 1000, response
+
+
+def run_case(client, case: Case, warmup: int, repeat: int) -> dict:
+    """Ejecuta la ruta `warmup + repeat` veces y resume solo las medidas.
+
+    El recolector de basura se pausa durante la ruta para que sus ciclos no
+    se cuelen como ruido en los percentiles.
+    """
+    timings = []
+    queries = []
+    gc.collect()
+    gc.disable()
+    try:
+        responses = [_timed_request(client, case, i) for i in range(warmup + repeat)]
+    finally:
+        gc.enable()
+
+    for i, (elapsed, response) in enumerate(responses):
+        if response.status_code >= 400:
+            raise RuntimeError(f"{case.name}: status {response.status_code} {response.get_data(as_text=True)[:200]}")
+        if i < warmup:
+            continue
+        timings.append(elapsed)
+        match = SERVER_TIMING_QUERIES.search(response.headers.get("Server-Timing", ""))
+        queries.append(int(match.group(1)) if match else -1)
+
+    timings.sort()
+    return {
+        "p50_ms": round(percentile(timings, 50), 3),
+        "p90_ms": round(percentile(timings, 90), 3),
+        "p99_ms": round(percentile(timings, 99), 3),
+        "max_ms": round(timings[-1], 3),
+        "mean_ms": round(statistics.fmean(timings), 3),
+        "queries": max(queries),
+    }
+
+
+def compare(results: dict, baseline: dict, threshold: float, min_delta_ms: float) -> list[str]:
+    """Lista de regresiones: p50 mas lento que el umbral o mas consultas."""
+    regressions = []
+    for name, current in results["routes"].items():
+        previous = baseline["routes"].get(name)
+        if previous is None:
+            continue
+        if current["queries"] > previous["queries"]:
+            regressions.append(f"{name}: consultas {previous['queries']} -> {current['queries']}")
+        limit = previous["p50_ms"] * (1 + threshold)
+        if current["p50_ms"] > limit and current["p50_ms"] - previous["p50_ms"] > min_delta_ms:
+            regressions.append(f"{name}: p50 {previous['p50_ms']:.3f} ms -> {current['p50_ms']:.3f} ms")
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scale", type=float, default=1.0)
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--warmup", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument("--save", action="store_true", help="guarda los resultados como nueva linea base")
+    parser.add_argument("--threshold", type=float, default=0.5, help="empeoramiento relativo tolerado del p50")
+    parser.add_argument("--min-delta-ms", type=float, default=1.0, help="diferencia absoluta minima para fallar")
+    parser.add_argument("--only", help="mide solo las rutas que contienen este texto")
+    args = parser.parse_args()
+
+    dataset = Dataset.from_scale(args.scale)
+    if args.warmup + args.repeat > min(dataset.movies, dataset.series) // 2:
+        parser.error("--warmup + --repeat supera el dataset; aumente --scale")
+
+    app = create_app(BenchmarkConfig)
+    with app.app_context():
+        db.create_all()
+        seed(dataset, args.seed)
+        user_series = [
+            entry.content_id
+            for entry in WatchEntry.query.filter_by(user_id=1, content_type="serie").order_by(WatchEntry.id)
+        ]
+        db.session.remove()
+
+    client = app.test_client()
+    results = {
+        "meta": {"scale": args.scale, "repeat": args.repeat, "seed": args.seed, "python": sys.version.split()[0]},
+        "routes": {},
+    }
+    print(f"{'ruta':<34}{'p50':>9}{'p90':>9}{'p99':>9}{'max':>9}{'queries':>9}")
+    for case in build_cases(dataset, user_series):
+        if args.only and args.only not in case.name:
+            continue
+        stats = run_case(client, case, args.warmup, args.repeat)
+        results["routes"][case.name] = stats
+        print(
+            f"{case.name:<34}{stats['p50_ms']:>9.2f}{stats['p90_ms']:>9.2f}"
+            f"{stats['p99_ms']:>9.2f}{stats['max_ms']:>9.2f}{stats['queries']:>9}"
+        )
+
+    if args.save:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(json.dumps(results, indent=2) + "\n")
+        print(f"linea base guardada en {args.baseline}")
+        return
+
+    if not args.baseline.exists():
+        print(f"sin linea base en {args.baseline}; use --save para crearla")
+        return
+
+    baseline = json.loads(args.baseline.read_text())
+    if baseline["meta"].get("scale") != args.scale:
+        print(f"aviso: la linea base usa scale={baseline['meta'].get('scale')}", file=sys.stderr)
+    regressions = compare(results, baseline, args.threshold, args.min_delta_ms)
+    if regressions:
+        print("regresiones:", *regressions, sep="\n  ")
+        sys.exit(1)
+    print("sin regresiones")
+
+
+if __name__ == "__main__":
+    main()
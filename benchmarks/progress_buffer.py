@@ -0,0 +1,123 @@
+"""Ticks de progreso con escritura sincronica contra el buffer de progreso.
+
+Simula un pico de `PATCH /progress/series/<id>`: `--ticks` actualizaciones
+repartidas entre `--viewers` pares (usuario, serie), como reproductores que
+informan el episodio cada pocos minutos. Se mide la latencia de cada request y
+las sentencias SQL y commits totales, en modo sincronico y con
+`PROGRESS_BUFFER_ENABLED` (incluido el vaciado final del buffer).
+
+Uso:
+    python -m benchmarks.progress_buffer --ticks 5000 --viewers 500
+"""
+
+from __future__ import annotations
+
+import argparse
+import shutil
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from sqlalchemy import event, select
+
+from src import create_app
+from src.config import TestingConfig
+from src.extensions import db, progress_buffer
+from src.models import WatchEntry
+from src.seed import SeedPlan, seed_database
+
+
+def make_config(uri: str, buffered: bool) -> type:
+    return type(
+        "ProgressBufferBenchmarkConfig",
+        (TestingConfig,),
+        {
+            "SQLALCHEMY_DATABASE_URI": uri,
+            "SQL_INSTRUMENTATION": False,
+            "PROGRESS_BUFFER_ENABLED": buffered,
+            # El vaciado periodico se deja fuera de la ventana medida; el final se mide aparte.
+            "PROGRESS_BUFFER_FLUSH_INTERVAL": 3600.0,
+            "PROGRESS_BUFFER_BATCH_SIZE": 10**9,
+        },
+    )
+
+
+def run(path: Path, buffered: bool, ticks: int, viewers: int) -> dict:
+    app = create_app(make_config(f"sqlite:///{path}", buffered))
+    counts = {"statements": 0, "commits": 0}
+
+    with app.app_context():
+        entries = db.session.execute(
+            select(WatchEntry.user_id, WatchEntry.content_id, WatchEntry.total_episodes)
+            .where(WatchEntry.content_type == "serie", WatchEntry.total_episodes > 1)
+            .order_by(WatchEntry.id)
+            .limit(viewers)
+        ).all()
+        db.session.remove()
+
+        @event.listens_for(db.engine, "before_cursor_execute")
+        def _statement(*args):
+            counts["statements"] += 1
+
+        @event.listens_for(db.engine, "commit")
+        def _commit(conn):
+            counts["commits"] += 1
+
+        client = app.test_client()
+        samples = []
+        start = time.perf_counter()
+        for i in range(ticks):
+            user_id, series_id, total = entries[i % len(entries)]
+            payload = {"watched_episodes": (i // len(entries)) % total, "current_season": 1}
+            tick = time.perf_counter()
+            response = client.patch(f"/progress/series/{series_id}", json=payload, headers={"X-User-Id": str(user_id)})
+            samples.append((time.perf_counter() - tick) * 1000)
+            assert response.status_code in (200, 202), response.get_json()
+        requests_s = time.perf_counter() - start
+
+        flush_start = time.perf_counter()
+        progress_buffer.flush()
+        flush_ms = (time.perf_counter() - flush_start) * 1000
+        db.engine.dispose()
+
+    samples.sort()
+    return {
+        "p50": statistics.median(samples),
+        "p99": samples[int(len(samples) * 0.99) - 1],
+        "requests_s": requests_s,
+        "flush_ms": flush_ms,
+        **counts,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--ticks", type=int, default=5_000)
+    parser.add_argument("--viewers", type=int, default=500)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        seeded = Path(tmp) / "seeded.db"
+        with create_app(make_config(f"sqlite:///{seeded}", False)).app_context():
+            db.create_all()
+            with db.engine.connect() as conn:
+                seed_database(conn, SeedPlan(users=2_000, movies=1_000, series=2_000, entries=50_000))
+            db.engine.dispose()
+
+        print(f"{args.ticks:,} ticks sobre {args.viewers:,} pares (usuario, serie)\n")
+        print(f"{'modo':<12}{'p50':>9}{'p99':>9}{'requests':>11}{'vaciado':>11}{'sentencias':>12}{'commits':>9}")
+        for buffered in (False, True):
+            # Cada modo parte de la misma base para escribir los mismos cambios.
+            path = Path(tmp) / f"progress-{int(buffered)}.db"
+            shutil.copy(seeded, path)
+            result = run(path, buffered, args.ticks, args.viewers)
+            print(
+                f"{'buffer' if buffered else 'sincronico':<12}"
+                f"{result['p50']:>7.2f}ms{result['p99']:>7.2f}ms{result['requests_s']:>10.2f}s"
+                f"{result['flush_ms']:>9.1f}ms{result['statements']:>12,}{result['commits']:>9,}"
+            )
+
+
+if __name__ == "__main__":
+    main()
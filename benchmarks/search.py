@@ -0,0 +1,97 @@
+"""Latencia de `GET /search` sobre un catalogo grande, comparada con un LIKE.
+
+Genera el catalogo con `src.seed` en un archivo SQLite temporal (los triggers
+cargan el indice FTS5 durante los INSERT) y mide cada consulta con el
+cliente de pruebas: primera pagina y pagina siguiente usando el cursor. Como
+referencia se mide el mismo filtro con `LIKE '%palabra%'` sobre ambas tablas:
+sin indice, ordenar por relevancia exige leer todas las coincidencias.
+
+Uso:
+    python -m benchmarks.search --titles 1000000 --repeat 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from sqlalchemy import text
+
+from src import create_app
+from src.config import TestingConfig
+from src.extensions import db
+from src.search import match_expression, match_terms
+from src.seed import SeedPlan, seed_database
+
+# Palabras frecuentes, intermedias y raras del vocabulario de `src.seed`, y prefijos.
+QUERIES = ("the", "river", "golden storm", "noche", "kalo", "mi", "sea wi")
+
+
+def make_config(uri: str) -> type:
+    return type(
+        "SearchBenchmarkConfig",
+        (TestingConfig,),
+        {"SQLALCHEMY_DATABASE_URI": uri, "SQL_INSTRUMENTATION": False},
+    )
+
+
+def timed(call, repeat: int) -> tuple[float, float]:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        call()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return statistics.median(samples), samples[int(len(samples) * 0.9) - 1]
+
+
+def run(titles: int, repeat: int, like_repeat: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        app = create_app(make_config(f"sqlite:///{Path(tmp) / 'search.db'}"))
+        with app.app_context():
+            db.create_all()
+            start = time.perf_counter()
+            with db.engine.connect() as conn:
+                seed_database(conn, SeedPlan(users=1, movies=titles * 4 // 5, series=titles // 5, entries=1))
+            print(f"catalogo de {titles:,} titulos indexado en {time.perf_counter() - start:.1f} s\n")
+
+            client = app.test_client()
+            print(f"{'consulta':<16}{'total':>9}{'p50':>9}{'p90':>9}{'pag 2':>9}{'LIKE':>10}")
+            for query in QUERIES:
+                path = f"/search?q={query}"
+                first = client.get(path).get_json()
+                cursor = first["next_cursor"]
+                total = db.session.execute(
+                    text("SELECT count(*) FROM title_search WHERE title_search MATCH :q"),
+                    {"q": match_expression(match_terms(query), "sqlite")},
+                ).scalar()
+
+                p50, p90 = timed(lambda: client.get(path), repeat)
+                second = timed(lambda: client.get(f"{path}&cursor={cursor}"), repeat)[0] if cursor else 0.0
+                like = timed(lambda: db.session.execute(
+                    text(
+                        "SELECT id, title FROM movies WHERE title LIKE :p "
+                        "UNION ALL SELECT id, title FROM serie WHERE title LIKE :p"
+                    ),
+                    {"p": f"%{query}%"},
+                ).all(), like_repeat)[0]
+                db.session.remove()
+                print(f"{query:<16}{total:>9,}{p50:>8.2f}ms{p90:>7.2f}ms{second:>7.2f}ms{like:>8.2f}ms")
+
+            db.engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--titles", type=int, default=1_000_000, help="peliculas + series del catalogo")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--like-repeat", type=int, default=3, help="repeticiones de la referencia con LIKE")
+    args = parser.parse_args()
+    run(args.titles, args.repeat, args.like_repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""Compara `to_dict` sobre objetos ORM contra los serializadores por proyeccion.
+
+Uso:
+    python -m benchmarks.serializers --rows 50000 --repeat 3
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+from sqlalchemy import insert
+from sqlalchemy.orm import selectinload
+
+from src import create_app
+from src.api.serializers import MOVIE_PROJECTION, WATCH_ENTRY_PROJECTION
+from src.config import TestingConfig
+from src.extensions import db
+from src.models import Movie, Serie, User, WatchEntry
+
+
+def seed(rows: int) -> None:
+    """Crea `rows` peliculas y `rows` series, todas en la watchlist de un usuario."""
+    db.session.execute(insert(User.__table__), [{"id": 1, "name": "bench"}])
+    db.session.execute(
+        insert(Movie.__table__),
+        [{"title": f"Movie {n}", "genre": "drama", "release_year": 1990 + n % 30} for n in range(rows)],
+    )
+    db.session.execute(
+        insert(Serie.__table__),
+        [{"title": f"Serie {n}", "total_seasons": 3, "total_episodes": 30} for n in range(rows)],
+    )
+    db.session.execute(
+        insert(WatchEntry.__table__),
+        [
+            {
+                "user_id": 1,
+                "content_type": content_type,
+                "content_id": n + 1,
+                "status": "watching",
+                "watched_episodes": n % 30,
+                "total_episodes": 30 if content_type == "serie" else None,
+            }
+            for n in range(rows)
+            for content_type in ("movie", "serie")
+        ],
+    )
+    db.session.commit()
+
+
+def orm_movies() -> list[dict]:
+    return [movie.to_dict() for movie in Movie.query.order_by(Movie.id).all()]
+
+
+def projected_movies() -> list[dict]:
+    serialize = MOVIE_PROJECTION.serializer()
+    return [serialize(row) for row in db.session.execute(MOVIE_PROJECTION.select().order_by(Movie.id))]
+
+
+def orm_watchlist() -> list[dict]:
+    entries = (
+        WatchEntry.query.filter_by(user_id=1)
+        .order_by(WatchEntry.id)
+        .options(selectinload(WatchEntry.movie), selectinload(WatchEntry.serie))
+        .all()
+    )
+    return [entry.to_dict() for entry in entries]
+
+
+def projected_watchlist() -> list[dict]:
+    stmt = WATCH_ENTRY_PROJECTION.select().where(WatchEntry.user_id == 1).order_by(WatchEntry.id)
+    serialize = WATCH_ENTRY_PROJECTION.serializer()
+    return [serialize(row) for row in db.session.execute(stmt)]
+
+
+def measure(fn, repeat: int) -> tuple[float, list[dict]]:
+    """Mejor tiempo de `repeat` corridas, con la sesion limpia en cada una."""
+    best = float("inf")
+    result = []
+    for _ in range(repeat):
+        db.session.expunge_all()
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=50_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    app = create_app(TestingConfig)
+    with app.app_context():
+        db.create_all()
+        seed(args.rows)
+
+        for name, orm_fn, projected_fn in (
+            ("movies", orm_movies, projected_movies),
+            ("watchlist", orm_watchlist, projected_watchlist),
+        ):
+            orm_time, orm_result = measure(orm_fn, args.repeat)
+            projected_time, projected_result = measure(projected_fn, args.repeat)
+            assert orm_result == projected_result, f"{name}: la salida difiere"
+            count = len(orm_result)
+            print(
+                f"{name}: {count} filas | to_dict {count / orm_time:,.0f} filas/s"
+                f" | proyeccion {count / projected_time:,.0f} filas/s"
+                f" | x{orm_time / projected_time:.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
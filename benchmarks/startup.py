@@ -0,0 +1,72 @@
+"""Mide el arranque en frio: imports + `create_app` y el primer request.
+
+Cada corrida usa un interprete nuevo, como un worker recien levantado en un
+hosting que escala a cero. Termina con codigo 1 si la mediana supera el
+presupuesto.
+
+Uso:
+    python -m benchmarks.startup --runs 5 --budget-ms 650
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Se ejecuta en un proceso aparte para que ningun import quede en cache.
+PROBE = """
+import json, time
+start = time.perf_counter()
+from src import create_app
+from src.config import TestingConfig
+imported = time.perf_counter()
+app = create_app(TestingConfig)
+created = time.perf_counter()
+with app.app_context():
+    from src.extensions import db
+    db.create_all()
+client = app.test_client()
+ready = time.perf_counter()
+assert client.get("/movies/").status_code == 200
+first = time.perf_counter()
+print(json.dumps({
+    "import_ms": (imported - start) * 1000,
+    "create_app_ms": (created - imported) * 1000,
+    "first_request_ms": (first - ready) * 1000,
+    "total_ms": (created - start + first - ready) * 1000,
+}))
+"""
+
+
+def probe() -> dict:
+    output = subprocess.run(
+        [sys.executable, "-c", PROBE], cwd=ROOT, check=True, capture_output=True, text=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=650.0, help="presupuesto para la mediana de total_ms")
+    args = parser.parse_args()
+
+    runs = [probe() for _ in range(args.runs)]
+    summary = {key: statistics.median(run[key] for run in runs) for key in runs[0]}
+    for key, value in summary.items():
+        print(f"{key:<18}{value:>9.1f} ms")
+
+    if summary["total_ms"] > args.budget_ms:
+        print(f"fuera de presupuesto: {summary['total_ms']:.0f} ms > {args.budget_ms:.0f} ms")
+        sys.exit(1)
+    print(f"dentro del presupuesto ({args.budget_ms:.0f} ms)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""Compara el costo de buscar en watch_entries antes y despues de los indices.
+
+Uso:
+    python -m benchmarks.watch_entry_lookup --rows 1000000 --lookups 2000
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from sqlalchemy import bindparam, create_engine, insert, select
+
+from src.models import WatchEntry
+
+
+def build_table(engine, rows: int, batch_size: int, rng: random.Random) -> None:
+    """Crea watch_entries sin indices secundarios y la llena con filas unicas."""
+    table = WatchEntry.__table__
+    table.metadata.create_all(engine, tables=[table.metadata.tables["users"], table])
+    for index in table.indexes:
+        index.drop(engine)
+
+    users = max(rows // 200, 1)
+    with engine.begin() as conn:
+        batch = []
+        for n in range(rows):
+            batch.append({
+                "user_id": n % users + 1,
+                "content_type": "movie" if n % 2 else "serie",
+                "content_id": n // users + 1,
+                "status": "watching",
+                "watched_episodes": rng.randint(0, 20),
+                "total_episodes": 20,
+            })
+            if len(batch) >= batch_size:
+                conn.execute(insert(table), batch)
+                batch = []
+        if batch:
+            conn.execute(insert(table), batch)
+
+
+def time_lookups(engine, keys: list[tuple[int, str, int]]) -> float:
+    """Devuelve el promedio en milisegundos de la busqueda usada por ProgressService."""
+    table = WatchEntry.__table__
+    stmt = select(table.c.id).where(
+        table.c.user_id == bindparam("user_id"),
+        table.c.content_type == bindparam("content_type"),
+        table.c.content_id == bindparam("content_id"),
+    )
+    with engine.connect() as conn:
+        start = time.perf_counter()
+        for user_id, content_type, content_id in keys:
+            conn.execute(stmt, {
+                "user_id": user_id,
+                "content_type": content_type,
+                "content_id": content_id,
+            }).first()
+        elapsed = time.perf_counter() - start
+    return elapsed / len(keys) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--lookups", type=int, default=2_000)
+    parser.add_argument("--batch-size", type=int, default=50_000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{Path(tmp) / 'bench.db'}")
+        build_table(engine, args.rows, args.batch_size, rng)
+
+        users = max(args.rows // 200, 1)
+        keys = []
+        for _ in range(args.lookups):
+            n = rng.randrange(args.rows)
+            keys.append((n % users + 1, "movie" if n % 2 else "serie", n // users + 1))
+
+        # Sin indice cada busqueda recorre la tabla completa: basta una muestra.
+        before = time_lookups(engine, keys[: max(len(keys) // 20, 1)])
+        for index in WatchEntry.__table__.indexes:
+            index.create(engine)
+        after = time_lookups(engine, keys)
+        engine.dispose()
+
+    print(f"filas={args.rows} busquedas={args.lookups}")
+    print(f"sin indice: {before:.3f} ms/busqueda")
+    print(f"con indice: {after:.3f} ms/busqueda")
+    print(f"mejora: x{before / after:.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""Configuracion de Gunicorn para produccion.
+
+La app se carga una sola vez en el proceso maestro (`preload_app`) y los
+workers la heredan por fork, compartiendo memoria por copy-on-write. Tras el
+fork cada worker descarta el pool heredado para no compartir conexiones.
+
+Variables de entorno:
+    PORT                   puerto de escucha (8000)
+    WEB_CONCURRENCY        cantidad de workers; por defecto se calcula por CPU
+    GUNICORN_MAX_WORKERS   tope del calculo automatico (8)
+    GUNICORN_WORKER_CLASS  "gthread" (defecto) o "sync"
+    GUNICORN_THREADS       hilos por worker en modo gthread (4)
+    GUNICORN_TIMEOUT       segundos antes de reiniciar un worker colgado (30)
+"""
+
+import gc
+import os
+
+wsgi_app = "wsgi:app"
+bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
+preload_app = True
+
+worker_class = os.getenv("GUNICORN_WORKER_CLASS", "gthread")
+# sched_getaffinity respeta los CPU asignados al contenedor; cpu_count ve los del host.
+_cpus = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else (os.cpu_count() or 1)
+_max_workers = int(os.getenv("GUNICORN_MAX_WORKERS", "8"))
+
+if worker_class == "gthread":
+    # Las consultas liberan el GIL mientras esperan a la base: pocos procesos
+    # con varios hilos rinden como muchos workers sync con menos memoria.
+    # Cada hilo usa una conexion; mantener threads <= DB_POOL_SIZE + DB_MAX_OVERFLOW.
+    threads = int(os.getenv("GUNICORN_THREADS", "4"))
+    workers = int(os.getenv("WEB_CONCURRENCY") or min(_cpus + 1, _max_workers))
+else:
+    threads = 1
+    workers = int(os.getenv("WEB_CONCURRENCY") or min(_cpus * 2 + 1, _max_workers))
+
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "30"))
+graceful_timeout = 30
+keepalive = 5
+# Reciclar workers de a poco acota la memoria si algo crece sin control.
+max_requests = 2000
+max_requests_jitter = 200
+
+accesslog = "-"
+errorlog = "-"
+
+
+def when_ready(server):
+    """Prepara el estado compartido y congela los objetos antes de los forks.
+
+    El indice de autocompletado se construye una vez en el maestro y los
+    workers lo heredan. `gc.freeze()` evita que el GC de cada worker recorra
+    (y escriba) esas paginas, asi la memoria sigue compartida con el maestro.
+    """
+    from src.extensions import autocomplete
+    from wsgi import app
+
+    with app.app_context():
+        try:
+            autocomplete.warm()
+        except Exception:
+            # Sin tablas (p. ej. antes de migrar) se construye en el primer request.
+            server.log.exception("no se pudo precargar el indice de autocompletado")
+
+    gc.freeze()
+    server.log.info("workers=%s threads=%s worker_class=%s", workers, threads, worker_class)
+
+
+def post_fork(server, worker):
+    """Descarta el pool heredado: cada worker abre sus propias conexiones."""
+    from src.extensions import db
+    from wsgi import app
+
+    with app.app_context():
+        for engine in db.engines.values():
+            engine.dispose(close=False)
+
+
+def worker_exit(server, worker):
+    """Escribe el progreso diferido que el worker tenga pendiente antes de salir."""
+    from src.extensions import progress_buffer
+    from wsgi import app
+
+    with app.app_context():
+        try:
+            progress_buffer.flush()
+        except Exception:
+            server.log.exception("no se pudo escribir el progreso diferido al cerrar el worker")
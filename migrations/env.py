@@ -51,6 +51,24 @@ def get_metadata():
     return target_db.metadata
 
 
+# Indice de busqueda creado a mano por c47e2a9f1b06 y `src.search` (no esta en
+# los modelos): la tabla FTS5 `title_search` y sus tablas internas en SQLite, y
+# la columna `title_tsv` con su indice GIN en Postgres. Sin este filtro el
+# autogenerate propone borrarlos.
+SEARCH_TABLE = 'title_search'
+SEARCH_COLUMN = 'title_tsv'
+
+
+def include_name(name, type_, parent_names):
+    if type_ == 'table':
+        return name != SEARCH_TABLE and not name.startswith(SEARCH_TABLE + '_')
+    if type_ == 'column':
+        return name != SEARCH_COLUMN
+    if type_ == 'index':
+        return not name.endswith('_' + SEARCH_COLUMN)
+    return True
+
+
 def run_migrations_offline():
     """Run migrations in 'offline' mode.
 
@@ -65,7 +83,8 @@ def run_migrations_offline():
     """
     url = config.get_main_option("sqlalchemy.url")
     context.configure(
-        url=url, target_metadata=get_metadata(), literal_binds=True
+        url=url, target_metadata=get_metadata(), literal_binds=True,
+        include_name=include_name
     )
 
     with context.begin_transaction():
@@ -93,6 +112,7 @@ def run_migrations_online():
     conf_args = current_app.extensions['migrate'].configure_args
     if conf_args.get("process_revision_directives") is None:
         conf_args["process_revision_directives"] = process_revision_directives
+    conf_args.setdefault("include_name", include_name)
 
     connectable = get_engine()
 
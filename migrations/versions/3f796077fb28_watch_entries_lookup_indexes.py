@@ -0,0 +1,43 @@
+"""watch_entries lookup indexes
+
+Revision ID: 3f796077fb28
+Revises: e51bddd7a406
+Create Date: 2026-10-18 10:12:41.204511
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f796077fb28'
+down_revision = 'e51bddd7a406'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Se eliminan duplicados previos (se conserva la entrada mas reciente)
+    # para que el indice unico pueda crearse.
+    op.execute(sa.text(
+        "DELETE FROM watch_entries WHERE id NOT IN ("
+        "SELECT MAX(id) FROM watch_entries GROUP BY user_id, content_type, content_id)"
+    ))
+
+    with op.batch_alter_table('watch_entries', schema=None) as batch_op:
+        batch_op.create_index(
+            'uq_watch_entries_user_content',
+            ['user_id', 'content_type', 'content_id'],
+            unique=True,
+        )
+        batch_op.create_index(
+            'ix_watch_entries_user_updated',
+            ['user_id', 'updated_at', 'id'],
+            unique=False,
+        )
+
+
+def downgrade():
+    with op.batch_alter_table('watch_entries', schema=None) as batch_op:
+        batch_op.drop_index('ix_watch_entries_user_updated')
+        batch_op.drop_index('uq_watch_entries_user_content')
@@ -0,0 +1,40 @@
+"""serie denormalized totals
+
+Revision ID: 6e62d26ca2a7
+Revises: 3f796077fb28
+Create Date: 2026-10-18 11:03:27.518930
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '6e62d26ca2a7'
+down_revision = '3f796077fb28'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('serie', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('total_seasons', sa.Integer(), server_default='0', nullable=False))
+        batch_op.add_column(sa.Column('total_episodes', sa.Integer(), server_default='0', nullable=False))
+
+    # Backfill de los totales a partir de las temporadas existentes.
+    op.execute(sa.text(
+        "UPDATE serie SET "
+        "total_seasons = (SELECT COUNT(*) FROM season WHERE season.series_id = serie.id), "
+        "total_episodes = (SELECT COALESCE(SUM(episodes_count), 0) FROM season WHERE season.series_id = serie.id)"
+    ))
+    op.execute(sa.text(
+        "UPDATE watch_entries SET total_episodes = ("
+        "SELECT serie.total_episodes FROM serie WHERE serie.id = watch_entries.content_id) "
+        "WHERE content_type = 'serie'"
+    ))
+
+
+def downgrade():
+    with op.batch_alter_table('serie', schema=None) as batch_op:
+        batch_op.drop_column('total_episodes')
+        batch_op.drop_column('total_seasons')
@@ -0,0 +1,43 @@
+"""user summary
+
+Revision ID: 9b1c4e7a2d53
+Revises: 6e62d26ca2a7
+Create Date: 2026-10-18 15:12:40.183275
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9b1c4e7a2d53'
+down_revision = '6e62d26ca2a7'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('user_summary',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('entries', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('watching', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('completed', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('episodes_watched', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('user_id')
+    )
+
+    # Backfill desde las entradas existentes.
+    op.execute(sa.text(
+        "INSERT INTO user_summary (user_id, entries, watching, completed, episodes_watched, updated_at) "
+        "SELECT user_id, COUNT(*), "
+        "SUM(CASE WHEN status = 'watching' THEN 1 ELSE 0 END), "
+        "SUM(CASE WHEN status = 'completed' THEN 1 ELSE 0 END), "
+        "COALESCE(SUM(watched_episodes), 0), CURRENT_TIMESTAMP "
+        "FROM watch_entries GROUP BY user_id"
+    ))
+
+
+def downgrade():
+    op.drop_table('user_summary')
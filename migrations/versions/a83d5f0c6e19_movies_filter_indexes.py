@@ -0,0 +1,41 @@
+"""movies filter indexes
+
+Revision ID: a83d5f0c6e19
+Revises: c47e2a9f1b06
+Create Date: 2026-10-18 19:02:37.518204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a83d5f0c6e19'
+down_revision = 'c47e2a9f1b06'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('movies', schema=None) as batch_op:
+        batch_op.create_index(
+            'ix_movies_genre_release_year',
+            ['genre', 'release_year', 'id'],
+            unique=False,
+        )
+        batch_op.create_index(
+            'ix_movies_release_year',
+            ['release_year', 'id'],
+            unique=False,
+        )
+
+    # Indice de expresion para el prefijo y el orden por titulo sin mayusculas.
+    op.create_index('ix_movies_title_lower', 'movies', [sa.text('lower(title)'), 'id'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_movies_title_lower', table_name='movies')
+
+    with op.batch_alter_table('movies', schema=None) as batch_op:
+        batch_op.drop_index('ix_movies_release_year')
+        batch_op.drop_index('ix_movies_genre_release_year')
@@ -0,0 +1,32 @@
+"""updated_at indexes
+
+Revision ID: b6d40e2c9a15
+Revises: f3a1c9d27b84
+Create Date: 2026-10-19 16:41:08.205734
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b6d40e2c9a15'
+down_revision = 'f3a1c9d27b84'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('movies', schema=None) as batch_op:
+        batch_op.create_index('ix_movies_updated_at', ['updated_at'], unique=False)
+
+    with op.batch_alter_table('serie', schema=None) as batch_op:
+        batch_op.create_index('ix_serie_updated_at', ['updated_at'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('serie', schema=None) as batch_op:
+        batch_op.drop_index('ix_serie_updated_at')
+
+    with op.batch_alter_table('movies', schema=None) as batch_op:
+        batch_op.drop_index('ix_movies_updated_at')
@@ -0,0 +1,78 @@
+"""title search index
+
+Revision ID: c47e2a9f1b06
+Revises: 9b1c4e7a2d53
+Create Date: 2026-10-18 16:40:05.921734
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c47e2a9f1b06'
+down_revision = '9b1c4e7a2d53'
+branch_labels = None
+depends_on = None
+
+# FTS5 en SQLite: rowid = id * 2 para peliculas e id * 2 + 1 para series.
+SQLITE_UPGRADE = (
+    "CREATE VIRTUAL TABLE title_search USING fts5(title, tokenize='unicode61 remove_diacritics 2')",
+    "CREATE TRIGGER movies_search_insert AFTER INSERT ON movies BEGIN "
+    "INSERT INTO title_search(rowid, title) VALUES (new.id * 2, new.title); END",
+    "CREATE TRIGGER movies_search_update AFTER UPDATE OF title ON movies BEGIN "
+    "UPDATE title_search SET title = new.title WHERE rowid = new.id * 2; END",
+    "CREATE TRIGGER movies_search_delete AFTER DELETE ON movies BEGIN "
+    "DELETE FROM title_search WHERE rowid = old.id * 2; END",
+    "CREATE TRIGGER serie_search_insert AFTER INSERT ON serie BEGIN "
+    "INSERT INTO title_search(rowid, title) VALUES (new.id * 2 + 1, new.title); END",
+    "CREATE TRIGGER serie_search_update AFTER UPDATE OF title ON serie BEGIN "
+    "UPDATE title_search SET title = new.title WHERE rowid = new.id * 2 + 1; END",
+    "CREATE TRIGGER serie_search_delete AFTER DELETE ON serie BEGIN "
+    "DELETE FROM title_search WHERE rowid = old.id * 2 + 1; END",
+    # Backfill de los titulos existentes.
+    "INSERT INTO title_search(rowid, title) "
+    "SELECT id * 2, title FROM movies UNION ALL SELECT id * 2 + 1, title FROM serie",
+)
+SQLITE_DOWNGRADE = (
+    "DROP TRIGGER movies_search_insert",
+    "DROP TRIGGER movies_search_update",
+    "DROP TRIGGER movies_search_delete",
+    "DROP TRIGGER serie_search_insert",
+    "DROP TRIGGER serie_search_update",
+    "DROP TRIGGER serie_search_delete",
+    "DROP TABLE title_search",
+)
+
+# Postgres: columna generada (se calcula para las filas existentes) e indice GIN.
+POSTGRES_UPGRADE = (
+    "ALTER TABLE movies ADD COLUMN title_tsv tsvector GENERATED ALWAYS AS (to_tsvector('simple', title)) STORED",
+    "CREATE INDEX ix_movies_title_tsv ON movies USING gin (title_tsv)",
+    "ALTER TABLE serie ADD COLUMN title_tsv tsvector GENERATED ALWAYS AS (to_tsvector('simple', title)) STORED",
+    "CREATE INDEX ix_serie_title_tsv ON serie USING gin (title_tsv)",
+)
+POSTGRES_DOWNGRADE = (
+    "DROP INDEX ix_serie_title_tsv",
+    "ALTER TABLE serie DROP COLUMN title_tsv",
+    "DROP INDEX ix_movies_title_tsv",
+    "ALTER TABLE movies DROP COLUMN title_tsv",
+)
+
+
+def _statements(sqlite, postgres):
+    dialect = op.get_bind().dialect.name
+    if dialect == 'sqlite':
+        return sqlite
+    if dialect == 'postgresql':
+        return postgres
+    return ()
+
+
+def upgrade():
+    for statement in _statements(SQLITE_UPGRADE, POSTGRES_UPGRADE):
+        op.execute(sa.text(statement))
+
+
+def downgrade():
+    for statement in _statements(SQLITE_DOWNGRADE, POSTGRES_DOWNGRADE):
+        op.execute(sa.text(statement))
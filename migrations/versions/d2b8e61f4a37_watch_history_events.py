@@ -0,0 +1,58 @@
+"""watch history events
+
+Revision ID: d2b8e61f4a37
+Revises: a83d5f0c6e19
+Create Date: 2026-10-18 21:14:52.306118
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd2b8e61f4a37'
+down_revision = 'a83d5f0c6e19'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('watch_events',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('content_type', sa.String(length=20), nullable=False),
+    sa.Column('content_id', sa.Integer(), nullable=False),
+    sa.Column('kind', sa.String(length=20), nullable=False),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('watched_episodes', sa.Integer(), nullable=True),
+    sa.Column('episodes_delta', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('current_season', sa.Integer(), nullable=True),
+    sa.Column('current_episode', sa.Integer(), nullable=True),
+    sa.Column('occurred_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('watch_events', schema=None) as batch_op:
+        batch_op.create_index('ix_watch_events_user_occurred', ['user_id', 'occurred_at', 'id'], unique=False)
+
+    op.create_table('watch_history_daily',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('content_type', sa.String(length=20), nullable=False),
+    sa.Column('content_id', sa.Integer(), nullable=False),
+    sa.Column('events', sa.Integer(), nullable=False),
+    sa.Column('episodes_watched', sa.Integer(), nullable=False),
+    sa.Column('completed', sa.Integer(), nullable=False),
+    sa.Column('first_at', sa.DateTime(), nullable=False),
+    sa.Column('last_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('user_id', 'day', 'content_type', 'content_id')
+    )
+
+
+def downgrade():
+    op.drop_table('watch_history_daily')
+    with op.batch_alter_table('watch_events', schema=None) as batch_op:
+        batch_op.drop_index('ix_watch_events_user_occurred')
+
+    op.drop_table('watch_events')
@@ -0,0 +1,33 @@
+"""movies title key collation
+
+Revision ID: f3a1c9d27b84
+Revises: d2b8e61f4a37
+Create Date: 2026-10-19 10:12:40.618230
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f3a1c9d27b84'
+down_revision = 'd2b8e61f4a37'
+branch_labels = None
+depends_on = None
+
+# En Postgres el indice pasa a COLLATE "C", igual que `title_key` en las consultas
+# de /movies/; SQLite ya compara por codigo de caracter y no cambia.
+
+
+def upgrade():
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.drop_index('ix_movies_title_lower', table_name='movies')
+    op.create_index('ix_movies_title_lower', 'movies', [sa.text('lower(title) COLLATE "C"'), 'id'], unique=False)
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.drop_index('ix_movies_title_lower', table_name='movies')
+    op.create_index('ix_movies_title_lower', 'movies', [sa.text('lower(title)'), 'id'], unique=False)
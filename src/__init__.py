@@ -1,9 +1,12 @@
 """Configuracion general de la aplicacion Flask."""
 
+import os
+
 from flask import Flask
 from flask_cors import CORS
 from .config import DevelopmentConfig
-from .extensions import db, migrate
+from . import database, search, summary
+from .extensions import autocomplete, db, detail_cache, progress_buffer
 
 
 def create_app(config_object: type[DevelopmentConfig] = DevelopmentConfig) -> Flask:
@@ -13,6 +16,8 @@ def create_app(config_object: type[DevelopmentConfig] = DevelopmentConfig) -> Fl
 
     register_extensions(app)
     register_blueprints(app)
+    register_instrumentation(app)
+    register_commands(app)
     CORS(app)
 
     return app
@@ -21,7 +26,25 @@ def create_app(config_object: type[DevelopmentConfig] = DevelopmentConfig) -> Fl
 def register_extensions(app: Flask) -> None:
     """Inicializa extensiones de terceros."""
     db.init_app(app)
-    migrate.init_app(app, db)
+    database.init_app(app)
+    detail_cache.init_app(app)
+    autocomplete.init_app(app)
+    progress_buffer.init_app(app)
+    summary.init_app(app)
+    search.init_app(app)
+    if os.environ.get("FLASK_RUN_FROM_CLI") == "true":
+        register_migrations(app)
+
+
+def register_migrations(app: Flask) -> None:
+    """Habilita `flask db`; solo hace falta al usar la CLI.
+
+    Flask-Migrate importa Alembic completo (~0.2 s), por eso no se carga
+    cuando la app arranca bajo Gunicorn.
+    """
+    from flask_migrate import Migrate
+
+    Migrate(app, db)
 
 
 def register_blueprints(app: Flask) -> None:
@@ -29,3 +52,23 @@ def register_blueprints(app: Flask) -> None:
     from .api import register_api_blueprints
 
     register_api_blueprints(app)
+
+
+def register_instrumentation(app: Flask) -> None:
+    """Conecta los eventos del engine que miden las consultas de cada request."""
+    from . import instrumentation
+
+    instrumentation.init_app(app)
+
+
+def register_commands(app: Flask) -> None:
+    """Registra los comandos de la CLI de Flask."""
+    from .history import history_cli
+    from .search import search_cli
+    from .seed import seed_command
+    from .summary import summary_cli
+
+    app.cli.add_command(seed_command)
+    app.cli.add_command(summary_cli)
+    app.cli.add_command(search_cli)
+    app.cli.add_command(history_cli)
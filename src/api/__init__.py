@@ -5,11 +5,19 @@ from flask import Flask
 
 def register_api_blueprints(app: Flask) -> None:
     """Agrega todos los blueprints disponibles a la aplicacion."""
+    from .autocomplete import bp as autocomplete_bp
     from .health import bp as health_bp
     from .movies import bp as movies_bp
+    from .progress import bp as progress_bp
+    from .search import bp as search_bp
+    from .series import bp as series_bp
 
     app.register_blueprint(health_bp)
     app.register_blueprint(movies_bp)
+    app.register_blueprint(series_bp)
+    app.register_blueprint(progress_bp)
+    app.register_blueprint(search_bp)
+    app.register_blueprint(autocomplete_bp)
 
 
 __all__ = ["register_api_blueprints"]
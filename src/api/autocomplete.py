@@ -0,0 +1,23 @@
+"""Sugerencias de titulos mientras el usuario escribe."""
+from flask import Blueprint, current_app, jsonify, request
+from src.extensions import autocomplete
+
+bp = Blueprint("autocomplete", __name__, url_prefix="/autocomplete")
+
+
+@bp.get("")
+def suggest():
+    """Devuelve hasta `limit` peliculas y series cuyo titulo empieza con `prefix`."""
+    prefix = request.args.get("prefix", "")
+    if not prefix.strip():
+        return jsonify({"error": "El parametro 'prefix' es obligatorio."}), 400
+
+    limit = request.args.get("limit", default=current_app.config["AUTOCOMPLETE_LIMIT_DEFAULT"], type=int)
+    if limit is None or limit <= 0:
+        return jsonify({"error": "El parametro 'limit' debe ser un entero positivo."}), 400
+
+    try:
+        items = autocomplete.suggest(prefix, min(limit, current_app.config["AUTOCOMPLETE_LIMIT_MAX"]))
+        return jsonify({"items": items}), 200
+    except Exception as e:
+        return jsonify({"error": f"Error al sugerir titulos: {str(e)}"}), 500
@@ -0,0 +1,51 @@
+"""GET condicionales (ETag / Last-Modified) para recursos con `updated_at`."""
+
+from __future__ import annotations
+
+import hashlib
+from datetime import datetime, timezone
+from typing import Callable
+
+from flask import current_app, request
+
+
+def make_etag(*parts) -> str:
+    """Genera un ETag fuerte a partir de valores baratos (ids, fechas, conteos)."""
+    raw = "|".join("" if part is None else str(part) for part in parts)
+    return hashlib.sha1(raw.encode()).hexdigest()
+
+
+def conditional(render: Callable[[], tuple], etag: str, last_modified: datetime | None = None):
+    """Devuelve 304 si el cliente ya tiene la version vigente; si no, renderiza.
+
+    `render` solo se invoca cuando hace falta el cuerpo, de modo que la
+    consulta completa y la serializacion JSON se omiten en los 304.
+    """
+    last_modified = _as_utc(last_modified)
+
+    if _is_fresh(etag, last_modified):
+        response = current_app.response_class(status=304)
+        status = 304
+    else:
+        response, status = render()
+
+    response.set_etag(etag)
+    if last_modified is not None:
+        response.last_modified = last_modified
+    return response, status
+
+
+def _is_fresh(etag: str, last_modified: datetime | None) -> bool:
+    """Aplica If-None-Match y, si no viene, If-Modified-Since (RFC 9110)."""
+    if request.if_none_match:
+        return request.if_none_match.contains(etag)
+    if request.if_modified_since and last_modified is not None:
+        return last_modified.replace(microsecond=0) <= request.if_modified_since
+    return False
+
+
+def _as_utc(value: datetime | None) -> datetime | None:
+    """SQLite devuelve fechas sin zona horaria; se guardan siempre en UTC."""
+    if value is not None and value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
@@ -1,5 +1,5 @@
 from flask import Blueprint, jsonify
-from src.extensions import db
+from src.extensions import autocomplete, db, detail_cache, progress_buffer
 from sqlalchemy import text  # ✅ importa text
 
 bp = Blueprint("health", __name__, url_prefix="/health")
@@ -18,8 +18,11 @@ def healthcheck() -> tuple[dict[str, str], int]:
         health_status["database"] = f"error: {str(e)}"
         health_status["status"] = "error"
 
+    health_status["cache"] = detail_cache.stats()
+    health_status["autocomplete"] = autocomplete.stats()
+    health_status["progress_buffer"] = progress_buffer.stats()
+
     # Simulaciones de otros servicios
-    health_status["cache"] = "ok"
     health_status["external_services"] = "ok"
 
     code = 200 if health_status["status"] == "ok" else 500
@@ -1,10 +1,99 @@
 """Endpoints relacionados con peliculas."""
-from flask import Blueprint, jsonify, request
-from src.extensions import db
-from werkzeug.exceptions import NotFound, BadRequest
+from dataclasses import dataclass
+
+from flask import Blueprint, current_app, g, jsonify, request
+from sqlalchemy import func, insert, literal, select, tuple_
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import FunctionElement
+from werkzeug.datastructures import MultiDict
+from src.cache import CachedDetail
+from src.models.movie import title_key
+from src.extensions import autocomplete, db, detail_cache
+from werkzeug.exceptions import NotFound, BadRequest, UnsupportedMediaType
+
+from .bulk import ImportReport, batched, iter_records, parse_batch_size
+from .conditional import conditional, make_etag
+from .pagination import cursor_int, cursor_str, page, parse_page_args
+from .serializers import MOVIE_PROJECTION, pick
+from .streaming import stream_json_array, wants_stream
 
 bp = Blueprint("movies", __name__, url_prefix="/movies")
 
+SORT_KEYS = ("id", "title", "release_year")
+
+
+class no_index(FunctionElement):
+    """La expresion tal cual; en SQLite con `+` delante, para que no elija el plan.
+
+    Con filtros y orden por id, SQLite prefiere recorrer la tabla en orden de
+    rowid filtrando fila a fila, que con un filtro selectivo lee la tabla
+    entera para llenar una pagina. `+movies.id` lo descarta y el plan sale del
+    indice del filtro (ordena solo las coincidencias).
+    """
+
+    name = "no_index"
+    inherit_cache = True
+
+    def __init__(self, expression):
+        super().__init__(expression)
+        self.type = expression.type
+
+
+@compiles(no_index)
+def _compile_no_index(element, compiler, **kw):
+    return compiler.process(element.clauses, **kw)
+
+
+@compiles(no_index, "sqlite")
+def _compile_no_index_sqlite(element, compiler, **kw):
+    return f"+{compiler.process(element.clauses, **kw)}"
+
+
+@dataclass(frozen=True)
+class MovieFilters:
+    """Filtros y orden del listado de peliculas."""
+
+    genre: str | None = None
+    year_from: int | None = None
+    year_to: int | None = None
+    title_prefix: str | None = None
+    sort: str = "id"
+    descending: bool = False
+
+    @property
+    def filtered(self) -> bool:
+        """Hay al menos un filtro (el orden no cuenta)."""
+        return any(
+            value is not None for value in (self.genre, self.year_from, self.year_to, self.title_prefix)
+        )
+
+
+def parse_movie_filters(args: MultiDict) -> MovieFilters:
+    """Lee `genre`, `year_from`, `year_to`, `title_prefix` y `sort` (`-campo` invierte el orden)."""
+    years = {}
+    for name in ("year_from", "year_to"):
+        if name in args:
+            years[name] = args.get(name, type=int)
+            if years[name] is None:
+                raise BadRequest(f"El parametro '{name}' debe ser un entero.")
+    if years.get("year_from") is not None and years.get("year_to") is not None and years["year_from"] > years["year_to"]:
+        raise BadRequest("El parametro 'year_from' no puede ser mayor que 'year_to'.")
+
+    genre = args.get("genre")
+    if genre is not None and (not genre.strip() or len(genre) > 50):
+        raise BadRequest("El parametro 'genre' debe tener entre 1 y 50 caracteres.")
+    title_prefix = args.get("title_prefix")
+    if title_prefix is not None and not title_prefix.strip():
+        raise BadRequest("El parametro 'title_prefix' no puede estar vacio.")
+
+    sort = args.get("sort", "id")
+    descending = sort.startswith("-")
+    sort = sort.removeprefix("-")
+    if sort not in SORT_KEYS:
+        raise BadRequest(f"El parametro 'sort' debe ser uno de: {', '.join(SORT_KEYS)} (con '-' para descendente).")
+
+    return MovieFilters(genre=genre, title_prefix=title_prefix, sort=sort, descending=descending, **years)
+
 
 class MovieService:
     """Orquesta la logica de negocio para el recurso Movie."""
@@ -15,11 +104,112 @@ class MovieService:
         self.Movie = Movie
         self.session = db.session
 
-    def list_movies(self):
-        """Retorna todas las peliculas registradas."""
-        movies = self.Movie.query.all()
-        movie_list = [movie.to_dict() for movie in movies]
-        return jsonify(movie_list), 200
+    def list_movies(
+        self,
+        limit: int,
+        cursor: dict | None = None,
+        fields: tuple[str, ...] | None = None,
+        filters: MovieFilters = MovieFilters(),
+    ):
+        """Retorna una pagina de peliculas filtradas, ordenadas por `filters.sort` y luego por id."""
+        # El ETag sale de (id, updated_at) de las filas de esta misma pagina (y la
+        # siguiente, que decide next_cursor): recorre los mismos indices que el
+        # listado y solo `limit + 1` filas, sin agregados sobre toda la tabla.
+        versions = self.session.execute(
+            self._page_statement(select(self.Movie.id, self.Movie.updated_at), limit, cursor, filters)
+        ).all()
+        last_modified = max((row.updated_at for row in versions), default=None)
+        etag = make_etag("movies", [tuple(row) for row in versions], limit, cursor, fields, filters)
+
+        def render():
+            stmt = MOVIE_PROJECTION.select(fields)
+            sort_key = self._sort_expression(filters.sort)
+            if sort_key is not None:
+                stmt = stmt.add_columns(sort_key.label("sort_value"))
+            rows = self.session.execute(self._page_statement(stmt, limit, cursor, filters)).all()
+            result = page(rows, limit, self._cursor_for(filters.sort), MOVIE_PROJECTION.serializer(fields))
+            return jsonify(result), 200
+
+        return conditional(render, etag, last_modified)
+
+    def _page_statement(self, stmt, limit: int, cursor: dict | None, filters: MovieFilters):
+        """Agrega a `stmt` los filtros, el cursor, el orden y el LIMIT de una pagina."""
+        # Orden (clave, id): los indices de Movie terminan en id y el cursor guarda ambos.
+        sort_key = self._sort_expression(filters.sort)
+        if sort_key is not None:
+            order = (sort_key, self.Movie.id)
+        elif filters.filtered:
+            order = (no_index(self.Movie.id),)
+        else:
+            order = (self.Movie.id,)
+        stmt = self._apply_filters(stmt, filters)
+
+        if cursor is not None:
+            position = self._cursor_position(cursor, filters.sort)
+            current = order[0] if len(order) == 1 else tuple_(*order)
+            after = position[0] if len(position) == 1 else tuple_(*position)
+            stmt = stmt.where(current < after if filters.descending else current > after)
+
+        stmt = stmt.order_by(*(column.desc() if filters.descending else column for column in order))
+        return stmt.limit(limit + 1)
+
+    def _apply_filters(self, stmt, filters: MovieFilters):
+        if filters.genre is not None:
+            stmt = stmt.where(self.Movie.genre == filters.genre)
+        if filters.year_from is not None:
+            stmt = stmt.where(self.Movie.release_year >= filters.year_from)
+        if filters.year_to is not None:
+            stmt = stmt.where(self.Movie.release_year <= filters.year_to)
+        if filters.title_prefix is not None:
+            # Rango sobre title_key en vez de LIKE: asi usa ix_movies_title_lower.
+            # lower() del parametro lo calcula la base, igual que en el indice; el
+            # limite superior vale porque title_key compara por codigo de caracter.
+            key = title_key(self.Movie.title)
+            prefix = func.lower(literal(filters.title_prefix))
+            stmt = stmt.where(key >= prefix, key < prefix.concat("\U0010ffff"))
+        return stmt
+
+    def _sort_expression(self, sort: str):
+        """Expresion de orden indexada; None cuando se ordena solo por id."""
+        if sort == "title":
+            return title_key(self.Movie.title)
+        if sort == "release_year":
+            return self.Movie.release_year
+        return None
+
+    @staticmethod
+    def _cursor_position(cursor: dict, sort: str) -> tuple:
+        last_id = cursor_int(cursor, "id")
+        if sort == "title":
+            return cursor_str(cursor, "sort_value"), last_id
+        if sort == "release_year":
+            return cursor_int(cursor, "sort_value"), last_id
+        return (last_id,)
+
+    @staticmethod
+    def _cursor_for(sort: str):
+        if sort == "id":
+            return lambda row: {"id": row.id}
+        return lambda row: {"id": row.id, "sort_value": row.sort_value}
+
+    def stream_movies(self, fields: tuple[str, ...] | None = None, filters: MovieFilters = MovieFilters()):
+        """Emite el catalogo completo (o filtrado) como arreglo JSON en streaming."""
+        # El flujo abarca todas las coincidencias: el ETag cuenta solo esas filas
+        # (por los indices del filtro) y max(updated_at) sale de ix_movies_updated_at.
+        total, last_modified = self.session.execute(select(
+            self._apply_filters(select(func.count()).select_from(self.Movie), filters).scalar_subquery(),
+            self._apply_filters(select(func.max(self.Movie.updated_at)), filters).scalar_subquery(),
+        )).one()
+        etag = make_etag("movies-stream", total, last_modified, fields, filters)
+
+        def render():
+            chunk_size = current_app.config["STREAM_CHUNK_SIZE"]
+            stmt = self._apply_filters(MOVIE_PROJECTION.select(fields), filters)
+            stmt = stmt.order_by(self.Movie.id).execution_options(yield_per=chunk_size)
+            serialize = MOVIE_PROJECTION.serializer(fields)
+            return stream_json_array(lambda: self.session.execute(stmt), serialize), 200
+
+        return conditional(render, etag, last_modified)
 
     def create_movie(self, payload: dict):
         """Crea una nueva pelicula."""
@@ -39,21 +229,94 @@ class MovieService:
 
         self.session.add(new_movie)
         self.session.commit()
+        autocomplete.title_changed("movie", new_movie.id, new_movie.title)
 
         return jsonify(new_movie.to_dict()), 201
 
-    def get_movie(self, movie_id: int):
+    def bulk_create_movies(self, records, batch_size: int):
+        """Importa peliculas en lotes con INSERT multi-fila, sin abortar por filas invalidas."""
+        report = ImportReport(current_app.config["BULK_IMPORT_MAX_ERRORS"])
+        table = self.Movie.__table__
+
+        for batch in batched(records, batch_size):
+            rows = []
+            for line, record, error in batch:
+                if error is None:
+                    try:
+                        rows.append(self._validate_movie_row(record))
+                        continue
+                    except BadRequest as e:
+                        error = e.description
+                report.add_error(line, error)
+
+            if not rows:
+                continue
+            try:
+                inserted = self.session.execute(insert(table).returning(table.c.id, table.c.title), rows).all()
+                self.session.commit()
+                report.inserted += len(rows)
+                for movie_id, title in inserted:
+                    autocomplete.title_changed("movie", movie_id, title)
+            except Exception as e:
+                self.session.rollback()
+                for line, record, error in batch:
+                    if error is None:
+                        report.add_error(line, f"Error al insertar el lote: {str(e)}")
+
+        return jsonify(report.to_dict()), 200
+
+    @staticmethod
+    def _validate_movie_row(record: dict) -> dict:
+        """Valida una fila de la carga masiva y la normaliza a columnas de Movie."""
+        title = record.get("title")
+        genre = record.get("genre")
+        if not isinstance(title, str) or not title.strip() or len(title) > 120:
+            raise BadRequest("El campo 'title' es obligatorio (maximo 120 caracteres).")
+        if not isinstance(genre, str) or not genre.strip() or len(genre) > 50:
+            raise BadRequest("El campo 'genre' es obligatorio (maximo 50 caracteres).")
+
+        try:
+            release_year = int(record.get("release_year"))
+        except (TypeError, ValueError):
+            raise BadRequest("El campo 'release_year' debe ser un entero.")
+
+        return {"title": title.strip(), "genre": genre.strip(), "release_year": release_year}
+
+    def get_movie(self, movie_id: int, fields: tuple[str, ...] | None = None):
         """Obtiene una pelicula por su identificador."""
-        # TODO: buscar la pelicula y manejar el caso de no encontrada.
-        movie = self.Movie.query.get(movie_id)
-        if not movie:
-            raise NotFound(f"No se encontró la película con id {movie_id}")
-        return jsonify(movie.to_dict()), 200
+        generation = detail_cache.generation()
+        cached = detail_cache.get("movie", movie_id)
+        if cached is None and fields is not None:
+            # Sin cache y con `fields`: se leen solo las columnas pedidas.
+            row = self.session.execute(
+                MOVIE_PROJECTION.select(fields).where(self.Movie.id == movie_id)
+            ).first()
+            if row is None:
+                raise NotFound(f"No se encontró la película con id {movie_id}")
+            return conditional(
+                lambda: (jsonify(MOVIE_PROJECTION.serializer(fields)(row)), 200),
+                make_etag(make_etag("movie", row.id, row.updated_at), fields),
+                row.updated_at,
+            )
+
+        if cached is None:
+            movie = self.session.get(self.Movie, movie_id)
+            if not movie:
+                raise NotFound(f"No se encontró la película con id {movie_id}")
+            cached = CachedDetail(
+                payload=movie.to_dict(),
+                etag=make_etag("movie", movie.id, movie.updated_at),
+                last_modified=movie.updated_at,
+            )
+            detail_cache.set("movie", movie_id, cached, generation)
+
+        etag = cached.etag if fields is None else make_etag(cached.etag, fields)
+        return conditional(lambda: (jsonify(pick(cached.payload, fields)), 200), etag, cached.last_modified)
 
     def update_movie(self, movie_id: int, payload: dict):
         """Actualiza los datos de una pelicula."""
         # TODO: aplicar cambios permitidos y guardar en la base de datos.
-        movie = self.Movie.query.get(movie_id)
+        movie = self.session.get(self.Movie, movie_id)
         if not movie:
             raise NotFound(f"No se encontró la película con id {movie_id}")
 
@@ -63,29 +326,47 @@ class MovieService:
                 setattr(movie, field, payload[field])
 
         self.session.commit()
+        detail_cache.invalidate("movie", movie_id)
+        if "title" in payload:
+            autocomplete.title_changed("movie", movie_id, movie.title)
         return jsonify(movie.to_dict()), 200
 
     def delete_movie(self, movie_id: int):
         """Elimina una pelicula existente."""
         # TODO: definir si el borrado debe ser logico o fisico.
         # Implementaremos borrado físico
-        movie = self.Movie.query.get(movie_id)
+        movie = self.session.get(self.Movie, movie_id)
         if not movie:
             raise NotFound(f"No se encontró la película con id {movie_id}")
 
         self.session.delete(movie)
         self.session.commit()
+        detail_cache.invalidate("movie", movie_id)
+        autocomplete.title_removed("movie", movie_id)
         return "", 204
 
 
-# Instancia del servicio
-service = MovieService()
+def get_service() -> MovieService:
+    """Servicio del contexto de aplicacion actual; se construye en el primer uso."""
+    if "movie_service" not in g:
+        g.movie_service = MovieService()
+    return g.movie_service
 
 
 @bp.get("/")
 def list_movies():
-    """Lista todas las peliculas disponibles."""
-    return service.list_movies()
+    """Lista las peliculas paginadas por cursor (o completas con `?stream=1`), con filtros y orden."""
+    try:
+        fields = MOVIE_PROJECTION.parse_fields(request.args)
+        filters = parse_movie_filters(request.args)
+        if wants_stream(request.args):
+            return get_service().stream_movies(fields, filters)
+        limit, cursor = parse_page_args(request.args)
+        return get_service().list_movies(limit, cursor, fields, filters)
+    except BadRequest as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": f"Error al listar peliculas: {str(e)}"}), 500
 
 
 @bp.post("/")
@@ -94,18 +375,36 @@ def create_movie():
     payload = request.get_json(silent=True) or {}
 
     try:
-        return service.create_movie(payload)
+        return get_service().create_movie(payload)
     except BadRequest as e:
         return jsonify({"error": str(e)}), 400
     except Exception as e:
         return jsonify({"error": f"Error al crear la película: {str(e)}"}), 500
 
 
+@bp.post("/bulk")
+def bulk_create_movies():
+    """Carga masiva de peliculas desde un cuerpo NDJSON o CSV en streaming."""
+    try:
+        batch_size = parse_batch_size(request.args)
+        records = iter_records(request.stream, request.mimetype)
+        return get_service().bulk_create_movies(records, batch_size)
+    except BadRequest as e:
+        return jsonify({"error": str(e)}), 400
+    except UnsupportedMediaType as e:
+        return jsonify({"error": str(e)}), 415
+    except Exception as e:
+        return jsonify({"error": f"Error en la carga masiva de películas: {str(e)}"}), 500
+
+
 @bp.get("/<int:movie_id>")
 def retrieve_movie(movie_id: int):
     """Devuelve el detalle de una pelicula concreta."""
     try:
-        return service.get_movie(movie_id)
+        fields = MOVIE_PROJECTION.parse_fields(request.args)
+        return get_service().get_movie(movie_id, fields)
+    except BadRequest as e:
+        return jsonify({"error": str(e)}), 400
     except NotFound as e:
         return jsonify({"error": str(e)}), 404
     except Exception as e:
@@ -118,7 +417,7 @@ def update_movie(movie_id: int):
     payload = request.get_json(silent=True) or {}
 
     try:
-        return service.update_movie(movie_id, payload)
+        return get_service().update_movie(movie_id, payload)
     except NotFound as e:
         return jsonify({"error": str(e)}), 404
     except Exception as e:
@@ -129,7 +428,7 @@ def update_movie(movie_id: int):
 def delete_movie(movie_id: int):
     """Elimina una pelicula del catalogo."""
     try:
-        return service.delete_movie(movie_id)
+        return get_service().delete_movie(movie_id)
     except NotFound as e:
         return jsonify({"error": str(e)}), 404
     except Exception as e:
@@ -0,0 +1,105 @@
+"""Paginacion por cursor (keyset) compartida por los listados de la API."""
+
+from __future__ import annotations
+
+import base64
+import binascii
+import json
+from datetime import date, datetime
+
+from flask import current_app
+from werkzeug.datastructures import MultiDict
+from werkzeug.exceptions import BadRequest
+
+
+def parse_page_args(args: MultiDict) -> tuple[int, dict | None]:
+    """Lee `limit` y `cursor` de la query string y los valida."""
+    default_limit = current_app.config["PAGE_SIZE_DEFAULT"]
+    max_limit = current_app.config["PAGE_SIZE_MAX"]
+
+    limit = args.get("limit", default=default_limit, type=int)
+    if limit is None or limit <= 0:
+        raise BadRequest("El parametro 'limit' debe ser un entero positivo.")
+
+    return min(limit, max_limit), decode_cursor(args.get("cursor"))
+
+
+def encode_cursor(values: dict) -> str:
+    """Codifica la posicion del ultimo elemento en un token opaco."""
+    raw = json.dumps(values, separators=(",", ":"), default=_encode_value)
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(token: str | None) -> dict | None:
+    """Decodifica un token generado por `encode_cursor`."""
+    if not token:
+        return None
+
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (binascii.Error, ValueError):
+        raise BadRequest("El parametro 'cursor' no es valido.")
+
+    if not isinstance(values, dict):
+        raise BadRequest("El parametro 'cursor' no es valido.")
+    return values
+
+
+def cursor_datetime(values: dict, key: str) -> datetime:
+    """Recupera un datetime serializado dentro de un cursor."""
+    try:
+        return datetime.fromisoformat(values[key])
+    except (KeyError, TypeError, ValueError):
+        raise BadRequest("El parametro 'cursor' no es valido.")
+
+
+def cursor_date(values: dict, key: str) -> date:
+    """Recupera una fecha serializada dentro de un cursor."""
+    try:
+        return date.fromisoformat(values[key])
+    except (KeyError, TypeError, ValueError):
+        raise BadRequest("El parametro 'cursor' no es valido.")
+
+
+def cursor_int(values: dict, key: str) -> int:
+    """Recupera un entero serializado dentro de un cursor."""
+    value = values.get(key)
+    if not isinstance(value, int) or isinstance(value, bool):
+        raise BadRequest("El parametro 'cursor' no es valido.")
+    return value
+
+
+def cursor_str(values: dict, key: str) -> str:
+    """Recupera un texto serializado dentro de un cursor."""
+    value = values.get(key)
+    if not isinstance(value, str):
+        raise BadRequest("El parametro 'cursor' no es valido.")
+    return value
+
+
+def cursor_float(values: dict, key: str) -> float:
+    """Recupera un numero serializado dentro de un cursor."""
+    value = values.get(key)
+    if not isinstance(value, (int, float)) or isinstance(value, bool):
+        raise BadRequest("El parametro 'cursor' no es valido.")
+    return float(value)
+
+
+def page(rows: list, limit: int, cursor_for, serialize) -> dict:
+    """Arma la respuesta paginada a partir de `limit + 1` filas leidas.
+
+    La fila extra solo indica si existe una pagina siguiente; el cursor se
+    construye con `cursor_for` sobre el ultimo elemento devuelto.
+    """
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    next_cursor = encode_cursor(cursor_for(rows[-1])) if has_more and rows else None
+    return {"items": [serialize(row) for row in rows], "next_cursor": next_cursor}
+
+
+def _encode_value(value):
+    """Serializa valores no nativos de JSON dentro del cursor."""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"Tipo no serializable en cursor: {type(value).__name__}")
@@ -1,10 +1,41 @@
 """Endpoints para controlar el progreso de los usuarios."""
-from flask import Blueprint, jsonify, request
+from datetime import date, datetime, time, timedelta, timezone
+
+from flask import Blueprint, current_app, g, jsonify, request
+from sqlalchemy import Float, and_, case, cast, func, or_, select, tuple_, union_all
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import selectinload
+from werkzeug.datastructures import MultiDict
 from werkzeug.exceptions import BadRequest, NotFound
-from src.extensions import db
+from src.extensions import db, progress_buffer
+from src.history import event_day, event_row, record_events
+
+from .conditional import conditional, make_etag
+from .pagination import cursor_date, cursor_datetime, cursor_int, cursor_str, page, parse_page_args
+from .serializers import WATCH_ENTRY_PROJECTION
 
 bp = Blueprint("progress", __name__, url_prefix="")
 
+# Pares (usuario, serie) por consulta al aplicar progreso encolado: SQLite resuelve el OR
+# con el indice unico pero limita la profundidad de la expresion (1000).
+BUFFERED_LOOKUP_CHUNK = 200
+
+
+def parse_history_range(args: MultiDict) -> tuple[date | None, date | None]:
+    """Lee `since` y `until` (fechas ISO `YYYY-MM-DD`, ambas inclusivas, en UTC)."""
+    bounds = []
+    for name in ("since", "until"):
+        value = args.get(name)
+        try:
+            bounds.append(date.fromisoformat(value) if value else None)
+        except ValueError:
+            raise BadRequest(f"El parametro '{name}' debe ser una fecha YYYY-MM-DD.")
+
+    since, until = bounds
+    if since is not None and until is not None and since > until:
+        raise BadRequest("El parametro 'since' no puede ser posterior a 'until'.")
+    return since, until
+
 
 class ProgressService:
     """Coordina operaciones sobre la lista de seguimiento y progreso."""
@@ -12,34 +43,278 @@ class ProgressService:
     # TODO: inyectar modelos User, Series, Movie y WatchEntry con sus esquemas.
     def __init__(self):
         from src.models.user import User
+        from src.models.user_summary import UserSummary
         from src.models.movie import Movie
         from src.models.serie import Serie
         from src.models.watch_entry import WatchEntry
+        from src.models.watch_event import WatchEvent
+        from src.models.watch_history_day import WatchHistoryDay
 
         self.User = User
+        self.UserSummary = UserSummary
         self.Movie = Movie
         self.Serie = Serie
         self.WatchEntry = WatchEntry
+        self.WatchEvent = WatchEvent
+        self.WatchHistoryDay = WatchHistoryDay
         self.session = db.session
 
-    def list_watchlist(self, user_id: int) -> list[dict]:
-        """Devuelve los contenidos asociados a un usuario."""
+    def list_watchlist(
+        self, user_id: int, limit: int, cursor: dict | None = None, fields: tuple[str, ...] | None = None
+    ) -> dict:
+        """Devuelve una pagina de la watchlist, de la entrada mas reciente a la mas antigua."""
         # TODO: consultar entradas filtradas por user_id y calcular porcentajes.
-        user = self.User.query.get(user_id)
+        user = self.session.get(self.User, user_id)
         if not user:
             raise NotFound(f"Usuario con id {user_id} no encontrado.")
 
-        entries = self.WatchEntry.query.filter_by(user_id=user_id).all()
-        result = [entry.to_dict() for entry in entries]
+        # El ETag cubre las entradas y el contenido embebido (peliculas y series).
+        total, entries_modified, movies_modified, series_modified = self.session.execute(
+            select(
+                func.count(self.WatchEntry.id),
+                func.max(self.WatchEntry.updated_at),
+                func.max(self.Movie.updated_at),
+                func.max(self.Serie.updated_at),
+            )
+            .select_from(self.WatchEntry)
+            .outerjoin(self.WatchEntry.movie)
+            .outerjoin(self.WatchEntry.serie)
+            .where(self.WatchEntry.user_id == user_id)
+        ).one()
+        modified = [value for value in (entries_modified, movies_modified, series_modified) if value]
+        last_modified = max(modified) if modified else None
+        etag = make_etag(
+            "watchlist", user_id, total, entries_modified, movies_modified, series_modified, limit, cursor, fields
+        )
+
+        def render():
+            # Una sola consulta proyectando solo columnas: no hay N+1 ni
+            # hidratacion ORM, y los LEFT JOIN dependen de los campos pedidos.
+            stmt = (
+                WATCH_ENTRY_PROJECTION.select(fields)
+                .where(self.WatchEntry.user_id == user_id)
+                .order_by(self.WatchEntry.updated_at.desc(), self.WatchEntry.id.desc())
+            )
+            if cursor is not None:
+                # Seek sobre (updated_at, id): las paginas profundas cuestan lo mismo que la primera.
+                updated_at = cursor_datetime(cursor, "updated_at")
+                entry_id = cursor_int(cursor, "id")
+                stmt = stmt.where(
+                    or_(
+                        self.WatchEntry.updated_at < updated_at,
+                        and_(self.WatchEntry.updated_at == updated_at, self.WatchEntry.id < entry_id),
+                    )
+                )
+
+            rows = self.session.execute(stmt.limit(limit + 1)).all()
+            result = page(
+                rows,
+                limit,
+                lambda e: {"updated_at": e.updated_at, "id": e.id},
+                WATCH_ENTRY_PROJECTION.serializer(fields),
+            )
+            return jsonify(result), 200
+
+        return conditional(render, etag, last_modified)
+
+    def get_stats(self, user_id: int) -> dict:
+        """Resume la watchlist del usuario con una unica consulta agregada.
+
+        El porcentaje por entrada replica `WatchEntry.percentage_watched`
+        (0 si no hay total de episodios, incluidas las peliculas) con la misma
+        secuencia de operaciones en coma flotante; la mediana sale de una
+        ventana `row_number()` sobre esos porcentajes.
+        """
+        WatchEntry = self.WatchEntry
+        percentage = case(
+            (
+                WatchEntry.total_episodes != 0,
+                cast(func.coalesce(WatchEntry.watched_episodes, 0), Float) / WatchEntry.total_episodes * 100,
+            ),
+            else_=0.0,
+        )
+        entries = (
+            select(
+                WatchEntry.status,
+                WatchEntry.content_type,
+                WatchEntry.watched_episodes,
+                percentage.label("percentage"),
+            )
+            .where(WatchEntry.user_id == user_id)
+            .cte("entries")
+        )
+        ranked = select(
+            entries.c.percentage,
+            func.row_number().over(order_by=entries.c.percentage).label("position"),
+            func.count().over().label("size"),
+        ).subquery("ranked")
+        median = (
+            select(func.avg(ranked.c.percentage))
+            .where(ranked.c.position.in_([(ranked.c.size + 1) // 2, (ranked.c.size + 2) // 2]))
+            .scalar_subquery()
+        )
+        rows = self.session.execute(
+            select(
+                entries.c.status,
+                entries.c.content_type,
+                func.count().label("count"),
+                func.coalesce(func.sum(entries.c.watched_episodes), 0).label("episodes_watched"),
+                func.sum(entries.c.percentage).label("percentage_sum"),
+                median.label("median"),
+            )
+            .group_by(entries.c.status, entries.c.content_type)
+            .order_by(entries.c.status, entries.c.content_type)
+        ).all()
+
+        if not rows and not self.session.get(self.User, user_id):
+            raise NotFound(f"Usuario con id {user_id} no encontrado.")
+
+        total = sum(row.count for row in rows)
+        by_status: dict[str, int] = {}
+        by_content_type: dict[str, int] = {}
+        for row in rows:
+            by_status[row.status] = by_status.get(row.status, 0) + row.count
+            by_content_type[row.content_type] = by_content_type.get(row.content_type, 0) + row.count
+
+        return jsonify({
+            "total": total,
+            "by_status": by_status,
+            "by_content_type": by_content_type,
+            "by_status_and_content_type": [
+                {"status": row.status, "content_type": row.content_type, "count": row.count} for row in rows
+            ],
+            "episodes_watched": sum(row.episodes_watched for row in rows),
+            "average_percentage": round(sum(row.percentage_sum for row in rows) / total, 2) if total else None,
+            "median_percentage": round(rows[0].median, 2) if rows else None,
+        }), 200
+
+    def get_summary(self, user_id: int) -> dict:
+        """Devuelve el resumen mantenido en `user_summary` (lectura por clave primaria)."""
+        summary = self.session.get(self.UserSummary, user_id)
+        if summary is not None:
+            return jsonify(summary.to_dict()), 200
+
+        # Sin fila: el usuario no tiene entradas o no existe.
+        if self.session.get(self.User, user_id) is None:
+            raise NotFound(f"Usuario con id {user_id} no encontrado.")
+        return jsonify(self.UserSummary.empty(user_id)), 200
+
+    def list_history(
+        self, user_id: int, limit: int, cursor: dict | None = None, since: date | None = None, until: date | None = None
+    ) -> dict:
+        """Devuelve una pagina de eventos del usuario, del mas reciente al mas antiguo.
+
+        Solo incluye los eventos que aun no se compactaron; los dias anteriores
+        a la retencion se leen con `list_daily_history`.
+        """
+        Event = self.WatchEvent
+        # Lectura por ix_watch_events_user_occurred y seek sobre (occurred_at, id), como /me/watchlist.
+        stmt = (
+            select(
+                Event.id, Event.content_type, Event.content_id, Event.kind, Event.status, Event.watched_episodes,
+                Event.episodes_delta, Event.current_season, Event.current_episode, Event.occurred_at,
+            )
+            .where(Event.user_id == user_id, *self._occurred_range(since, until))
+            .order_by(Event.occurred_at.desc(), Event.id.desc())
+        )
+        if cursor is not None:
+            occurred_at = cursor_datetime(cursor, "occurred_at")
+            event_id = cursor_int(cursor, "id")
+            stmt = stmt.where(
+                or_(
+                    Event.occurred_at < occurred_at,
+                    and_(Event.occurred_at == occurred_at, Event.id < event_id),
+                )
+            )
+
+        rows = self.session.execute(stmt.limit(limit + 1)).all()
+        if not rows and cursor is None and self.session.get(self.User, user_id) is None:
+            raise NotFound(f"Usuario con id {user_id} no encontrado.")
+        result = page(rows, limit, lambda e: {"occurred_at": e.occurred_at, "id": e.id}, lambda e: dict(e._mapping))
+        return jsonify(result), 200
+
+    def list_daily_history(
+        self, user_id: int, limit: int, cursor: dict | None = None, since: date | None = None, until: date | None = None
+    ) -> dict:
+        """Devuelve una pagina de resumenes por dia y contenido, del dia mas reciente al mas antiguo.
+
+        Une los dias ya compactados en `watch_history_daily` con el agregado
+        de los eventos que siguen en `watch_events`, asi el resultado no
+        cambia al compactar.
+        """
+        Event, Day = self.WatchEvent, self.WatchHistoryDay
+        day = event_day(Event.occurred_at)
+        live = (
+            select(
+                day.label("day"),
+                Event.content_type,
+                Event.content_id,
+                func.count().label("events"),
+                func.sum(Event.episodes_delta).label("episodes_watched"),
+                func.sum(case((Event.kind == "completed", 1), else_=0)).label("completed"),
+                func.min(Event.occurred_at).label("first_at"),
+                func.max(Event.occurred_at).label("last_at"),
+            )
+            .where(Event.user_id == user_id, *self._occurred_range(since, until))
+            .group_by(day, Event.content_type, Event.content_id)
+        )
+        compacted = select(
+            Day.day, Day.content_type, Day.content_id, Day.events, Day.episodes_watched, Day.completed,
+            Day.first_at, Day.last_at,
+        ).where(Day.user_id == user_id)
+        if since is not None:
+            compacted = compacted.where(Day.day >= since)
+        if until is not None:
+            compacted = compacted.where(Day.day <= until)
+
+        days = union_all(live, compacted).subquery()
+        key = (days.c.day, days.c.content_type, days.c.content_id)
+        stmt = (
+            select(
+                *key,
+                func.sum(days.c.events).label("events"),
+                func.sum(days.c.episodes_watched).label("episodes_watched"),
+                func.sum(days.c.completed).label("completed"),
+                func.min(days.c.first_at).label("first_at"),
+                func.max(days.c.last_at).label("last_at"),
+            )
+            .group_by(*key)
+            .order_by(*(column.desc() for column in key))
+        )
+        if cursor is not None:
+            position = (
+                cursor_date(cursor, "day"), cursor_str(cursor, "content_type"), cursor_int(cursor, "content_id")
+            )
+            stmt = stmt.where(tuple_(*key) < tuple_(*position))
+
+        rows = self.session.execute(stmt.limit(limit + 1)).all()
+        if not rows and cursor is None and self.session.get(self.User, user_id) is None:
+            raise NotFound(f"Usuario con id {user_id} no encontrado.")
+        result = page(
+            rows,
+            limit,
+            lambda d: {"day": d.day, "content_type": d.content_type, "content_id": d.content_id},
+            lambda d: {**d._mapping, "day": d.day.isoformat()},
+        )
         return jsonify(result), 200
 
+    def _occurred_range(self, since: date | None, until: date | None) -> list:
+        """Condiciones sobre `occurred_at` para dias UTC inclusivos."""
+        conditions = []
+        if since is not None:
+            conditions.append(self.WatchEvent.occurred_at >= datetime.combine(since, time.min, tzinfo=timezone.utc))
+        if until is not None:
+            end = datetime.combine(until + timedelta(days=1), time.min, tzinfo=timezone.utc)
+            conditions.append(self.WatchEvent.occurred_at < end)
+        return conditions
+
     def add_movie(self, user_id: int, movie_id: int) -> dict:
         """Agrega una pelicula a la lista del usuario."""
         # TODO: validar existencia del usuario y pelicula antes de crear el registro.
-        user = self.User.query.get(user_id)
+        user = self.session.get(self.User, user_id)
         if not user:
             raise NotFound(f"Usuario con id {user_id} no encontrado.")
-        movie = self.Movie.query.get(movie_id)
+        movie = self.session.get(self.Movie, movie_id)
         if not movie:
             raise NotFound(f"Película con id {movie_id} no encontrada.")
 
@@ -58,16 +333,16 @@ class ProgressService:
         )
 
         self.session.add(entry)
-        self.session.commit()
+        self._commit_new_entry("La película ya está en la lista del usuario.", event_row(entry, "added"))
         return jsonify(entry.to_dict()), 201
 
     def add_series(self, user_id: int, series_id: int) -> dict:
         """Agrega una serie a la lista del usuario."""
         # TODO: crear WatchEntry inicial con temporadas/episodios en cero.
-        user = self.User.query.get(user_id)
+        user = self.session.get(self.User, user_id)
         if not user:
             raise NotFound(f"Usuario con id {user_id} no encontrado.")
-        serie = self.Serie.query.get(series_id)
+        serie = self.session.get(self.Serie, series_id)
         if not serie:
             raise NotFound(f"Serie con id {series_id} no encontrada.")
 
@@ -85,15 +360,26 @@ class ProgressService:
             current_season=1,
             current_episode=1,
             watched_episodes=0,
-            total_episodes=sum(s.episodes_count for s in serie.seasons) if serie.seasons else 0,
+            total_episodes=serie.total_episodes,
         )
 
         self.session.add(entry)
-        self.session.commit()
+        self._commit_new_entry("La serie ya está en la lista del usuario.", event_row(entry, "added"))
         return jsonify(entry.to_dict()), 201
 
     def update_series_progress(self, user_id: int, series_id: int, payload: dict) -> dict:
-        """Actualiza el progreso de una serie en la lista del usuario."""
+        """Actualiza el progreso de una serie en la lista del usuario.
+
+        Con el buffer de progreso activo el tick se valida como sin buffer (sin
+        entrada o fuera de rango es un error) leyendo solo el total de episodios,
+        los cambios quedan encolados y se responde 202; si el buffer esta lleno se
+        escribe en el momento como sin buffer.
+        """
+        if progress_buffer.enabled:
+            changes = self._validate_progress(self._progress_limits(user_id, series_id), payload)
+            if progress_buffer.add(user_id, series_id, changes):
+                return jsonify({"series_id": series_id, "queued": True, "changes": changes}), 202
+
         # TODO: validar limites de temporadas y episodios, recalcular porcentaje.
         entry = self.WatchEntry.query.filter_by(
             user_id=user_id, content_type="serie", content_id=series_id
@@ -101,35 +387,200 @@ class ProgressService:
         if not entry:
             raise NotFound(f"No hay registro de progreso para la serie {series_id} del usuario {user_id}.")
 
-        serie = self.Serie.query.get(series_id)
-        if not serie:
-            raise NotFound(f"Serie con id {series_id} no encontrada.")
-
-        total_episodes = sum(s.episodes_count for s in serie.seasons) if serie.seasons else 0
-        entry.total_episodes = total_episodes
-
-        if "watched_episodes" in payload:
-            watched = int(payload["watched_episodes"])
-            if watched < 0 or (total_episodes and watched > total_episodes):
-                raise BadRequest("Número de episodios vistos fuera de rango.")
-            entry.watched_episodes = watched
+        changes = self._validate_progress(entry, payload)
+        record_events(self.session, [self._apply_progress(entry, changes)])
 
-        if "current_season" in payload:
-            entry.current_season = int(payload["current_season"])
+        self.session.commit()
+        return jsonify(entry.to_dict()), 200
 
-        if "current_episode" in payload:
-            entry.current_episode = int(payload["current_episode"])
+    def update_many_series_progress(self, user_id: int, updates: list) -> dict:
+        """Aplica varias actualizaciones de progreso en una sola transaccion.
+
+        Las entradas se leen con una unica consulta IN; cada elemento se valida
+        por separado y el resultado informa el estado de cada uno.
+        """
+        max_items = current_app.config["PROGRESS_BATCH_MAX_ITEMS"]
+        if not isinstance(updates, list) or not updates:
+            raise BadRequest("El cuerpo debe ser una lista no vacia de actualizaciones.")
+        if len(updates) > max_items:
+            raise BadRequest(f"Se admiten como maximo {max_items} actualizaciones por solicitud.")
+
+        series_ids = {
+            item["series_id"] for item in updates
+            if isinstance(item, dict) and isinstance(item.get("series_id"), int)
+        }
+        # Esta escritura es mas nueva que los ticks encolados de las mismas series:
+        # se descartan solo si el commit sale bien, sin vaciados entre medio.
+        with progress_buffer.superseding(user_id, series_ids):
+            results = self._apply_many_progress(user_id, updates, series_ids)
+        return jsonify({"results": results}), 200
+
+    def _apply_many_progress(self, user_id: int, updates: list, series_ids: set[int]) -> list[dict]:
+        """Valida y aplica cada actualizacion del lote y confirma; devuelve el resultado por elemento."""
+        entries = {
+            entry.content_id: entry
+            for entry in self.WatchEntry.query
+            .filter(
+                self.WatchEntry.user_id == user_id,
+                self.WatchEntry.content_type == "serie",
+                self.WatchEntry.content_id.in_(series_ids),
+            )
+            .options(selectinload(self.WatchEntry.serie))
+        }
+
+        results = []
+        applied = []
+        events = []
+        seen = set()
+        for item in updates:
+            series_id = item.get("series_id") if isinstance(item, dict) else None
+            if not isinstance(series_id, int) or isinstance(series_id, bool):
+                results.append({"series_id": series_id, "status": 400, "error": "El campo 'series_id' es obligatorio."})
+                continue
+            if series_id in seen:
+                results.append({"series_id": series_id, "status": 400, "error": "Serie repetida en la solicitud."})
+                continue
+            seen.add(series_id)
+
+            entry = entries.get(series_id)
+            if entry is None:
+                results.append({
+                    "series_id": series_id,
+                    "status": 404,
+                    "error": f"No hay registro de progreso para la serie {series_id} del usuario {user_id}.",
+                })
+                continue
+            try:
+                changes = self._validate_progress(entry, item)
+            except BadRequest as e:
+                results.append({"series_id": series_id, "status": 400, "error": e.description})
+                continue
+
+            events.append(self._apply_progress(entry, changes))
+            result = {"series_id": series_id, "status": 200}
+            results.append(result)
+            applied.append((result, entry))
+
+        # Se serializa tras el flush y antes del commit para no recargar cada entrada.
+        self.session.flush()
+        for result, entry in applied:
+            result["entry"] = entry.to_dict()
+        record_events(self.session, events)
+        self.session.commit()
+        return results
+
+    def apply_buffered_progress(self, updates: dict[tuple[int, int], dict]) -> dict:
+        """Aplica progreso encolado de varios usuarios en un solo commit.
+
+        `updates` va de (user_id, series_id) a los cambios ya validados al
+        encolar. Si la entrada se borro o su total bajo desde entonces, el
+        cambio se omite y se devuelve contado.
+        """
+        # OR de pares en lugar de un IN de tuplas: SQLAlchemy lo emite como
+        # IN (VALUES ...) y SQLite lo resuelve recorriendo toda la tabla.
+        keys = list(updates)
+        entries = {}
+        for offset in range(0, len(keys), BUFFERED_LOOKUP_CHUNK):
+            pairs = [
+                and_(self.WatchEntry.user_id == user_id, self.WatchEntry.content_id == series_id)
+                for user_id, series_id in keys[offset:offset + BUFFERED_LOOKUP_CHUNK]
+            ]
+            for entry in self.WatchEntry.query.filter(self.WatchEntry.content_type == "serie", or_(*pairs)):
+                entries[entry.user_id, entry.content_id] = entry
+
+        counts = {"applied": 0, "not_found": 0, "invalid": 0}
+        events = []
+        for key, payload in updates.items():
+            entry = entries.get(key)
+            if entry is None:
+                counts["not_found"] += 1
+                continue
+            try:
+                changes = self._validate_progress(entry, payload)
+            except BadRequest:
+                counts["invalid"] += 1
+                continue
+            events.append(self._apply_progress(entry, changes))
+            counts["applied"] += 1
+
+        record_events(self.session, events)
+        self.session.commit()
+        return counts
+
+    def _progress_limits(self, user_id: int, series_id: int):
+        """Fila con `total_episodes` de la entrada, suficiente para `_validate_progress`."""
+        row = self.session.execute(
+            select(self.WatchEntry.total_episodes).where(
+                self.WatchEntry.user_id == user_id,
+                self.WatchEntry.content_type == "serie",
+                self.WatchEntry.content_id == series_id,
+            )
+        ).first()
+        if row is None:
+            raise NotFound(f"No hay registro de progreso para la serie {series_id} del usuario {user_id}.")
+        return row
+
+    @staticmethod
+    def _parse_progress(payload: dict) -> dict:
+        """Convierte los campos de progreso a enteros; no necesita la entrada."""
+        changes = {}
+        for field in ("watched_episodes", "current_season", "current_episode"):
+            if field not in payload:
+                continue
+            try:
+                changes[field] = int(payload[field])
+            except (TypeError, ValueError):
+                raise BadRequest(f"El campo '{field}' debe ser un entero.")
+
+        if changes.get("watched_episodes", 0) < 0:
+            raise BadRequest("Número de episodios vistos fuera de rango.")
+        return changes
+
+    @classmethod
+    def _validate_progress(cls, entry, payload: dict) -> dict:
+        """Valida los campos de progreso sin modificar la entrada."""
+        # total_episodes se mantiene sincronizado desde SeriesService.add_season.
+        total_episodes = entry.total_episodes or 0
+        changes = cls._parse_progress(payload)
+
+        watched = changes.get("watched_episodes")
+        if watched is not None and total_episodes and watched > total_episodes:
+            raise BadRequest("Número de episodios vistos fuera de rango.")
+
+        return changes
+
+    @staticmethod
+    def _apply_progress(entry, changes: dict) -> dict:
+        """Aplica cambios ya validados y marca la serie como vista si corresponde.
+
+        Devuelve la fila de historial del cambio.
+        """
+        previous_watched, previous_status = entry.watched_episodes, entry.status
+        for field, value in changes.items():
+            setattr(entry, field, value)
 
         # Si completó todos los episodios
         if entry.watched_episodes == entry.total_episodes and entry.total_episodes > 0:
             entry.mark_as_watched()
 
-        self.session.commit()
-        return jsonify(entry.to_dict()), 200
+        completed = entry.status == "completed" and previous_status != "completed"
+        return event_row(entry, "completed" if completed else "progress", previous_watched)
+
+    def _commit_new_entry(self, duplicate_message: str, event: dict) -> None:
+        """Confirma una entrada nueva y su evento; el indice unico resuelve altas concurrentes."""
+        try:
+            record_events(self.session, [event])
+            self.session.commit()
+        except IntegrityError:
+            self.session.rollback()
+            raise BadRequest(duplicate_message)
 
 
-# Instancia del servicio
-service = ProgressService()
+def get_service() -> ProgressService:
+    """Servicio del contexto de aplicacion actual; se construye en el primer uso."""
+    if "progress_service" not in g:
+        g.progress_service = ProgressService()
+    return g.progress_service
 
 
 @bp.get("/me/watchlist")
@@ -141,13 +592,85 @@ def get_my_watchlist():
         return jsonify({"error": "Falta el encabezado X-User-Id"}), 401
 
     try:
-        return service.list_watchlist(user_id)
+        limit, cursor = parse_page_args(request.args)
+        fields = WATCH_ENTRY_PROJECTION.parse_fields(request.args)
+        return get_service().list_watchlist(user_id, limit, cursor, fields)
+    except BadRequest as e:
+        return jsonify({"error": str(e)}), 400
     except NotFound as e:
         return jsonify({"error": str(e)}), 404
     except Exception as e:
         return jsonify({"error": f"Error al obtener la watchlist: {str(e)}"}), 500
 
 
+@bp.get("/me/stats")
+def get_my_stats():
+    """Devuelve conteos y porcentajes agregados de la watchlist del usuario."""
+    user_id = request.headers.get("X-User-Id", type=int)
+    if not user_id:
+        return jsonify({"error": "Falta el encabezado X-User-Id"}), 401
+
+    try:
+        return get_service().get_stats(user_id)
+    except NotFound as e:
+        return jsonify({"error": str(e)}), 404
+    except Exception as e:
+        return jsonify({"error": f"Error al obtener las estadisticas: {str(e)}"}), 500
+
+
+@bp.get("/me/history")
+def get_my_history():
+    """Devuelve los eventos recientes de la watchlist del usuario (`?since=&until=`)."""
+    user_id = request.headers.get("X-User-Id", type=int)
+    if not user_id:
+        return jsonify({"error": "Falta el encabezado X-User-Id"}), 401
+
+    try:
+        limit, cursor = parse_page_args(request.args)
+        since, until = parse_history_range(request.args)
+        return get_service().list_history(user_id, limit, cursor, since, until)
+    except BadRequest as e:
+        return jsonify({"error": str(e)}), 400
+    except NotFound as e:
+        return jsonify({"error": str(e)}), 404
+    except Exception as e:
+        return jsonify({"error": f"Error al obtener el historial: {str(e)}"}), 500
+
+
+@bp.get("/me/history/daily")
+def get_my_daily_history():
+    """Devuelve el historial resumido por dia y contenido (`?since=&until=`)."""
+    user_id = request.headers.get("X-User-Id", type=int)
+    if not user_id:
+        return jsonify({"error": "Falta el encabezado X-User-Id"}), 401
+
+    try:
+        limit, cursor = parse_page_args(request.args)
+        since, until = parse_history_range(request.args)
+        return get_service().list_daily_history(user_id, limit, cursor, since, until)
+    except BadRequest as e:
+        return jsonify({"error": str(e)}), 400
+    except NotFound as e:
+        return jsonify({"error": str(e)}), 404
+    except Exception as e:
+        return jsonify({"error": f"Error al obtener el historial diario: {str(e)}"}), 500
+
+
+@bp.get("/me/summary")
+def get_my_summary():
+    """Devuelve los contadores de la watchlist del usuario (watching, completed, episodios)."""
+    user_id = request.headers.get("X-User-Id", type=int)
+    if not user_id:
+        return jsonify({"error": "Falta el encabezado X-User-Id"}), 401
+
+    try:
+        return get_service().get_summary(user_id)
+    except NotFound as e:
+        return jsonify({"error": str(e)}), 404
+    except Exception as e:
+        return jsonify({"error": f"Error al obtener el resumen: {str(e)}"}), 500
+
+
 @bp.post("/watchlist/movies/<int:movie_id>")
 def add_movie_to_watchlist(movie_id: int):
     """Agrega una pelicula a la lista del usuario."""
@@ -157,7 +680,7 @@ def add_movie_to_watchlist(movie_id: int):
         return jsonify({"error": "Falta el encabezado X-User-Id"}), 401
 
     try:
-        return service.add_movie(user_id, movie_id)
+        return get_service().add_movie(user_id, movie_id)
     except (BadRequest, NotFound) as e:
         return jsonify({"error": str(e)}), 400
     except Exception as e:
@@ -173,7 +696,7 @@ def add_series_to_watchlist(series_id: int):
         return jsonify({"error": "Falta el encabezado X-User-Id"}), 401
 
     try:
-        return service.add_series(user_id, series_id)
+        return get_service().add_series(user_id, series_id)
     except (BadRequest, NotFound) as e:
         return jsonify({"error": str(e)}), 400
     except Exception as e:
@@ -182,7 +705,7 @@ def add_series_to_watchlist(series_id: int):
 
 @bp.patch("/progress/series/<int:series_id>")
 def update_series_progress(series_id: int):
-    """Actualiza los datos de progreso de una serie."""
+    """Actualiza los datos de progreso de una serie (202 si queda en el buffer de progreso)."""
     user_id = request.headers.get("X-User-Id", type=int)
     payload = request.get_json(silent=True) or {}
 
@@ -191,8 +714,25 @@ def update_series_progress(series_id: int):
         return jsonify({"error": "Falta el encabezado X-User-Id"}), 401
 
     try:
-        return service.update_series_progress(user_id, series_id, payload)
+        return get_service().update_series_progress(user_id, series_id, payload)
     except (BadRequest, NotFound) as e:
         return jsonify({"error": str(e)}), 400
     except Exception as e:
         return jsonify({"error": f"Error al actualizar progreso: {str(e)}"}), 500
+
+
+@bp.patch("/progress/series")
+def update_many_series_progress():
+    """Actualiza el progreso de varias series en una sola solicitud."""
+    user_id = request.headers.get("X-User-Id", type=int)
+    payload = request.get_json(silent=True)
+
+    if not user_id:
+        return jsonify({"error": "Falta el encabezado X-User-Id"}), 401
+
+    try:
+        return get_service().update_many_series_progress(user_id, payload)
+    except BadRequest as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": f"Error al actualizar progreso: {str(e)}"}), 500
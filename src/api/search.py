@@ -0,0 +1,115 @@
+"""Busqueda de texto completo sobre los titulos del catalogo."""
+from flask import Blueprint, g, jsonify, request
+from sqlalchemy import Float, Integer, String, and_, column, func, literal_column, or_, select, table, union_all
+from werkzeug.exceptions import BadRequest
+from src.extensions import db
+from src.search import KINDS, match_expression, match_terms
+
+from .pagination import cursor_float, cursor_int, page, parse_page_args
+
+bp = Blueprint("search", __name__, url_prefix="/search")
+
+# Tabla virtual FTS5 creada por src.search; `rank` es la columna oculta con bm25.
+title_search = table("title_search", column("rowid", Integer), column("title", String), column("rank", Float))
+
+
+class SearchService:
+    """Consulta el indice de titulos y arma resultados ordenados por relevancia."""
+
+    def __init__(self):
+        from src.models.movie import Movie
+        from src.models.serie import Serie
+
+        self.Movie = Movie
+        self.Serie = Serie
+        self.session = db.session
+
+    def search(self, query: str, limit: int, cursor: dict | None = None, kind: str | None = None):
+        """Devuelve una pagina de peliculas y series cuyo titulo coincide con `query`.
+
+        Todas las palabras deben aparecer y la ultima se busca como prefijo.
+        El orden es por relevancia (mayor `score` primero) y luego por
+        documento, y el cursor guarda ambos valores del ultimo resultado.
+        """
+        terms = match_terms(query)
+        if not terms:
+            raise BadRequest("El parametro 'q' debe contener al menos una palabra.")
+
+        dialect = self.session.get_bind().dialect.name
+        expression = match_expression(terms, dialect)
+        matches = (
+            self._postgres_matches(expression, kind) if dialect == "postgresql"
+            else self._sqlite_matches(expression, kind)
+        ).subquery()
+
+        # `score` es menor cuanto mas relevante (bm25 de FTS5; ts_rank negado en Postgres).
+        stmt = select(matches).order_by(matches.c.score, matches.c.doc)
+        if cursor is not None:
+            score, doc = cursor_float(cursor, "score"), cursor_int(cursor, "doc")
+            stmt = stmt.where(or_(matches.c.score > score, and_(matches.c.score == score, matches.c.doc > doc)))
+
+        rows = self.session.execute(stmt.limit(limit + 1)).all()
+        result = page(rows, limit, lambda row: {"score": row.score, "doc": row.doc}, self._serialize)
+        return jsonify(result), 200
+
+    @staticmethod
+    def _sqlite_matches(expression: str, kind: str | None):
+        stmt = select(
+            title_search.c.rowid.label("doc"),
+            title_search.c.title,
+            title_search.c.rank.label("score"),
+        ).where(literal_column("title_search").op("MATCH")(expression))
+        if kind is not None:
+            stmt = stmt.where(title_search.c.rowid % 2 == KINDS[kind])
+        return stmt
+
+    def _postgres_matches(self, expression: str, kind: str | None):
+        tsquery = func.to_tsquery("simple", expression)
+        parts = []
+        for name, model in (("movie", self.Movie), ("serie", self.Serie)):
+            if kind is not None and kind != name:
+                continue
+            tsv = literal_column(f"{model.__tablename__}.title_tsv")
+            parts.append(
+                select(
+                    (model.id * 2 + KINDS[name]).label("doc"),
+                    model.title,
+                    (-func.ts_rank(tsv, tsquery)).label("score"),
+                ).where(tsv.op("@@")(tsquery))
+            )
+        return union_all(*parts) if len(parts) > 1 else parts[0]
+
+    @staticmethod
+    def _serialize(row) -> dict:
+        return {
+            "type": "movie" if row.doc % 2 == KINDS["movie"] else "serie",
+            "id": row.doc // 2,
+            "title": row.title,
+            "score": round(-row.score, 4),
+        }
+
+
+def get_service() -> SearchService:
+    """Servicio del contexto de aplicacion actual; se construye en el primer uso."""
+    if "search_service" not in g:
+        g.search_service = SearchService()
+    return g.search_service
+
+
+@bp.get("")
+def search():
+    """Busca peliculas y series por titulo (`?q=`), opcionalmente filtrando por `type`."""
+    query = request.args.get("q", "")
+    kind = request.args.get("type")
+
+    try:
+        if not query.strip():
+            raise BadRequest("El parametro 'q' es obligatorio.")
+        if kind is not None and kind not in KINDS:
+            raise BadRequest("El parametro 'type' debe ser 'movie' o 'serie'.")
+        limit, cursor = parse_page_args(request.args)
+        return get_service().search(query, limit, cursor, kind)
+    except BadRequest as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": f"Error al buscar: {str(e)}"}), 500
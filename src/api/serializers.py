@@ -0,0 +1,224 @@
+"""Serializadores por proyeccion de columnas para los endpoints de lectura.
+
+Seleccionan unicamente las columnas necesarias como filas de Core y arman
+los diccionarios directamente, sin construir objetos ORM ni registrarlos en
+el identity map. Sin `fields` la forma de salida es identica a la de los
+`to_dict` de los modelos; con `?fields=` se reducen tanto el JSON como las
+columnas y los JOIN de la consulta.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Callable
+
+from sqlalchemy import Row, Select, select
+from werkzeug.datastructures import MultiDict
+from werkzeug.exceptions import BadRequest
+
+from src.models import Movie, Season, Serie, WatchEntry
+from src.models.watch_entry import compute_percentage
+
+
+@dataclass(frozen=True)
+class Field:
+    """Campo del JSON: columnas que necesita, como armarlo y que JOIN requiere."""
+
+    columns: tuple
+    build: Callable[[Row], Any]
+    joins: tuple[str, ...] = ()
+
+
+class Projection:
+    """Traduce una lista de campos a un SELECT minimo y a su serializador."""
+
+    def __init__(
+        self,
+        base,
+        fields: dict[str, Field],
+        required: tuple = (),
+        joins: dict[str, Callable[[Select], Select]] | None = None,
+        optional: tuple[str, ...] = (),
+    ):
+        self.base = base
+        self.fields = fields
+        self.required = required
+        self.joins = joins or {}
+        # Campos que solo se devuelven si se piden explicitamente.
+        self.default_fields = tuple(name for name in fields if name not in optional)
+
+    def parse_fields(self, args: MultiDict, extra: tuple[str, ...] = ()) -> tuple[str, ...] | None:
+        """Lee `?fields=a,b` y valida los nombres; None significa todos."""
+        raw = args.get("fields")
+        if raw is None:
+            return None
+
+        requested = tuple(dict.fromkeys(name.strip() for name in raw.split(",") if name.strip()))
+        valid = (*self.fields, *extra)
+        unknown = [name for name in requested if name not in valid]
+        if not requested or unknown:
+            raise BadRequest(
+                f"Campos no validos en 'fields': {', '.join(unknown) or 'vacio'}. "
+                f"Disponibles: {', '.join(valid)}."
+            )
+        return requested
+
+    def select(self, fields: tuple[str, ...] | None = None) -> Select:
+        """SELECT con las columnas (y JOIN) de los campos pedidos."""
+        selected = self._selected(fields)
+        columns = {column.key: column for column in self.required}
+        joins = []
+        for name in selected:
+            field = self.fields[name]
+            for column in field.columns:
+                columns.setdefault(column.key, column)
+            joins.extend(join for join in field.joins if join not in joins)
+
+        stmt = select(*columns.values()).select_from(self.base)
+        for join in joins:
+            stmt = self.joins[join](stmt)
+        return stmt
+
+    def serializer(self, fields: tuple[str, ...] | None = None) -> Callable[[Row], dict]:
+        """Funcion fila -> dict que solo incluye los campos pedidos."""
+        builders = [(name, self.fields[name].build) for name in self._selected(fields)]
+
+        def to_dict(row: Row) -> dict:
+            data = {}
+            for name, build in builders:
+                value = build(row)
+                if value is not _OMIT:
+                    data[name] = value
+            return data
+
+        return to_dict
+
+    def _selected(self, fields: tuple[str, ...] | None) -> tuple[str, ...]:
+        if fields is None:
+            return self.default_fields
+        return tuple(name for name in fields if name in self.fields)
+
+
+# Valor centinela: el campo no se incluye en la salida (p. ej. `movie` en una serie).
+_OMIT = object()
+
+
+def pick(payload: dict, fields: tuple[str, ...] | None) -> dict:
+    """Recorta un payload ya serializado (p. ej. desde el cache) a `fields`."""
+    if fields is None:
+        return payload
+    return {name: payload[name] for name in fields if name in payload}
+
+
+def _column(column) -> Field:
+    """Campo que corresponde 1 a 1 con una columna."""
+    key = column.key
+    return Field(columns=(column,), build=lambda row: row._mapping[key])
+
+
+MOVIE_PROJECTION = Projection(
+    Movie,
+    {
+        "id": _column(Movie.id),
+        "title": _column(Movie.title),
+        "genre": _column(Movie.genre),
+        "release_year": _column(Movie.release_year),
+        "created_at": _column(Movie.created_at),
+        "updated_at": _column(Movie.updated_at),
+    },
+    # id y updated_at se leen siempre: los usan el cursor y el ETag.
+    required=(Movie.id, Movie.updated_at),
+)
+
+SERIE_PROJECTION = Projection(
+    Serie,
+    {
+        "id": _column(Serie.id),
+        "title": _column(Serie.title),
+        "total_seasons": Field(columns=(Serie.total_seasons,), build=lambda row: row.total_seasons or 0),
+        "created_at": _column(Serie.created_at),
+    },
+    required=(Serie.id, Serie.updated_at),
+)
+
+SEASON_PROJECTION = Projection(
+    Season,
+    {
+        "id": _column(Season.id),
+        "number": _column(Season.number),
+        "episodes_count": _column(Season.episodes_count),
+    },
+    required=(Season.series_id,),
+)
+
+_MOVIE_COLUMNS = tuple(
+    Movie.__table__.c[name].label(f"movie_{name}")
+    for name in ("id", "title", "genre", "release_year", "created_at", "updated_at")
+)
+_SERIE_COLUMNS = tuple(
+    Serie.__table__.c[name].label(f"serie_{name}")
+    for name in ("id", "title", "total_seasons", "created_at")
+)
+
+
+def _embedded_movie(row: Row):
+    if row.content_type != "movie" or row.movie_id is None:
+        return _OMIT
+    return {
+        "id": row.movie_id,
+        "title": row.movie_title,
+        "genre": row.movie_genre,
+        "release_year": row.movie_release_year,
+        "created_at": row.movie_created_at,
+        "updated_at": row.movie_updated_at,
+    }
+
+
+def _embedded_serie(row: Row):
+    if row.content_type != "serie" or row.serie_id is None:
+        return _OMIT
+    return {
+        "id": row.serie_id,
+        "title": row.serie_title,
+        "total_seasons": row.serie_total_seasons or 0,
+        "created_at": row.serie_created_at,
+    }
+
+
+def _content_title(row: Row):
+    return row.movie_title if row.content_type == "movie" else row.serie_title
+
+
+WATCH_ENTRY_PROJECTION = Projection(
+    WatchEntry,
+    {
+        "id": _column(WatchEntry.id),
+        "user_id": _column(WatchEntry.user_id),
+        "content_type": _column(WatchEntry.content_type),
+        "content_id": _column(WatchEntry.content_id),
+        "status": _column(WatchEntry.status),
+        "current_season": _column(WatchEntry.current_season),
+        "current_episode": _column(WatchEntry.current_episode),
+        "watched_episodes": _column(WatchEntry.watched_episodes),
+        "total_episodes": _column(WatchEntry.total_episodes),
+        "percentage_watched": Field(
+            columns=(WatchEntry.watched_episodes, WatchEntry.total_episodes),
+            build=lambda row: round(compute_percentage(row.watched_episodes, row.total_episodes), 2),
+        ),
+        "updated_at": _column(WatchEntry.updated_at),
+        "movie": Field(columns=(WatchEntry.content_type, *_MOVIE_COLUMNS), build=_embedded_movie, joins=("movie",)),
+        "serie": Field(columns=(WatchEntry.content_type, *_SERIE_COLUMNS), build=_embedded_serie, joins=("serie",)),
+        # Titulo plano del contenido, pensado para clientes livianos.
+        "title": Field(
+            columns=(WatchEntry.content_type, _MOVIE_COLUMNS[1], _SERIE_COLUMNS[1]),
+            build=_content_title,
+            joins=("movie", "serie"),
+        ),
+    },
+    required=(WatchEntry.id, WatchEntry.updated_at),
+    joins={
+        "movie": lambda stmt: stmt.outerjoin(WatchEntry.movie),
+        "serie": lambda stmt: stmt.outerjoin(WatchEntry.serie),
+    },
+    optional=("title",),
+)
@@ -2,9 +2,18 @@
 
 from __future__ import annotations
 
-from flask import Blueprint, jsonify, request
-from werkzeug.exceptions import BadRequest, NotFound
-from src.extensions import db
+from flask import Blueprint, current_app, g, jsonify, request
+from sqlalchemy import case, func, insert, select, update
+from werkzeug.exceptions import BadRequest, NotFound, UnsupportedMediaType
+from src.cache import CachedDetail
+from src.extensions import autocomplete, db, detail_cache
+from src.summary import apply_summary_deltas
+
+from .bulk import ImportReport, batched, iter_records, parse_batch_size
+from .conditional import conditional, make_etag
+from .pagination import cursor_int, page, parse_page_args
+from .serializers import SEASON_PROJECTION, SERIE_PROJECTION, pick
+from .streaming import stream_json_array, wants_stream
 
 bp = Blueprint("series", __name__, url_prefix="/series")
 
@@ -16,55 +25,215 @@ class SeriesService:
     def __init__(self):
         from src.models.serie import Serie
         from src.models.season import Season
+        from src.models.watch_entry import WatchEntry
         self.Serie = Serie
         self.Season = Season
+        self.WatchEntry = WatchEntry
         self.session = db.session
 
-    def list_series(self) -> list[dict]:
-        """Retorna la lista de series disponibles."""
-        # TODO: consultar las series existentes y devolverlas serializadas.
-        series = self.Serie.query.all()
-        return jsonify([s.to_dict(include_seasons=False) for s in series]), 200
+    def list_series(self, limit: int, cursor: dict | None = None, fields: tuple[str, ...] | None = None) -> dict:
+        """Retorna una pagina de series ordenadas por id."""
+        # El ETag sale de (id, updated_at) de las filas de esta pagina y la siguiente.
+        versions = self.session.execute(
+            self._page_statement(select(self.Serie.id, self.Serie.updated_at), limit, cursor)
+        ).all()
+        last_modified = max((row.updated_at for row in versions), default=None)
+        etag = make_etag("series", [tuple(row) for row in versions], limit, cursor, fields)
+
+        def render():
+            rows = self.session.execute(self._page_statement(SERIE_PROJECTION.select(fields), limit, cursor)).all()
+            result = page(rows, limit, lambda s: {"id": s.id}, SERIE_PROJECTION.serializer(fields))
+            return jsonify(result), 200
+
+        return conditional(render, etag, last_modified)
+
+    def _page_statement(self, stmt, limit: int, cursor: dict | None):
+        """Agrega a `stmt` el cursor, el orden por id y el LIMIT de una pagina."""
+        if cursor is not None:
+            stmt = stmt.where(self.Serie.id > cursor_int(cursor, "id"))
+        return stmt.order_by(self.Serie.id).limit(limit + 1)
+
+    def stream_series(self, fields: tuple[str, ...] | None = None):
+        """Emite todas las series como arreglo JSON en streaming."""
+        # Subconsultas separadas: asi max(updated_at) sale de ix_serie_updated_at.
+        total, last_modified = self.session.execute(select(
+            select(func.count()).select_from(self.Serie).scalar_subquery(),
+            select(func.max(self.Serie.updated_at)).scalar_subquery(),
+        )).one()
+        etag = make_etag("series-stream", total, last_modified, fields)
+
+        def render():
+            chunk_size = current_app.config["STREAM_CHUNK_SIZE"]
+            stmt = SERIE_PROJECTION.select(fields).order_by(self.Serie.id).execution_options(yield_per=chunk_size)
+            serialize = SERIE_PROJECTION.serializer(fields)
+            return stream_json_array(lambda: self.session.execute(stmt), serialize), 200
+
+        return conditional(render, etag, last_modified)
 
     def create_series(self, payload: dict) -> dict:
-        """Crea una nueva serie."""
-        # TODO: validar payload (titulo, temporadas, etc.) y persistir la serie.
-        if "title" not in payload or not payload["title"]:
-            raise BadRequest("El campo 'title' es obligatorio.")
+        """Crea una serie y sus temporadas en una sola transaccion."""
+        serie_row, season_rows = self._validate_series_payload(payload)
 
-        serie = self.Serie(title=payload["title"])
+        serie = self.Serie(**serie_row)
         self.session.add(serie)
-        self.session.commit()
-
-        # Crear temporadas iniciales si vienen en el payload
-        seasons_data = payload.get("seasons", [])
-        for season_payload in seasons_data:
-            number = season_payload.get("number")
-            episodes = season_payload.get("episodes_count", 0)
-            if not number:
-                continue
-            new_season = self.Season(
-                series_id=serie.id,
-                number=number,
-                episodes_count=episodes,
+        # flush para obtener el id sin confirmar; las temporadas van en un unico INSERT.
+        self.session.flush()
+        if season_rows:
+            self.session.execute(
+                insert(self.Season.__table__),
+                [{**row, "series_id": serie.id} for row in season_rows],
             )
-            self.session.add(new_season)
 
         self.session.commit()
+        autocomplete.title_changed("serie", serie.id, serie.title)
         return jsonify(serie.to_dict(include_seasons=True)), 201
 
-    def get_series(self, series_id: int) -> dict:
+    def bulk_create_series(self, records, batch_size: int) -> dict:
+        """Importa series con sus temporadas anidadas en lotes de INSERT multi-fila."""
+        report = ImportReport(current_app.config["BULK_IMPORT_MAX_ERRORS"])
+        season_table = self.Season.__table__
+
+        for batch in batched(records, batch_size):
+            valid = []
+            for line, record, error in batch:
+                if error is None:
+                    try:
+                        valid.append((line, *self._validate_series_payload(record)))
+                        continue
+                    except BadRequest as e:
+                        error = e.description
+                report.add_error(line, error)
+
+            if not valid:
+                continue
+            try:
+                ids = self._insert_series_rows([serie_row for _, serie_row, _ in valid])
+                season_rows = [
+                    {**row, "series_id": serie_id}
+                    for serie_id, (_, _, rows) in zip(ids, valid)
+                    for row in rows
+                ]
+                if season_rows:
+                    self.session.execute(insert(season_table), season_rows)
+                self.session.commit()
+                report.inserted += len(valid)
+                for serie_id, (_, serie_row, _) in zip(ids, valid):
+                    autocomplete.title_changed("serie", serie_id, serie_row["title"])
+            except Exception as e:
+                self.session.rollback()
+                for line, _, _ in valid:
+                    report.add_error(line, f"Error al insertar el lote: {str(e)}")
+
+        return jsonify(report.to_dict()), 200
+
+    def _insert_series_rows(self, rows: list[dict]) -> list[int]:
+        """Inserta las series en una sentencia y devuelve sus ids en el orden de `rows`.
+
+        `sort_by_parameter_order=True` no sirve aqui: SQLite no tiene columna
+        centinela implicita y SQLAlchemy pasaria a un INSERT por fila. Dentro de
+        una sentencia los ids autoincrementales se asignan en el orden de VALUES
+        (SQLite y Postgres), asi que ordenar lo devuelto por id recupera el orden;
+        los titulos lo confirman.
+        """
+        table = self.Serie.__table__
+        returned = sorted(self.session.execute(insert(table).returning(table.c.id, table.c.title), rows).all())
+        if [title for _, title in returned] != [row["title"] for row in rows]:
+            raise RuntimeError("Los ids devueltos no siguen el orden de las filas insertadas.")
+        return [serie_id for serie_id, _ in returned]
+
+    def _validate_series_payload(self, payload: dict) -> tuple[dict, list[dict]]:
+        """Valida titulo y temporadas antes de tocar la base de datos."""
+        title = payload.get("title")
+        if not isinstance(title, str) or not title.strip():
+            raise BadRequest("El campo 'title' es obligatorio.")
+        if len(title) > 255:
+            raise BadRequest("El campo 'title' admite como maximo 255 caracteres.")
+
+        seasons_data = payload.get("seasons") or []
+        if not isinstance(seasons_data, list):
+            raise BadRequest("El campo 'seasons' debe ser una lista.")
+
+        season_rows = [self._validate_season(season) for season in seasons_data]
+        numbers = [row["number"] for row in season_rows]
+        duplicated = sorted({n for n in numbers if numbers.count(n) > 1})
+        if duplicated:
+            raise BadRequest(f"Temporadas duplicadas en el payload: {', '.join(map(str, duplicated))}.")
+
+        serie_row = {
+            "title": title,
+            "total_seasons": len(season_rows),
+            "total_episodes": sum(row["episodes_count"] for row in season_rows),
+        }
+        return serie_row, season_rows
+
+    @staticmethod
+    def _validate_season(payload: dict) -> dict:
+        """Valida numero y cantidad de episodios de una temporada."""
+        if not isinstance(payload, dict):
+            raise BadRequest("Cada temporada debe ser un objeto.")
+
+        number = payload.get("number")
+        episodes_count = payload.get("episodes_count", 0)
+
+        if not isinstance(number, int) or isinstance(number, bool) or number <= 0:
+            raise BadRequest("El campo 'number' debe ser un número positivo.")
+        if not isinstance(episodes_count, int) or isinstance(episodes_count, bool) or episodes_count < 0:
+            raise BadRequest("El campo 'episodes_count' no puede ser negativo.")
+
+        return {"number": number, "episodes_count": episodes_count}
+
+    def get_series(self, series_id: int, fields: tuple[str, ...] | None = None) -> dict:
         """Obtiene una serie y sus temporadas asociadas."""
-        # TODO: recuperar el registro y manejar la ausencia del recurso.
-        serie = self.Serie.query.get(series_id)
-        if not serie:
+        generation = detail_cache.generation()
+        cached = detail_cache.get("serie", series_id)
+        if cached is None and fields is not None:
+            return self._get_series_fields(series_id, fields)
+
+        if cached is None:
+            serie = self.session.get(self.Serie, series_id)
+            if not serie:
+                raise NotFound(f"No se encontró la serie con id {series_id}")
+            # add_season actualiza los totales de la serie, por lo que updated_at
+            # tambien cambia cuando cambian sus temporadas.
+            cached = CachedDetail(
+                payload=serie.to_dict(include_seasons=True),
+                etag=make_etag("serie", serie.id, serie.updated_at),
+                last_modified=serie.updated_at,
+            )
+            detail_cache.set("serie", series_id, cached, generation)
+
+        etag = cached.etag if fields is None else make_etag(cached.etag, fields)
+        return conditional(lambda: (jsonify(pick(cached.payload, fields)), 200), etag, cached.last_modified)
+
+    def _get_series_fields(self, series_id: int, fields: tuple[str, ...]):
+        """Detalle recortado: solo lee temporadas si se pidio `seasons`."""
+        row = self.session.execute(
+            SERIE_PROJECTION.select(fields).where(self.Serie.id == series_id)
+        ).first()
+        if row is None:
             raise NotFound(f"No se encontró la serie con id {series_id}")
-        return jsonify(serie.to_dict(include_seasons=True)), 200
+
+        def render():
+            data = SERIE_PROJECTION.serializer(fields)(row)
+            if "seasons" in fields:
+                seasons = self.session.execute(
+                    SEASON_PROJECTION.select()
+                    .where(self.Season.series_id == series_id)
+                    .order_by(self.Season.id)
+                )
+                data["seasons"] = [SEASON_PROJECTION.serializer()(season) for season in seasons]
+            return jsonify(data), 200
+
+        return conditional(
+            render,
+            make_etag(make_etag("serie", row.id, row.updated_at), fields),
+            row.updated_at,
+        )
 
     def update_series(self, series_id: int, payload: dict) -> dict:
         """Actualiza los campos permitidos de una serie."""
         # TODO: definir que campos son editables e implementar la actualizacion.
-        serie = self.Serie.query.get(series_id)
+        serie = self.session.get(self.Serie, series_id)
         if not serie:
             raise NotFound(f"No se encontró la serie con id {series_id}")
 
@@ -74,34 +243,35 @@ class SeriesService:
                 setattr(serie, field, payload[field])
 
         self.session.commit()
+        detail_cache.invalidate("serie", series_id)
+        if "title" in payload:
+            autocomplete.title_changed("serie", series_id, serie.title)
         return jsonify(serie.to_dict(include_seasons=True)), 200
 
     def delete_series(self, series_id: int) -> None:
         """Elimina una serie del catalogo."""
         # TODO: decidir estrategia de borrado e implementarla.
-        serie = self.Serie.query.get(series_id)
+        serie = self.session.get(self.Serie, series_id)
         if not serie:
             raise NotFound(f"No se encontró la serie con id {series_id}")
 
         # Borrado físico con cascada (se eliminan temporadas asociadas)
         self.session.delete(serie)
         self.session.commit()
+        detail_cache.invalidate("serie", series_id)
+        autocomplete.title_removed("serie", series_id)
         return "", 204
 
     def add_season(self, series_id: int, payload: dict) -> dict:
         """Agrega una temporada a una serie existente."""
         # TODO: validar numero de temporada y cantidad de episodios.
-        serie = self.Serie.query.get(series_id)
+        serie = self.session.get(self.Serie, series_id)
         if not serie:
             raise NotFound(f"No se encontró la serie con id {series_id}")
 
-        number = payload.get("number")
-        episodes_count = payload.get("episodes_count", 0)
-
-        if not number or number <= 0:
-            raise BadRequest("El campo 'number' debe ser un número positivo.")
-        if episodes_count < 0:
-            raise BadRequest("El campo 'episodes_count' no puede ser negativo.")
+        season_row = self._validate_season(payload)
+        number = season_row["number"]
+        episodes_count = season_row["episodes_count"]
 
         # Validar que no exista temporada duplicada
         existing = self.Season.query.filter_by(series_id=series_id, number=number).first()
@@ -115,21 +285,64 @@ class SeriesService:
         )
 
         self.session.add(new_season)
+
+        # Incremento en SQL para no perder altas concurrentes; luego un unico
+        # UPDATE propaga el nuevo total a las entradas de la watchlist.
+        serie.total_seasons = self.Serie.total_seasons + 1
+        serie.total_episodes = self.Serie.total_episodes + episodes_count
+        self.session.flush()
+
+        new_total = select(self.Serie.total_episodes).where(self.Serie.id == series_id).scalar_subquery()
+        entries = (self.WatchEntry.content_type == "serie", self.WatchEntry.content_id == series_id)
+        # Las completadas a las que la temporada nueva deja episodios sin ver vuelven a 'watching'.
+        reopened = (self.WatchEntry.status == "completed") & (
+            func.coalesce(self.WatchEntry.watched_episodes, 0) < new_total
+        )
+        # Core no pasa por el before_flush de src.summary: las diferencias se cuentan antes.
+        reopened_by_user = self.session.execute(
+            select(self.WatchEntry.user_id, func.count())
+            .where(*entries, reopened)
+            .group_by(self.WatchEntry.user_id)
+            .with_for_update()
+        ).all()
+        self.session.execute(
+            update(self.WatchEntry)
+            .where(*entries)
+            .values(
+                total_episodes=new_total,
+                status=case((reopened, "watching"), else_=self.WatchEntry.status),
+                # Sin esto el onupdate la moveria al principio de la watchlist de cada usuario.
+                updated_at=self.WatchEntry.updated_at,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        apply_summary_deltas(
+            self.session.connection(), {user_id: (0, count, -count, 0) for user_id, count in reopened_by_user}
+        )
         self.session.commit()
+        detail_cache.invalidate("serie", series_id)
 
         return jsonify(new_season.to_dict()), 201
 
 
-# Instancia del servicio
-service = SeriesService()
+def get_service() -> SeriesService:
+    """Servicio del contexto de aplicacion actual; se construye en el primer uso."""
+    if "series_service" not in g:
+        g.series_service = SeriesService()
+    return g.series_service
 
 
 @bp.get("/")
 def list_series():
-    """Devuelve todas las series registradas."""
-    # TODO: invocar service.list_series y devolver respuesta paginada si aplica.
+    """Devuelve las series registradas paginadas por cursor (o completas con `?stream=1`)."""
     try:
-        return service.list_series()
+        fields = SERIE_PROJECTION.parse_fields(request.args)
+        if wants_stream(request.args):
+            return get_service().stream_series(fields)
+        limit, cursor = parse_page_args(request.args)
+        return get_service().list_series(limit, cursor, fields)
+    except BadRequest as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         return jsonify({"error": f"Error al listar series: {str(e)}"}), 500
 
@@ -140,19 +353,37 @@ def create_series():
     payload = request.get_json(silent=True) or {}
     # TODO: usar service.create_series y devolver 201 con la nueva serie.
     try:
-        return service.create_series(payload)
+        return get_service().create_series(payload)
     except BadRequest as e:
         return jsonify({"error": str(e)}), 400
     except Exception as e:
         return jsonify({"error": f"Error al crear serie: {str(e)}"}), 500
 
 
+@bp.post("/bulk")
+def bulk_create_series():
+    """Carga masiva de series con temporadas anidadas desde un cuerpo NDJSON."""
+    try:
+        batch_size = parse_batch_size(request.args)
+        records = iter_records(request.stream, request.mimetype, formats=("ndjson",))
+        return get_service().bulk_create_series(records, batch_size)
+    except BadRequest as e:
+        return jsonify({"error": str(e)}), 400
+    except UnsupportedMediaType as e:
+        return jsonify({"error": str(e)}), 415
+    except Exception as e:
+        return jsonify({"error": f"Error en la carga masiva de series: {str(e)}"}), 500
+
+
 @bp.get("/<int:series_id>")
 def retrieve_series(series_id: int):
     """Devuelve los detalles de una serie."""
     # TODO: invocar service.get_series y construir respuesta con temporadas.
     try:
-        return service.get_series(series_id)
+        fields = SERIE_PROJECTION.parse_fields(request.args, extra=("seasons",))
+        return get_service().get_series(series_id, fields)
+    except BadRequest as e:
+        return jsonify({"error": str(e)}), 400
     except NotFound as e:
         return jsonify({"error": str(e)}), 404
     except Exception as e:
@@ -165,7 +396,7 @@ def update_series(series_id: int):
     payload = request.get_json(silent=True) or {}
     # TODO: invocar service.update_series y devolver la serie actualizada.
     try:
-        return service.update_series(series_id, payload)
+        return get_service().update_series(series_id, payload)
     except NotFound as e:
         return jsonify({"error": str(e)}), 404
     except Exception as e:
@@ -177,7 +408,7 @@ def delete_series(series_id: int):
     """Elimina una serie del catalogo."""
     # TODO: invocar service.delete_series y devolver 204.
     try:
-        return service.delete_series(series_id)
+        return get_service().delete_series(series_id)
     except NotFound as e:
         return jsonify({"error": str(e)}), 404
     except Exception as e:
@@ -190,7 +421,7 @@ def add_season(series_id: int):
     payload = request.get_json(silent=True) or {}
     # TODO: invocar service.add_season y devolver la temporada creada.
     try:
-        return service.add_season(series_id, payload)
+        return get_service().add_season(series_id, payload)
     except (BadRequest, NotFound) as e:
         return jsonify({"error": str(e)}), 400
     except Exception as e:
@@ -0,0 +1,45 @@
+"""Respuestas JSON en streaming para listados completos del catalogo."""
+
+from __future__ import annotations
+
+from typing import Callable, Iterable
+
+from flask import Response, current_app, stream_with_context
+from werkzeug.datastructures import MultiDict
+
+TRUE_VALUES = {"1", "true", "yes"}
+
+
+def wants_stream(args: MultiDict) -> bool:
+    """Indica si el cliente pidio el modo streaming con `?stream=1`."""
+    return args.get("stream", "").lower() in TRUE_VALUES
+
+
+def stream_json_array(
+    rows_factory: Callable[[], Iterable], serialize: Callable, chunk_size: int | None = None
+) -> Response:
+    """Escribe un arreglo JSON por partes a medida que se leen las filas.
+
+    La consulta se ejecuta dentro del generador (`rows_factory`), porque la
+    sesion de la vista se cierra antes de empezar a enviar el cuerpo. Solo se
+    mantiene en memoria un bloque de `chunk_size` elementos, por lo que el
+    consumo del worker no depende del tamaño del catalogo.
+    """
+    chunk_size = chunk_size or current_app.config["STREAM_CHUNK_SIZE"]
+    dumps = current_app.json.dumps
+
+    def generate():
+        yield "["
+        separator = ""
+        chunk = []
+        for row in rows_factory():
+            chunk.append(dumps(serialize(row)))
+            if len(chunk) >= chunk_size:
+                yield separator + ",".join(chunk)
+                separator = ","
+                chunk = []
+        if chunk:
+            yield separator + ",".join(chunk)
+        yield "]"
+
+    return current_app.response_class(stream_with_context(generate()), mimetype="application/json")
@@ -0,0 +1,302 @@
+"""Indice en memoria de prefijos de titulos para autocompletar.
+
+Cada worker guarda los titulos de peliculas y series ordenados por su clave
+normalizada (minusculas, sin acentos ni espacios repetidos). Las claves y los
+titulos se empaquetan en un unico `bytes` por columna con sus offsets en un
+`array`, asi un millon de titulos ocupa decenas de MB en lugar de los cientos
+que costarian tuplas y `str` sueltos. Un prefijo se resuelve con `bisect`
+sobre ese arreglo ordenado.
+
+Las escrituras de `MovieService` y `SeriesService` se aplican sobre una capa
+chica de cambios (altas ordenadas y bajas marcadas) sin tocar el arreglo
+base. Cuando esa capa crece, o el indice supera `AUTOCOMPLETE_MAX_AGE`
+segundos (lo que acota cuanto tarda un worker en ver los cambios hechos por
+otro), se reconstruye en segundo plano con una consulta en streaming mientras
+se sigue respondiendo con el indice anterior.
+"""
+
+from __future__ import annotations
+
+import bisect
+import heapq
+import logging
+import sys
+import threading
+import time
+import unicodedata
+from array import array
+from typing import Iterable, Iterator, Sequence
+
+from flask import Flask, current_app
+
+logger = logging.getLogger(__name__)
+
+KINDS = ("movie", "serie")
+
+
+def normalize(text: str) -> str:
+    """Clave de comparacion: sin acentos, en minusculas y con espacios simples."""
+    if not text.isascii():
+        decomposed = unicodedata.normalize("NFKD", text)
+        text = "".join(char for char in decomposed if not unicodedata.combining(char))
+    return " ".join(text.casefold().split())
+
+
+def make_doc(kind: str, object_id: int) -> int:
+    """Identificador unico de un titulo: `id * 2` para peliculas, `id * 2 + 1` para series."""
+    return object_id * 2 + KINDS.index(kind)
+
+
+class _PackedBytes(Sequence):
+    """Secuencia de `bytes` concatenados en un solo bloque, indexable en O(1)."""
+
+    def __init__(self, items: Iterable[bytes]):
+        offsets = array("I", [0])
+        blob = bytearray()
+        for item in items:
+            blob += item
+            offsets.append(len(blob))
+        self._blob = bytes(blob)
+        self._offsets = offsets
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, index: int) -> bytes:
+        return self._blob[self._offsets[index]:self._offsets[index + 1]]
+
+    @property
+    def nbytes(self) -> int:
+        return sys.getsizeof(self._blob) + self._offsets.itemsize * len(self._offsets)
+
+
+class TitleIndex:
+    """Arreglo ordenado inmutable mas una capa de cambios incrementales."""
+
+    def __init__(self, rows: Iterable[tuple[int, str]]):
+        keys = []
+        docs = array("q")
+
+        def read_titles() -> Iterator[bytes]:
+            for doc, title in rows:
+                keys.append(normalize(title).encode())
+                docs.append(doc)
+                yield title.encode()
+
+        # Docs y titulos quedan en el orden de lectura; solo las claves se
+        # empaquetan ordenadas, y `_order` lleva de cada posicion a su fila.
+        self._titles = _PackedBytes(read_titles())
+        self._docs = docs
+        self._order = array("I", sorted(range(len(keys)), key=keys.__getitem__))
+        self._keys = _PackedBytes(keys[i] for i in self._order)
+        del keys
+        # Altas posteriores a la construccion, ordenadas por (clave, doc).
+        self._added: list[tuple[bytes, int, str]] = []
+        self._added_by_doc: dict[int, tuple[bytes, int, str]] = {}
+        # Docs del arreglo base que ya no valen (borrados o con titulo nuevo).
+        self._removed: set[int] = set()
+
+    def add(self, doc: int, title: str) -> None:
+        """Agrega un titulo o reemplaza el anterior del mismo documento."""
+        self.remove(doc)
+        entry = (normalize(title).encode(), doc, title)
+        bisect.insort(self._added, entry)
+        self._added_by_doc[doc] = entry
+
+    def remove(self, doc: int) -> None:
+        """Quita el titulo de un documento, este en la base o en la capa de cambios."""
+        entry = self._added_by_doc.pop(doc, None)
+        if entry is not None:
+            del self._added[bisect.bisect_left(self._added, entry)]
+        self._removed.add(doc)
+
+    @property
+    def base_size(self) -> int:
+        return len(self._docs)
+
+    @property
+    def pending_changes(self) -> int:
+        return len(self._added) + len(self._removed)
+
+    def search(self, prefix: str, limit: int) -> list[dict]:
+        """Hasta `limit` titulos cuya clave empieza con `prefix`, en orden alfabetico."""
+        key = normalize(prefix).encode()
+        results = []
+        for _, doc, title in heapq.merge(self._base_matches(key), self._added_matches(key)):
+            results.append({"type": KINDS[doc % 2], "id": doc // 2, "title": title})
+            if len(results) == limit:
+                break
+        return results
+
+    def _base_matches(self, key: bytes) -> Iterator[tuple[bytes, int, str]]:
+        for i in range(bisect.bisect_left(self._keys, key), len(self._keys)):
+            candidate = self._keys[i]
+            if not candidate.startswith(key):
+                return
+            row = self._order[i]
+            if self._docs[row] not in self._removed:
+                yield candidate, self._docs[row], self._titles[row].decode()
+
+    def _added_matches(self, key: bytes) -> Iterator[tuple[bytes, int, str]]:
+        for i in range(bisect.bisect_left(self._added, (key,)), len(self._added)):
+            entry = self._added[i]
+            if not entry[0].startswith(key):
+                return
+            yield entry
+
+    @property
+    def nbytes(self) -> int:
+        """Memoria aproximada: bloques empaquetados, arreglo de docs y capa de cambios."""
+        added = sys.getsizeof(self._added) + sys.getsizeof(self._added_by_doc) + sum(
+            sys.getsizeof(entry) + sys.getsizeof(entry[0]) + sys.getsizeof(entry[2]) for entry in self._added
+        )
+        return (
+            self._keys.nbytes
+            + self._titles.nbytes
+            + self._docs.itemsize * len(self._docs)
+            + self._order.itemsize * len(self._order)
+            + added
+            + sys.getsizeof(self._removed)
+        )
+
+
+def load_titles() -> Iterator[tuple[int, str]]:
+    """Todos los titulos del catalogo en una sola consulta leida en streaming."""
+    from sqlalchemy import select, union_all
+
+    from .extensions import db
+    from .models import Movie, Serie
+
+    stmt = union_all(
+        select(Movie.id * 2, Movie.title),
+        select(Serie.id * 2 + 1, Serie.title),
+    )
+    chunk_size = current_app.config["STREAM_CHUNK_SIZE"]
+    with db.engine.connect() as conn:
+        for row in conn.execution_options(yield_per=chunk_size).execute(stmt):
+            yield row[0], row[1]
+
+
+class _State:
+    """Indice de una aplicacion y datos de su ultima construccion."""
+
+    def __init__(self, max_age: float):
+        self.max_age = max_age
+        self.index: TitleIndex | None = None
+        self.lock = threading.Lock()
+        # Solo una construccion a la vez; la tienen el primer request o el hilo de fondo.
+        self.build_lock = threading.Lock()
+        # Mientras se construye, las escrituras se registran aca para reaplicarlas.
+        self.pending: list[tuple[str, tuple]] | None = None
+        self.built_at = 0.0
+        self.build_ms = 0.0
+        self.builds = 0
+
+    def stale(self) -> bool:
+        return self.max_age > 0 and time.monotonic() - self.built_at > self.max_age
+
+
+class TitleAutocomplete:
+    """Extension de Flask: un indice por aplicacion (y por proceso worker).
+
+    El indice se construye en el primer uso, o antes con `warm()` (Gunicorn
+    lo hace en el proceso maestro para que los workers lo compartan).
+    """
+
+    def init_app(self, app: Flask) -> None:
+        app.extensions["autocomplete"] = _State(app.config["AUTOCOMPLETE_MAX_AGE"])
+
+    @property
+    def _state(self) -> _State | None:
+        return current_app.extensions.get("autocomplete")
+
+    def warm(self) -> None:
+        """Construye el indice ahora si todavia no existe."""
+        state = self._state
+        with state.build_lock:
+            if state.index is None:
+                self._rebuild(state)
+
+    def suggest(self, prefix: str, limit: int) -> list[dict]:
+        """Titulos que empiezan con `prefix`."""
+        state = self._state
+        if state.index is None:
+            self.warm()
+        elif state.stale() or state.index.pending_changes > current_app.config["AUTOCOMPLETE_MAX_PENDING"]:
+            self._rebuild_in_background(state)
+
+        with state.lock:
+            return state.index.search(prefix, limit)
+
+    def title_changed(self, kind: str, object_id: int, title: str) -> None:
+        """Registra el alta o el cambio de titulo de una pelicula o serie."""
+        self._apply("add", make_doc(kind, object_id), title)
+
+    def title_removed(self, kind: str, object_id: int) -> None:
+        """Registra el borrado de una pelicula o serie."""
+        self._apply("remove", make_doc(kind, object_id))
+
+    def stats(self) -> dict:
+        """Tamaño, memoria y antiguedad del indice para monitoreo."""
+        state = self._state
+        with state.lock:
+            if state.index is None:
+                return {"built": False}
+            return {
+                "built": True,
+                "base_titles": state.index.base_size,
+                "pending_changes": state.index.pending_changes,
+                "memory_bytes": state.index.nbytes,
+                "builds": state.builds,
+                "build_ms": round(state.build_ms, 1),
+                "age_seconds": round(time.monotonic() - state.built_at, 1),
+                "rebuilding": state.pending is not None,
+            }
+
+    def _apply(self, method: str, *args) -> None:
+        state = self._state
+        with state.lock:
+            if state.index is not None:
+                getattr(state.index, method)(*args)
+            if state.pending is not None:
+                state.pending.append((method, args))
+
+    def _rebuild(self, state: _State) -> None:
+        """Construye un indice nuevo y lo publica; quien llama tiene `build_lock`."""
+        with state.lock:
+            state.pending = []
+        start = time.perf_counter()
+        try:
+            index = TitleIndex(load_titles())
+        except Exception:
+            with state.lock:
+                state.pending = None
+            raise
+
+        with state.lock:
+            # Escrituras confirmadas durante la lectura: pueden no estar en el snapshot.
+            for method, args in state.pending:
+                getattr(index, method)(*args)
+            state.index = index
+            state.pending = None
+            state.built_at = time.monotonic()
+            state.build_ms = (time.perf_counter() - start) * 1000
+            state.builds += 1
+
+    def _rebuild_in_background(self, state: _State) -> None:
+        if not state.build_lock.acquire(blocking=False):
+            return  # ya hay una construccion en curso
+        app = current_app._get_current_object()
+
+        def run() -> None:
+            try:
+                with app.app_context():
+                    self._rebuild(state)
+            except Exception:
+                logger.exception("No se pudo reconstruir el indice de autocompletado")
+                # Evita reintentar en cada request hasta que venza otro periodo.
+                state.built_at = time.monotonic()
+            finally:
+                state.build_lock.release()
+
+        threading.Thread(target=run, name="autocomplete-rebuild", daemon=True).start()
@@ -0,0 +1,167 @@
+"""Cache en memoria (LRU con TTL) para los detalles de peliculas y series."""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Hashable
+
+from flask import Flask, current_app
+
+
+@dataclass(frozen=True)
+class CachedDetail:
+    """Payload serializado junto a sus validadores HTTP."""
+
+    payload: dict
+    etag: str
+    last_modified: datetime | None
+
+
+class _LRUStore:
+    """Almacen acotado por tamaño y TTL; seguro para workers con hilos.
+
+    Cada invalidacion avanza una generacion y queda anotada en la clave. Quien
+    llena el cache toma la generacion antes de leer de la base y `set` descarta
+    el valor si la clave se invalido despues: asi una lectura lenta no guarda
+    datos anteriores a una escritura que ya invalido. El registro de
+    invalidaciones esta acotado a `max_size` claves; al recortarlo se rechazan
+    todas las generaciones anteriores a la descartada.
+    """
+
+    def __init__(self, max_size: int, ttl: float):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._items: OrderedDict[Hashable, tuple[float, CachedDetail]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._invalidated: OrderedDict[Hashable, int] = OrderedDict()
+        self._stale_before = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.stale_fills = 0
+
+    def get(self, key: Hashable) -> CachedDetail | None:
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                self.misses += 1
+                return None
+
+            expires_at, value = item
+            if expires_at <= time.monotonic():
+                del self._items[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self._items.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def generation(self) -> int:
+        with self._lock:
+            return self._generation
+
+    def set(self, key: Hashable, value: CachedDetail, generation: int | None = None) -> None:
+        with self._lock:
+            if generation is not None and (
+                generation < self._stale_before or self._invalidated.get(key, 0) > generation
+            ):
+                self.stale_fills += 1
+                return
+            self._items[key] = (time.monotonic() + self.ttl, value)
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_size:
+                self._items.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key: Hashable) -> None:
+        with self._lock:
+            self._items.pop(key, None)
+            self._generation += 1
+            self._invalidated[key] = self._generation
+            self._invalidated.move_to_end(key)
+            while len(self._invalidated) > self.max_size:
+                _, generation = self._invalidated.popitem(last=False)
+                self._stale_before = generation
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+            self._generation += 1
+            self._invalidated.clear()
+            self._stale_before = self._generation
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "enabled": True,
+                "size": len(self._items),
+                "max_size": self.max_size,
+                "ttl_seconds": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "stale_fills": self.stale_fills,
+            }
+
+
+class DetailCache:
+    """Extension de Flask: un almacen por aplicacion (y por proceso worker).
+
+    Cada worker tiene su propia copia; las invalidaciones son locales al
+    proceso y el TTL acota cuanto puede tardar otro worker en ver un cambio.
+    """
+
+    def init_app(self, app: Flask) -> None:
+        max_size = app.config["DETAIL_CACHE_MAX_SIZE"]
+        store = _LRUStore(max_size, app.config["DETAIL_CACHE_TTL"]) if max_size > 0 else None
+        app.extensions["detail_cache"] = store
+
+    @property
+    def _store(self) -> _LRUStore | None:
+        return current_app.extensions.get("detail_cache")
+
+    def get(self, kind: str, object_id: int) -> CachedDetail | None:
+        """Devuelve el detalle cacheado o None si no existe o expiro."""
+        store = self._store
+        return store.get((kind, object_id)) if store is not None else None
+
+    def generation(self) -> int:
+        """Marca a tomar antes de leer de la base el detalle que se va a guardar."""
+        store = self._store
+        return store.generation() if store is not None else 0
+
+    def set(self, kind: str, object_id: int, value: CachedDetail, generation: int | None = None) -> None:
+        """Guarda un detalle serializado.
+
+        Con `generation` (tomada antes de leerlo) no lo guarda si el detalle
+        se invalido mientras tanto.
+        """
+        store = self._store
+        if store is not None:
+            store.set((kind, object_id), value, generation)
+
+    def invalidate(self, kind: str, object_id: int) -> None:
+        """Descarta un detalle tras una escritura."""
+        store = self._store
+        if store is not None:
+            store.delete((kind, object_id))
+
+    def clear(self) -> None:
+        """Vacia el cache completo."""
+        store = self._store
+        if store is not None:
+            store.clear()
+
+    def stats(self) -> dict:
+        """Contadores de aciertos, fallos y desalojos para monitoreo."""
+        store = self._store
+        return store.stats() if store is not None else {"enabled": False}
@@ -10,6 +10,33 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 INSTANCE_PATH = BASE_DIR / "instance"
 
 
+def engine_options(
+    uri: str,
+    pool_size: int,
+    max_overflow: int,
+    pool_recycle: int,
+    statement_timeout_ms: int,
+) -> dict:
+    """Opciones de `create_engine` segun el motor de la URL.
+
+    SQLite usa el pool por defecto de SQLAlchemy (y StaticPool en memoria), por
+    lo que no recibe opciones de tamaño; sus ajustes van como PRAGMA al conectar
+    (ver `SQLITE_PRAGMAS`).
+    """
+    if uri.startswith("sqlite"):
+        return {}
+
+    options = {
+        "pool_size": pool_size,
+        "max_overflow": max_overflow,
+        "pool_pre_ping": True,
+        "pool_recycle": pool_recycle,
+    }
+    if statement_timeout_ms and uri.startswith(("postgresql", "postgres")):
+        options["connect_args"] = {"options": f"-c statement_timeout={statement_timeout_ms}"}
+    return options
+
+
 class BaseConfig:
     """Config comun a cualquier entorno."""
 
@@ -19,13 +46,59 @@ class BaseConfig:
         f"sqlite:///{INSTANCE_PATH / 'app.db'}",
     )
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    # Pool de conexiones (motores cliente/servidor) y limite por sentencia en Postgres.
+    DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+    DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+    DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+    DB_STATEMENT_TIMEOUT_MS = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "30000"))
+    SQLALCHEMY_ENGINE_OPTIONS = engine_options(
+        SQLALCHEMY_DATABASE_URI, DB_POOL_SIZE, DB_MAX_OVERFLOW, DB_POOL_RECYCLE, DB_STATEMENT_TIMEOUT_MS
+    )
+    # PRAGMA aplicados a cada conexion SQLite: WAL permite leer mientras otro escribe.
+    SQLITE_PRAGMAS = {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "busy_timeout": int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "15000")),
+        "mmap_size": int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024))),
+    }
     JSON_SORT_KEYS = False
+    PAGE_SIZE_DEFAULT = int(os.getenv("PAGE_SIZE_DEFAULT", "50"))
+    PAGE_SIZE_MAX = int(os.getenv("PAGE_SIZE_MAX", "200"))
+    STREAM_CHUNK_SIZE = int(os.getenv("STREAM_CHUNK_SIZE", "500"))
+    BULK_IMPORT_BATCH_SIZE = int(os.getenv("BULK_IMPORT_BATCH_SIZE", "1000"))
+    BULK_IMPORT_MAX_BATCH_SIZE = int(os.getenv("BULK_IMPORT_MAX_BATCH_SIZE", "10000"))
+    BULK_IMPORT_MAX_ERRORS = int(os.getenv("BULK_IMPORT_MAX_ERRORS", "100"))
+    PROGRESS_BATCH_MAX_ITEMS = int(os.getenv("PROGRESS_BATCH_MAX_ITEMS", "500"))
+    # Progreso diferido: PATCH /progress/series/<id> responde 202 y un hilo escribe en lotes
+    # cada FLUSH_INTERVAL segundos o al juntar BATCH_SIZE series; MAX_PENDING acota la memoria.
+    PROGRESS_BUFFER_ENABLED = os.getenv("PROGRESS_BUFFER_ENABLED", "0") == "1"
+    PROGRESS_BUFFER_FLUSH_INTERVAL = float(os.getenv("PROGRESS_BUFFER_FLUSH_INTERVAL", "1.0"))
+    PROGRESS_BUFFER_BATCH_SIZE = int(os.getenv("PROGRESS_BUFFER_BATCH_SIZE", "500"))
+    PROGRESS_BUFFER_MAX_PENDING = int(os.getenv("PROGRESS_BUFFER_MAX_PENDING", "50000"))
+    # Historial: `flask history compact` resume por dia los eventos con mas de RETENTION_DAYS dias.
+    HISTORY_RETENTION_DAYS = int(os.getenv("HISTORY_RETENTION_DAYS", "90"))
+    HISTORY_COMPACT_CHUNK_SIZE = int(os.getenv("HISTORY_COMPACT_CHUNK_SIZE", "10000"))
+    # Cache de detalles por worker; DETAIL_CACHE_MAX_SIZE=0 lo desactiva.
+    DETAIL_CACHE_MAX_SIZE = int(os.getenv("DETAIL_CACHE_MAX_SIZE", "2048"))
+    DETAIL_CACHE_TTL = float(os.getenv("DETAIL_CACHE_TTL", "60"))
+    # Indice de autocompletado por worker: se reconstruye tras MAX_AGE segundos (0 = nunca)
+    # o al acumular MAX_PENDING cambios incrementales.
+    AUTOCOMPLETE_MAX_AGE = float(os.getenv("AUTOCOMPLETE_MAX_AGE", "300"))
+    AUTOCOMPLETE_MAX_PENDING = int(os.getenv("AUTOCOMPLETE_MAX_PENDING", "5000"))
+    AUTOCOMPLETE_LIMIT_DEFAULT = int(os.getenv("AUTOCOMPLETE_LIMIT_DEFAULT", "10"))
+    AUTOCOMPLETE_LIMIT_MAX = int(os.getenv("AUTOCOMPLETE_LIMIT_MAX", "50"))
+    # Instrumentacion SQL: Server-Timing, log por request y consultas lentas.
+    SQL_INSTRUMENTATION = os.getenv("SQL_INSTRUMENTATION", "1") != "0"
+    SQL_SLOW_QUERY_MS = float(os.getenv("SQL_SLOW_QUERY_MS", "200"))
+    # Avisa si una misma sentencia se repite N veces en un request (0 = apagado).
+    SQL_REPEAT_WARN_THRESHOLD = int(os.getenv("SQL_REPEAT_WARN_THRESHOLD", "0"))
 
 
 class DevelopmentConfig(BaseConfig):
     """Config pensada para desarrollo local."""
 
     DEBUG = True
+    SQL_REPEAT_WARN_THRESHOLD = int(os.getenv("SQL_REPEAT_WARN_THRESHOLD", "10"))
 
 
 class TestingConfig(BaseConfig):
@@ -33,6 +106,7 @@ class TestingConfig(BaseConfig):
 
     TESTING = True
     SQLALCHEMY_DATABASE_URI = "sqlite:///:memory:"
+    SQLALCHEMY_ENGINE_OPTIONS = {}
 
 
 class ProductionConfig(BaseConfig):
@@ -40,3 +114,12 @@ class ProductionConfig(BaseConfig):
 
     DEBUG = False
     TESTING = False
+    DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+    DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+    SQLALCHEMY_ENGINE_OPTIONS = engine_options(
+        BaseConfig.SQLALCHEMY_DATABASE_URI,
+        DB_POOL_SIZE,
+        DB_MAX_OVERFLOW,
+        BaseConfig.DB_POOL_RECYCLE,
+        BaseConfig.DB_STATEMENT_TIMEOUT_MS,
+    )
@@ -0,0 +1,28 @@
+"""Ajustes por conexion del engine de SQLAlchemy."""
+
+from __future__ import annotations
+
+from flask import Flask
+from sqlalchemy import event
+
+from .extensions import db
+
+
+def init_app(app: Flask) -> None:
+    """Aplica `SQLITE_PRAGMAS` a cada conexion nueva cuando el motor es SQLite."""
+    pragmas = app.config.get("SQLITE_PRAGMAS") or {}
+    with app.app_context():
+        engine = db.engine
+    if engine.dialect.name != "sqlite" or not pragmas:
+        return
+
+    statements = [f"PRAGMA {name}={value}" for name, value in pragmas.items()]
+
+    @event.listens_for(engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+        cursor = dbapi_connection.cursor()
+        try:
+            for statement in statements:
+                cursor.execute(statement)
+        finally:
+            cursor.close()
@@ -1,7 +1,12 @@
 """Punto central para inicializar extensiones de Flask."""
 
-from flask_migrate import Migrate
 from flask_sqlalchemy import SQLAlchemy
 
+from .autocomplete import TitleAutocomplete
+from .cache import DetailCache
+from .progress_buffer import ProgressBuffer
+
 db = SQLAlchemy()
-migrate = Migrate()
+detail_cache = DetailCache()
+autocomplete = TitleAutocomplete()
+progress_buffer = ProgressBuffer()
@@ -0,0 +1,167 @@
+"""Historial de la watchlist: eventos de solo alta y su compactacion diaria.
+
+Cada cambio de `ProgressService` (alta de una pelicula o serie, avance de
+progreso, serie completada, tambien por lotes y desde el buffer de progreso)
+agrega una fila a `watch_events` con un INSERT de Core en la misma
+transaccion: no hay lecturas ni ORM en ese camino. Con el buffer de progreso
+los ticks ya llegan combinados, asi que se registra un evento por vaciado.
+
+`flask history compact` resume en `watch_history_daily` los eventos con mas
+de `HISTORY_RETENTION_DAYS` dias (una fila por usuario, dia y contenido) y
+los borra, por tramos de id y con un commit por tramo, de modo que la tabla
+de eventos queda acotada a la ventana de retencion.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, time, timedelta, timezone
+
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+from sqlalchemy import Connection, Date, and_, case, delete, func, insert, select, update
+from sqlalchemy.orm import Session
+
+from .extensions import db
+from .models import WatchEvent, WatchHistoryDay
+
+DAY_COUNTERS = ("events", "episodes_watched", "completed")
+
+
+def event_row(entry, kind: str, previous_watched: int | None = 0) -> dict:
+    """Fila de `watch_events` con el estado de `entry` despues del cambio."""
+    return {
+        "user_id": entry.user_id,
+        "content_type": entry.content_type,
+        "content_id": entry.content_id,
+        "kind": kind,
+        "status": entry.status,
+        "watched_episodes": entry.watched_episodes,
+        "episodes_delta": (entry.watched_episodes or 0) - (previous_watched or 0),
+        "current_season": entry.current_season,
+        "current_episode": entry.current_episode,
+        "occurred_at": datetime.now(timezone.utc),
+    }
+
+
+def record_events(session: Session, rows: list[dict]) -> None:
+    """Agrega los eventos con un INSERT (executemany) en la transaccion de la sesion."""
+    if rows:
+        session.execute(insert(WatchEvent.__table__), rows)
+
+
+def event_day(column):
+    """Dia UTC de una columna datetime; `date()` existe en SQLite y en Postgres."""
+    return func.date(column, type_=Date)
+
+
+def compact_history(conn: Connection, before: datetime, chunk_size: int) -> tuple[int, int]:
+    """Resume y borra los eventos anteriores a `before`; devuelve (eventos, filas diarias escritas).
+
+    Recorre la tabla por tramos de `chunk_size` ids desde el mas bajo: los ids
+    crecen con `occurred_at`, asi que al llegar a un tramo con eventos y
+    ninguno viejo ya no quedan mas para compactar.
+    """
+    events = WatchEvent.__table__
+    low, high = conn.execute(select(func.min(events.c.id), func.max(events.c.id))).one()
+    compacted = days = 0
+
+    while low is not None and low <= high:
+        in_chunk = and_(events.c.id >= low, events.c.id < low + chunk_size)
+        old = and_(in_chunk, events.c.occurred_at < before)
+        day = event_day(events.c.occurred_at)
+        rows = conn.execute(
+            select(
+                events.c.user_id,
+                day.label("day"),
+                events.c.content_type,
+                events.c.content_id,
+                func.count().label("events"),
+                func.sum(events.c.episodes_delta).label("episodes_watched"),
+                func.sum(case((events.c.kind == "completed", 1), else_=0)).label("completed"),
+                func.min(events.c.occurred_at).label("first_at"),
+                func.max(events.c.occurred_at).label("last_at"),
+            )
+            .where(old)
+            .group_by(events.c.user_id, day, events.c.content_type, events.c.content_id)
+        ).mappings().all()
+
+        if not rows:
+            if conn.execute(select(events.c.id).where(in_chunk).limit(1)).first() is not None:
+                break
+            low += chunk_size
+            continue
+
+        _upsert_days(conn, [dict(row) for row in rows])
+        compacted += conn.execute(delete(events).where(old)).rowcount
+        days += len(rows)
+        conn.commit()
+        low += chunk_size
+
+    return compacted, days
+
+
+def _upsert_days(conn: Connection, rows: list[dict]) -> None:
+    """Suma los contadores a los dias ya compactados o crea las filas."""
+    table = WatchHistoryDay.__table__
+    keys = ("user_id", "day", "content_type", "content_id")
+
+    dialect = conn.dialect.name
+    if dialect in ("sqlite", "postgresql"):
+        if dialect == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert as upsert
+        else:
+            from sqlalchemy.dialects.postgresql import insert as upsert
+        # Una sentencia de una fila ejecutada con executemany: un VALUES de miles
+        # de filas tarda mas en compilarse en SQLAlchemy que en ejecutarse.
+        stmt = upsert(table)
+        excluded = stmt.excluded
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c[key] for key in keys],
+            set_={
+                **{name: table.c[name] + excluded[name] for name in DAY_COUNTERS},
+                "first_at": case((excluded.first_at < table.c.first_at, excluded.first_at), else_=table.c.first_at),
+                "last_at": case((excluded.last_at > table.c.last_at, excluded.last_at), else_=table.c.last_at),
+            },
+        )
+        conn.execute(stmt, rows)
+        return
+
+    # Motores sin ON CONFLICT: UPDATE y, si no existia la fila, INSERT.
+    for row in rows:
+        result = conn.execute(
+            update(table)
+            .where(*(table.c[key] == row[key] for key in keys))
+            .values(
+                {name: table.c[name] + row[name] for name in DAY_COUNTERS},
+                first_at=case((table.c.first_at > row["first_at"], row["first_at"]), else_=table.c.first_at),
+                last_at=case((table.c.last_at < row["last_at"], row["last_at"]), else_=table.c.last_at),
+            )
+        )
+        if result.rowcount == 0:
+            conn.execute(insert(table).values(row))
+
+
+def retention_cutoff(days: int) -> datetime:
+    """Medianoche UTC de hace `days` dias: los dias se compactan completos."""
+    today = datetime.now(timezone.utc).date()
+    return datetime.combine(today - timedelta(days=days), time.min, tzinfo=timezone.utc)
+
+
+@click.group("history")
+def history_cli():
+    """Administra el historial de eventos de la watchlist."""
+
+
+@history_cli.command("compact")
+@click.option("--days", type=int, default=None, help="Dias de eventos a conservar (HISTORY_RETENTION_DAYS).")
+@with_appcontext
+def compact_command(days):
+    """Resume por dia los eventos viejos en watch_history_daily y los borra."""
+    days = current_app.config["HISTORY_RETENTION_DAYS"] if days is None else days
+    if days < 0:
+        raise click.BadParameter("debe ser mayor o igual a 0", param_hint="--days")
+    before = retention_cutoff(days)
+    with db.engine.connect() as conn:
+        events, rows = compact_history(conn, before, current_app.config["HISTORY_COMPACT_CHUNK_SIZE"])
+    click.echo(f"watch_events: {events:,} eventos anteriores a {before:%Y-%m-%d} compactados ({rows:,} filas diarias escritas)")
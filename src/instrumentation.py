@@ -0,0 +1,133 @@
+"""Instrumentacion SQL por request: conteo, tiempo, Server-Timing y consultas lentas."""
+
+from __future__ import annotations
+
+import json
+import logging
+import time
+from collections import Counter
+
+from flask import Flask, Response, current_app, g, has_app_context, has_request_context, request
+from sqlalchemy import event
+
+from .extensions import db
+
+logger = logging.getLogger(__name__)
+
+MAX_LOGGED_PARAMS = 500
+
+
+class RequestSQLStats:
+    """Acumula las consultas ejecutadas durante un request."""
+
+    def __init__(self, track_statements: bool):
+        self.started_at = time.perf_counter()
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.statements: Counter[str] | None = Counter() if track_statements else None
+
+    def record(self, statement: str, elapsed: float) -> None:
+        self.queries += 1
+        self.db_seconds += elapsed
+        if self.statements is not None:
+            self.statements[statement] += 1
+
+
+def init_app(app: Flask) -> None:
+    """Registra los eventos del engine y los hooks de request."""
+    if not app.config["SQL_INSTRUMENTATION"]:
+        return
+
+    with app.app_context():
+        engine = db.engine
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+    app.before_request(_start_request)
+    app.after_request(_finish_request)
+
+
+def _start_request() -> None:
+    g.sql_stats = RequestSQLStats(track_statements=current_app.config["SQL_REPEAT_WARN_THRESHOLD"] > 0)
+
+
+def _finish_request(response: Response) -> Response:
+    stats: RequestSQLStats | None = g.get("sql_stats")
+    if stats is None:
+        return response
+
+    summary = {
+        "method": request.method,
+        "path": request.path,
+        "endpoint": request.endpoint,
+        "status": response.status_code,
+    }
+    threshold = current_app.config["SQL_REPEAT_WARN_THRESHOLD"]
+
+    if response.is_streamed:
+        # Con `?stream=1` las consultas corren al generar el cuerpo, despues de
+        # este hook: `g.sql_stats` sigue activo (stream_with_context) y el
+        # registro se hace al cerrar la respuesta. No hay Server-Timing porque
+        # los encabezados se envian antes de conocer el total.
+        response.call_on_close(lambda: _log_request(stats, {**summary, "streamed": True}, threshold))
+        return response
+
+    g.pop("sql_stats")
+    total_ms, db_ms = _log_request(stats, summary, threshold)
+    response.headers.add(
+        "Server-Timing",
+        f'db;dur={db_ms:.2f};desc="{stats.queries} queries", app;dur={total_ms:.2f}',
+    )
+    return response
+
+
+def _log_request(stats: RequestSQLStats, summary: dict, threshold: int) -> tuple[float, float]:
+    """Registra la linea `request_sql` y las sentencias repetidas; devuelve (total_ms, db_ms)."""
+    total_ms = (time.perf_counter() - stats.started_at) * 1000
+    db_ms = stats.db_seconds * 1000
+    logger.info(json.dumps({
+        "event": "request_sql",
+        **summary,
+        "queries": stats.queries,
+        "db_ms": round(db_ms, 2),
+        "total_ms": round(total_ms, 2),
+    }))
+
+    if stats.statements is not None:
+        for statement, count in stats.statements.items():
+            if count >= threshold:
+                # Posible N+1: la misma sentencia se repitio muchas veces en un request.
+                logger.warning(json.dumps({
+                    "event": "repeated_query",
+                    "endpoint": summary["endpoint"],
+                    "count": count,
+                    "statement": statement,
+                }))
+    return total_ms, db_ms
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    conn.info.setdefault("query_started_at", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    started = conn.info.get("query_started_at")
+    if not started:
+        return
+    elapsed = time.perf_counter() - started.pop()
+
+    if has_request_context():
+        stats: RequestSQLStats | None = g.get("sql_stats")
+        if stats is not None:
+            stats.record(statement, elapsed)
+
+    if has_app_context() and elapsed * 1000 >= current_app.config["SQL_SLOW_QUERY_MS"]:
+        logger.warning(json.dumps({
+            "event": "slow_query",
+            "endpoint": request.endpoint if has_request_context() else None,
+            "duration_ms": round(elapsed * 1000, 2),
+            "statement": statement,
+            "parameters": repr(parameters)[:MAX_LOGGED_PARAMS],
+            "executemany": executemany,
+        }))
@@ -5,6 +5,9 @@ from .movie import Movie  # noqa: F401
 from .season import Season  # noqa: F401
 from .serie import Serie  # noqa: F401
 from .user import User  # noqa: F401
+from .user_summary import UserSummary  # noqa: F401
 from .watch_entry import WatchEntry  # noqa: F401
+from .watch_event import WatchEvent  # noqa: F401
+from .watch_history_day import WatchHistoryDay  # noqa: F401
 
-__all__ = ["Movie", "Season", "Serie", "User", "WatchEntry"]
+__all__ = ["Movie", "Season", "Serie", "User", "UserSummary", "WatchEntry", "WatchEvent", "WatchHistoryDay"]
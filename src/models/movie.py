@@ -2,7 +2,10 @@
 from datetime import datetime, timezone
 
 from src.extensions import db
+from sqlalchemy import Index, String
+from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.sql.functions import FunctionElement
 
 from typing import TYPE_CHECKING
 if TYPE_CHECKING:
@@ -14,12 +17,21 @@ if TYPE_CHECKING:
 class Movie(db.Model):
     """Representa una pelicula dentro del catalogo."""
     __tablename__ = "movies"
+
+    # Filtros y orden de /movies/: cada indice termina en id para el cursor (keyset).
+    __table_args__ = (
+        Index("ix_movies_genre_release_year", "genre", "release_year", "id"),
+        Index("ix_movies_release_year", "release_year", "id"),
+        # max(updated_at) del ETag de /movies/?stream=1 sin recorrer la tabla.
+        Index("ix_movies_updated_at", "updated_at"),
+    )
+
     id: Mapped[int] = mapped_column(primary_key=True)  # id de la pelicula
     title: Mapped[str] = mapped_column(db.String(120), nullable=False)  # titulo de la pelicula
     genre: Mapped[str] = mapped_column(db.String(50), nullable=False)  # genero de la pelicula
     release_year: Mapped[int] = mapped_column(nullable=False)  # ano de lanzamiento
-    created_at: Mapped[datetime] = mapped_column(default=datetime.now(timezone.utc))  # fecha de creacion
-    updated_at: Mapped[datetime] = mapped_column(default=datetime.now(timezone.utc), onupdate=datetime.now(timezone.utc))  # fecha de actualizacion
+    created_at: Mapped[datetime] = mapped_column(default=lambda: datetime.now(timezone.utc))  # fecha de creacion
+    updated_at: Mapped[datetime] = mapped_column(default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc))  # fecha de actualizacion
 
     # cascade="all, delete-orphan" asegura que las entradas de watch_entry asociadas se eliminen si la pelicula se elimina
     # back_populates define la relacion inversa en WatchEntry
@@ -28,6 +40,8 @@ class Movie(db.Model):
         "WatchEntry",
         cascade="all, delete-orphan",
         back_populates="movie",
+        primaryjoin="and_(WatchEntry.content_type == 'movie', foreign(WatchEntry.content_id) == Movie.id)",
+        overlaps="watch_entries",
         lazy='select'
     ) # Relacion con WatchEntry (definida en WatchEntry)
 
@@ -45,3 +59,32 @@ class Movie(db.Model):
             "created_at": getattr(self, "created_at", datetime.now(timezone.utc)),
             "updated_at": getattr(self, "updated_at", datetime.now(timezone.utc)),
         }
+
+
+class title_key(FunctionElement):
+    """`lower(title)` comparado por codigo de caracter en todos los motores.
+
+    SQLite ya compara asi (BINARY); en Postgres se agrega `COLLATE "C"` para
+    que el orden no dependa de la collation de la base, que el rango
+    `[prefijo, prefijo || U+10FFFF)` sea exacto y que el indice lo resuelva.
+    Debe usarse igual en el indice y en las consultas.
+    """
+
+    type = String()
+    name = "title_key"
+    inherit_cache = True
+
+
+@compiles(title_key)
+def _compile_title_key(element, compiler, **kw):
+    return f"lower({compiler.process(element.clauses, **kw)})"
+
+
+@compiles(title_key, "postgresql")
+def _compile_title_key_postgresql(element, compiler, **kw):
+    return f'lower({compiler.process(element.clauses, **kw)}) COLLATE "C"'
+
+
+# Prefijo y orden por titulo sin distinguir mayusculas; es un indice de
+# expresion, por eso se declara fuera de __table_args__.
+Index("ix_movies_title_lower", title_key(Movie.title), Movie.id)
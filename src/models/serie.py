@@ -16,13 +16,19 @@ class Serie(db.Model):
     """Representa una serie cargada por los usuarios."""
 
     __tablename__ = "serie"
+    # max(updated_at) del ETag de /series/?stream=1 sin recorrer la tabla.
+    __table_args__ = (db.Index("ix_serie_updated_at", "updated_at"),)
 
     id: Mapped[int] = mapped_column(primary_key=True)
     title: Mapped[str] = mapped_column(db.String(255), nullable=False)
-    created_at: Mapped[dt] = mapped_column(default=dt.now(t.utc), nullable=False)
+    # Totales desnormalizados: los mantiene SeriesService al crear la serie y
+    # al agregar temporadas, para no recorrer Season en cada lectura.
+    total_seasons: Mapped[int] = mapped_column(nullable=False, default=0, server_default="0")
+    total_episodes: Mapped[int] = mapped_column(nullable=False, default=0, server_default="0")
+    created_at: Mapped[dt] = mapped_column(default=lambda: dt.now(t.utc), nullable=False)
     updated_at: Mapped[dt] = mapped_column(
-        default=dt.now(t.utc),
-        onupdate=dt.now(t.utc),
+        default=lambda: dt.now(t.utc),
+        onupdate=lambda: dt.now(t.utc),
         nullable=False,
     )
 
@@ -38,6 +44,8 @@ class Serie(db.Model):
         "WatchEntry",
         cascade="all, delete-orphan",
         back_populates="serie",
+        primaryjoin="and_(WatchEntry.content_type == 'serie', foreign(WatchEntry.content_id) == Serie.id)",
+        overlaps="watch_entries",
         lazy='select'
     )  # Relacion con WatchEntry (definida en WatchEntry)
 
@@ -52,8 +60,7 @@ class Serie(db.Model):
         data = {
             "id": getattr(self, "id", None),
             "title": getattr(self, "title", None),
-            # total_seasons se calcula automáticamente con len(self.seasons)
-            "total_seasons": len(getattr(self, "seasons", [])),
+            "total_seasons": getattr(self, "total_seasons", None) or 0,
             "created_at": getattr(self, "created_at", dt.now(t.utc)),
         }
 
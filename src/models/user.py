@@ -19,7 +19,7 @@ class User(db.Model):
     id: Mapped[int] = mapped_column(primary_key=True)  # id del usuario
     name: Mapped[str] = mapped_column(db.String(100), nullable=False)  # nombre del usuario
     email: Mapped[str] = mapped_column(db.String(120), nullable=True)  # email del usuario
-    created_at: Mapped[datetime] = mapped_column(default=datetime.now(ts.utc))  # fecha de creacion
+    created_at: Mapped[datetime] = mapped_column(default=lambda: datetime.now(ts.utc))  # fecha de creacion
 
     # Relacion con WatchEntry (definida en WatchEntry)
     watch_entries: Mapped[list["WatchEntry"]] = db.relationship(
@@ -0,0 +1,47 @@
+"""Resumen por usuario mantenido de forma incremental."""
+from datetime import datetime, timezone as tz
+
+from src.extensions import db
+from sqlalchemy.orm import Mapped, mapped_column
+
+
+class UserSummary(db.Model):
+    """Conteos de la watchlist de un usuario, listos para leerse por clave primaria.
+
+    No se escribe desde los servicios: `src.summary` aplica los cambios de
+    cada flush de `WatchEntry` en la misma transaccion.
+    """
+
+    __tablename__ = "user_summary"
+
+    user_id: Mapped[int] = mapped_column(
+        db.ForeignKey("users.id", ondelete="CASCADE"), primary_key=True
+    )  # id del usuario
+    entries: Mapped[int] = mapped_column(nullable=False, default=0, server_default="0")  # entradas en la watchlist
+    watching: Mapped[int] = mapped_column(nullable=False, default=0, server_default="0")  # entradas en 'watching'
+    completed: Mapped[int] = mapped_column(nullable=False, default=0, server_default="0")  # entradas en 'completed'
+    episodes_watched: Mapped[int] = mapped_column(nullable=False, default=0, server_default="0")  # episodios vistos
+    updated_at: Mapped[datetime] = mapped_column(default=lambda: datetime.now(tz.utc))  # ultima actualizacion
+
+    @staticmethod
+    def empty(user_id: int) -> dict:
+        """Resumen de un usuario sin entradas."""
+        return {
+            "user_id": user_id,
+            "entries": 0,
+            "watching": 0,
+            "completed": 0,
+            "episodes_watched": 0,
+            "updated_at": None,
+        }
+
+    def to_dict(self) -> dict:
+        """Serializa el resumen para respuestas JSON."""
+        return {
+            "user_id": self.user_id,
+            "entries": self.entries,
+            "watching": self.watching,
+            "completed": self.completed,
+            "episodes_watched": self.episodes_watched,
+            "updated_at": self.updated_at,
+        }
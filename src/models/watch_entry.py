@@ -2,12 +2,21 @@
 from datetime import datetime, timezone as tz
 
 from src.extensions import db
-from sqlalchemy.orm import Mapped, mapped_column, foreign
-from .user import User  # Importar User para la relacion
-from typing import Optional
-from .movie import Movie  # Importar Movie para la relacion
-from .serie import Serie  # Importar Serie para la relacion
-from sqlalchemy import and_
+from sqlalchemy.orm import Mapped, mapped_column
+from typing import TYPE_CHECKING, Optional
+from sqlalchemy import Index
+
+if TYPE_CHECKING:
+    # Las relaciones se resuelven por nombre en el registro: no hace falta
+    # importar los demas modelos al cargar este modulo.
+    from .movie import Movie
+    from .serie import Serie
+    from .user import User
+
+
+def compute_percentage(watched_episodes: Optional[int], total_episodes: Optional[int]) -> float:
+    """Porcentaje visto; compartido con los serializadores que no hidratan el ORM."""
+    return (watched_episodes / total_episodes * 100) if total_episodes else 0.0
 
 
 class WatchEntry(db.Model):
@@ -15,6 +24,13 @@ class WatchEntry(db.Model):
 
     __tablename__ = "watch_entries"
 
+    # Indice unico para las busquedas por contenido (add_movie, add_series,
+    # update_series_progress) y compuesto para el listado ordenado de /me/watchlist.
+    __table_args__ = (
+        Index("uq_watch_entries_user_content", "user_id", "content_type", "content_id", unique=True),
+        Index("ix_watch_entries_user_updated", "user_id", "updated_at", "id"),
+    )
+
     # TODO: definir columnas basicas (id, user_id, content_type, content_id, status).
     id: Mapped[int] = mapped_column(primary_key=True)  # id de la entrada
     content_type: Mapped[str] = mapped_column(db.String(20), nullable=False)  # tipo de contenido: 'movie' o 'serie'
@@ -22,28 +38,26 @@ class WatchEntry(db.Model):
     status: Mapped[str] = mapped_column(
         db.String(20),
         nullable=False,
-        default="watching"
+        default="watching",
+        active_history=True,  # src.summary necesita el valor anterior al cambiarlo
     )  # estado: 'watching', 'completed', 'on-hold', 'dropped', 'plan-to-watch'
 
     # TODO: agregar columnas de progreso (current_season, current_episode, watched_episodes, total_episodes).
     current_season: Mapped[Optional[int]] = mapped_column(nullable=True)  # temporada actual (para series)
     current_episode: Mapped[Optional[int]] = mapped_column(nullable=True)  # episodio actual (para series)
-    watched_episodes: Mapped[Optional[int]] = mapped_column(nullable=True, default=0)  # episodios vistos (para series)
+    watched_episodes: Mapped[Optional[int]] = mapped_column(nullable=True, default=0, active_history=True)  # episodios vistos (para series)
     total_episodes: Mapped[Optional[int]] = mapped_column(nullable=True)  # episodios totales (para series)
-    updated_at: Mapped[datetime] = mapped_column(default=datetime.now(tz.utc), onupdate=datetime.now(tz.utc))  # fecha de ultima actualizacion
+    updated_at: Mapped[datetime] = mapped_column(default=lambda: datetime.now(tz.utc), onupdate=lambda: datetime.now(tz.utc))  # fecha de ultima actualizacion
     user_id: Mapped[int] = mapped_column(db.ForeignKey("users.id"), nullable=False)  # id del usuario asociado
 
     # Relaciones
-    user: Mapped[User] = db.relationship("User", back_populates="watch_entries")
+    user: Mapped["User"] = db.relationship("User", back_populates="watch_entries")
 
     # Relaciones con Movie y Serie
     movie: Mapped[Optional['Movie']] = db.relationship(
         "Movie",
         back_populates="watch_entries",
-        primaryjoin=lambda: and_(
-            WatchEntry.content_type == 'movie',
-            foreign(WatchEntry.content_id) == Movie.id,
-        ),
+        primaryjoin="and_(WatchEntry.content_type == 'movie', foreign(WatchEntry.content_id) == Movie.id)",
         uselist=False,
         viewonly=True,
     )
@@ -51,17 +65,14 @@ class WatchEntry(db.Model):
     serie: Mapped[Optional['Serie']] = db.relationship(
         "Serie",
         back_populates="watch_entries",
-        primaryjoin=lambda: and_(
-            WatchEntry.content_type == 'serie',
-            foreign(WatchEntry.content_id) == Serie.id,
-        ),
+        primaryjoin="and_(WatchEntry.content_type == 'serie', foreign(WatchEntry.content_id) == Serie.id)",
         uselist=False,
         viewonly=True,
     )
 
     def percentage_watched(self) -> float:
         """Calcula el porcentaje completado para el contenido asociado."""
-        return (self.watched_episodes / self.total_episodes * 100) if self.total_episodes else 0.0
+        return compute_percentage(self.watched_episodes, self.total_episodes)
 
     def mark_as_watched(self) -> None:
         """Marca el contenido como completado."""
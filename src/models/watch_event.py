@@ -0,0 +1,37 @@
+"""Historial de cambios de progreso, solo de altas."""
+from datetime import datetime, timezone as tz
+from typing import Optional
+
+from src.extensions import db
+from sqlalchemy import Index
+from sqlalchemy.orm import Mapped, mapped_column
+
+
+class WatchEvent(db.Model):
+    """Un cambio en la watchlist de un usuario: alta, avance o serie completada.
+
+    Las filas no se actualizan: `src.history` las inserta con Core en la
+    misma transaccion que el cambio de `WatchEntry` y `flask history compact`
+    las resume por dia en `WatchHistoryDay` cuando envejecen.
+    """
+
+    __tablename__ = "watch_events"
+
+    # /me/history lee por usuario y fecha, de la mas reciente a la mas antigua.
+    __table_args__ = (
+        Index("ix_watch_events_user_occurred", "user_id", "occurred_at", "id"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True)  # id del evento
+    user_id: Mapped[int] = mapped_column(
+        db.ForeignKey("users.id", ondelete="CASCADE"), nullable=False
+    )  # id del usuario
+    content_type: Mapped[str] = mapped_column(db.String(20), nullable=False)  # 'movie' o 'serie'
+    content_id: Mapped[int] = mapped_column(nullable=False)  # id del contenido
+    kind: Mapped[str] = mapped_column(db.String(20), nullable=False)  # 'added', 'progress' o 'completed'
+    status: Mapped[str] = mapped_column(db.String(20), nullable=False)  # estado de la entrada tras el cambio
+    watched_episodes: Mapped[Optional[int]] = mapped_column(nullable=True)  # episodios vistos tras el cambio
+    episodes_delta: Mapped[int] = mapped_column(nullable=False, default=0, server_default="0")  # episodios sumados (o restados)
+    current_season: Mapped[Optional[int]] = mapped_column(nullable=True)  # temporada actual tras el cambio
+    current_episode: Mapped[Optional[int]] = mapped_column(nullable=True)  # episodio actual tras el cambio
+    occurred_at: Mapped[datetime] = mapped_column(nullable=False, default=lambda: datetime.now(tz.utc))  # momento del cambio
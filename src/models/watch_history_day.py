@@ -0,0 +1,27 @@
+"""Resumen diario del historial, generado al compactar eventos viejos."""
+from datetime import date, datetime
+
+from src.extensions import db
+from sqlalchemy.orm import Mapped, mapped_column
+
+
+class WatchHistoryDay(db.Model):
+    """Eventos de un usuario sobre un contenido en un dia (UTC), ya compactados.
+
+    Solo la escribe `src.history.compact_history`; la clave primaria empieza
+    por usuario y dia, y sirve para las consultas por rango de fechas.
+    """
+
+    __tablename__ = "watch_history_daily"
+
+    user_id: Mapped[int] = mapped_column(
+        db.ForeignKey("users.id", ondelete="CASCADE"), primary_key=True
+    )  # id del usuario
+    day: Mapped[date] = mapped_column(primary_key=True)  # dia de los eventos (UTC)
+    content_type: Mapped[str] = mapped_column(db.String(20), primary_key=True)  # 'movie' o 'serie'
+    content_id: Mapped[int] = mapped_column(primary_key=True)  # id del contenido
+    events: Mapped[int] = mapped_column(nullable=False)  # eventos resumidos
+    episodes_watched: Mapped[int] = mapped_column(nullable=False)  # suma de episodes_delta
+    completed: Mapped[int] = mapped_column(nullable=False)  # eventos 'completed'
+    first_at: Mapped[datetime] = mapped_column(nullable=False)  # primer evento del dia
+    last_at: Mapped[datetime] = mapped_column(nullable=False)  # ultimo evento del dia
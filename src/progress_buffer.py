@@ -0,0 +1,260 @@
+"""Escritura diferida (write-behind) del progreso de series.
+
+Con `PROGRESS_BUFFER_ENABLED` el endpoint `PATCH /progress/series/<id>` no
+escribe en la base: valida el tick contra la entrada como el camino sincronico
+(con una lectura del total de episodios; sin entrada o fuera de rango es 400), guarda los cambios en un
+diccionario por (usuario, serie) y responde 202. Como solo se encolan ticks
+validos, uno nuevo de la misma serie reemplaza los campos del anterior sin
+riesgo de perder progreso valido: se escribe solo el ultimo estado. Un hilo de fondo
+vacia el buffer cada `PROGRESS_BUFFER_FLUSH_INTERVAL` segundos, o antes si
+junta `PROGRESS_BUFFER_BATCH_SIZE` claves, con `ProgressService.apply_buffered_progress`:
+un commit por lote, para muchos usuarios a la vez.
+
+Cada worker tiene su propio buffer. Al terminar el proceso (`atexit`, y el
+hook `worker_exit` de Gunicorn) se vacia lo pendiente. Un SIGKILL o una caida
+pierde hasta un intervalo de ticks; por eso es opcional. Al escribir se valida
+de nuevo: si la entrada se borro o su total bajo mientras el tick esperaba, se
+descarta y se cuenta en `stats()`.
+"""
+
+from __future__ import annotations
+
+import atexit
+import contextlib
+import logging
+import threading
+import time
+
+from flask import Flask, current_app
+
+logger = logging.getLogger(__name__)
+
+
+class _Buffer:
+    """Cambios pendientes de una aplicacion y contadores para monitoreo."""
+
+    def __init__(self, app: Flask):
+        self.app = app
+        self.interval = app.config["PROGRESS_BUFFER_FLUSH_INTERVAL"]
+        self.batch_size = app.config["PROGRESS_BUFFER_BATCH_SIZE"]
+        self.max_pending = app.config["PROGRESS_BUFFER_MAX_PENDING"]
+        # (user_id, series_id) -> (cambios acumulados, instante del primer tick sin
+        # escribir, numero del ultimo tick); `sequence` numera los ticks aceptados.
+        self.pending: dict[tuple[int, int], tuple[dict, float, int]] = {}
+        self.sequence = 0
+        self.lock = threading.Lock()
+        # Un solo vaciado a la vez (el hilo de fondo o el cierre del proceso), y
+        # ninguno mientras una escritura sincronica reemplaza ticks (`superseding`).
+        self.flush_lock = threading.Lock()
+        self.wakeup = threading.Event()
+        self.thread: threading.Thread | None = None
+        self.accepted = 0
+        self.coalesced = 0
+        self.rejected = 0
+        self.written = 0
+        self.dropped = {"not_found": 0, "invalid": 0, "error": 0}
+        self.flushes = 0
+        self.flush_errors = 0
+        self.last_flush_ms = 0.0
+        self.last_flush_lag_ms = 0.0
+        self.max_flush_lag_ms = 0.0
+
+    def add(self, user_id: int, series_id: int, changes: dict) -> bool:
+        key = (user_id, series_id)
+        with self.lock:
+            current = self.pending.get(key)
+            if current is None:
+                if len(self.pending) >= self.max_pending:
+                    self.rejected += 1
+                    return False
+                self.sequence += 1
+                self.pending[key] = (dict(changes), time.monotonic(), self.sequence)
+            else:
+                self.sequence += 1
+                self.pending[key] = ({**current[0], **changes}, current[1], self.sequence)
+                self.coalesced += 1
+            self.accepted += 1
+            size = len(self.pending)
+        self._ensure_thread()
+        if size >= self.batch_size:
+            self.wakeup.set()
+        return True
+
+    def discard(self, user_id: int, series_ids, up_to: int) -> None:
+        """Olvida los ticks de esas series cuyo ultimo numero no supera `up_to`."""
+        with self.lock:
+            for series_id in series_ids:
+                current = self.pending.get((user_id, series_id))
+                if current is not None and current[2] <= up_to:
+                    del self.pending[user_id, series_id]
+
+    def take(self) -> dict[tuple[int, int], tuple[dict, float, int]]:
+        with self.lock:
+            taken, self.pending = self.pending, {}
+        return taken
+
+    def restore(self, taken: dict[tuple[int, int], tuple[dict, float, int]]) -> None:
+        """Devuelve al buffer un lote que no se pudo escribir, sin pisar ticks mas nuevos."""
+        with self.lock:
+            for key, (changes, since, sequence) in taken.items():
+                newer = self.pending.get(key)
+                if newer is not None:
+                    self.pending[key] = ({**changes, **newer[0]}, since, newer[2])
+                elif len(self.pending) < self.max_pending:
+                    self.pending[key] = (changes, since, sequence)
+                else:
+                    self.dropped["error"] += 1
+
+    def _ensure_thread(self) -> None:
+        # Los hilos no sobreviven al fork de Gunicorn: cada worker arranca el suyo.
+        if self.thread is not None and self.thread.is_alive():
+            return
+        with self.lock:
+            if self.thread is None or not self.thread.is_alive():
+                self.thread = threading.Thread(target=self._run, name="progress-buffer", daemon=True)
+                self.thread.start()
+
+    def _run(self) -> None:
+        while True:
+            self.wakeup.wait(self.interval)
+            self.wakeup.clear()
+            try:
+                with self.app.app_context():
+                    flush(self)
+            except Exception:
+                logger.exception("No se pudo escribir el progreso diferido")
+
+
+def flush(buffer: _Buffer) -> int:
+    """Escribe todo lo pendiente en lotes de `batch_size`; devuelve las filas aplicadas.
+
+    Si un lote falla se devuelve al buffer (junto con los que faltaban) para
+    reintentarlo en el proximo vaciado.
+    """
+    from .api.progress import ProgressService
+    from .extensions import db
+
+    with buffer.flush_lock:
+        taken = buffer.take()
+        if not taken:
+            return 0
+
+        start = time.perf_counter()
+        items = list(taken.items())
+        written = 0
+        try:
+            for offset in range(0, len(items), buffer.batch_size):
+                batch = dict(items[offset:offset + buffer.batch_size])
+                try:
+                    counts = ProgressService().apply_buffered_progress(
+                        {key: changes for key, (changes, _, _) in batch.items()}
+                    )
+                except Exception:
+                    db.session.rollback()
+                    buffer.restore(dict(items[offset:]))
+                    with buffer.lock:
+                        buffer.flush_errors += 1
+                    raise
+
+                now = time.monotonic()
+                lag_ms = max((now - since) * 1000 for _, since, _ in batch.values())
+                with buffer.lock:
+                    buffer.written += counts["applied"]
+                    buffer.dropped["not_found"] += counts["not_found"]
+                    buffer.dropped["invalid"] += counts["invalid"]
+                    buffer.last_flush_lag_ms = lag_ms
+                    buffer.max_flush_lag_ms = max(buffer.max_flush_lag_ms, lag_ms)
+                written += counts["applied"]
+        finally:
+            db.session.remove()
+            with buffer.lock:
+                buffer.flushes += 1
+                buffer.last_flush_ms = (time.perf_counter() - start) * 1000
+        return written
+
+
+class ProgressBuffer:
+    """Extension de Flask: un buffer por aplicacion (y por proceso worker).
+
+    Desactivada (`PROGRESS_BUFFER_ENABLED=0`, el defecto) `add` devuelve False
+    y el progreso se escribe en el mismo request.
+    """
+
+    def init_app(self, app: Flask) -> None:
+        buffer = _Buffer(app) if app.config["PROGRESS_BUFFER_ENABLED"] else None
+        app.extensions["progress_buffer"] = buffer
+        if buffer is not None:
+            atexit.register(self._flush_at_exit, buffer)
+
+    @property
+    def _buffer(self) -> _Buffer | None:
+        return current_app.extensions.get("progress_buffer")
+
+    @property
+    def enabled(self) -> bool:
+        return self._buffer is not None
+
+    def add(self, user_id: int, series_id: int, changes: dict) -> bool:
+        """Encola cambios ya parseados; False si esta desactivado o lleno."""
+        buffer = self._buffer
+        return buffer is not None and buffer.add(user_id, series_id, changes)
+
+    @contextlib.contextmanager
+    def superseding(self, user_id: int, series_ids):
+        """Envuelve una escritura sincronica que reemplaza los ticks pendientes de esas series.
+
+        Mientras dura no hay vaciados, asi uno en curso no pisa la escritura con
+        valores mas viejos. Si el bloque termina sin error (ya con su commit) se
+        olvidan los ticks encolados antes de entrar; los que llegaron durante la
+        escritura son mas nuevos y se conservan.
+        """
+        buffer = self._buffer
+        if buffer is None:
+            yield
+            return
+        with buffer.flush_lock:
+            with buffer.lock:
+                up_to = buffer.sequence
+            yield
+            buffer.discard(user_id, series_ids, up_to)
+
+    def flush(self) -> int:
+        """Escribe ahora todo lo pendiente."""
+        buffer = self._buffer
+        return flush(buffer) if buffer is not None else 0
+
+    def stats(self) -> dict:
+        """Pendientes, atraso de escritura y descartes para monitoreo."""
+        buffer = self._buffer
+        if buffer is None:
+            return {"enabled": False}
+        with buffer.lock:
+            oldest = min((since for _, since, _ in buffer.pending.values()), default=None)
+            return {
+                "enabled": True,
+                "pending": len(buffer.pending),
+                "oldest_pending_seconds": round(time.monotonic() - oldest, 3) if oldest is not None else 0.0,
+                "accepted": buffer.accepted,
+                "coalesced": buffer.coalesced,
+                "rejected": buffer.rejected,
+                "written": buffer.written,
+                "dropped": dict(buffer.dropped),
+                "flushes": buffer.flushes,
+                "flush_errors": buffer.flush_errors,
+                "last_flush_ms": round(buffer.last_flush_ms, 1),
+                "last_flush_lag_ms": round(buffer.last_flush_lag_ms, 1),
+                "max_flush_lag_ms": round(buffer.max_flush_lag_ms, 1),
+            }
+
+    @staticmethod
+    def _flush_at_exit(buffer: _Buffer) -> None:
+        if not buffer.pending:
+            return
+        try:
+            with buffer.app.app_context():
+                flush(buffer)
+        except Exception:
+            logger.exception("Se perdio progreso diferido al cerrar el proceso")
+        finally:
+            # Lo que no se pudo escribir ya no tiene otra oportunidad.
+            buffer.dropped["error"] += len(buffer.pending)
@@ -0,0 +1,133 @@
+"""Indice de texto completo sobre los titulos de peliculas y series.
+
+En SQLite es una tabla virtual FTS5 (`title_search`) con un documento por
+titulo: el rowid codifica el contenido (`id * 2` para peliculas e
+`id * 2 + 1` para series), de modo que borrar o actualizar un titulo es una
+busqueda por clave. En Postgres cada tabla tiene una columna generada
+`title_tsv` con indice GIN.
+
+El indice lo mantiene la propia base (triggers en SQLite, columna generada en
+Postgres): asi lo actualizan tanto el ORM de `MovieService`/`SeriesService`
+como los INSERT de Core de las cargas masivas y de `flask seed`. Las
+sentencias se ejecutan al final de `db.create_all()` y las aplica tambien la
+migracion correspondiente; `flask search rebuild` recarga el indice FTS5 si se
+creo sobre tablas que ya tenian datos.
+"""
+
+from __future__ import annotations
+
+import re
+
+import click
+from flask import Flask
+from flask.cli import with_appcontext
+from sqlalchemy import DDL, Connection, event, text
+
+from .extensions import db
+
+MAX_TERMS = 8
+KINDS = {"movie": 0, "serie": 1}
+
+SQLITE_DDL = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS title_search USING fts5(title, tokenize='unicode61 remove_diacritics 2')",
+    # Peliculas: rowid par.
+    "CREATE TRIGGER IF NOT EXISTS movies_search_insert AFTER INSERT ON movies BEGIN "
+    "INSERT INTO title_search(rowid, title) VALUES (new.id * 2, new.title); END",
+    "CREATE TRIGGER IF NOT EXISTS movies_search_update AFTER UPDATE OF title ON movies BEGIN "
+    "UPDATE title_search SET title = new.title WHERE rowid = new.id * 2; END",
+    "CREATE TRIGGER IF NOT EXISTS movies_search_delete AFTER DELETE ON movies BEGIN "
+    "DELETE FROM title_search WHERE rowid = old.id * 2; END",
+    # Series: rowid impar.
+    "CREATE TRIGGER IF NOT EXISTS serie_search_insert AFTER INSERT ON serie BEGIN "
+    "INSERT INTO title_search(rowid, title) VALUES (new.id * 2 + 1, new.title); END",
+    "CREATE TRIGGER IF NOT EXISTS serie_search_update AFTER UPDATE OF title ON serie BEGIN "
+    "UPDATE title_search SET title = new.title WHERE rowid = new.id * 2 + 1; END",
+    "CREATE TRIGGER IF NOT EXISTS serie_search_delete AFTER DELETE ON serie BEGIN "
+    "DELETE FROM title_search WHERE rowid = old.id * 2 + 1; END",
+)
+SQLITE_DROP = ("DROP TABLE IF EXISTS title_search",)
+
+# Configuracion 'simple': sin stemming, sirve para titulos en cualquier idioma.
+POSTGRES_DDL = tuple(
+    statement
+    for table in ("movies", "serie")
+    for statement in (
+        f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS title_tsv tsvector "
+        f"GENERATED ALWAYS AS (to_tsvector('simple', title)) STORED",
+        f"CREATE INDEX IF NOT EXISTS ix_{table}_title_tsv ON {table} USING gin (title_tsv)",
+    )
+)
+
+
+def init_app(app: Flask) -> None:
+    """Agrega el indice de busqueda a `create_all`/`drop_all` de la metadata."""
+    if event.contains(db.metadata, "after_create", _create_index):
+        return
+    event.listen(db.metadata, "after_create", _create_index)
+    event.listen(db.metadata, "before_drop", _drop_index)
+
+
+def _create_index(target, connection: Connection, **kw) -> None:
+    for statement in ddl_statements(connection.dialect.name):
+        connection.execute(DDL(statement))
+
+
+def _drop_index(target, connection: Connection, **kw) -> None:
+    if connection.dialect.name == "sqlite":
+        for statement in SQLITE_DROP:
+            connection.execute(DDL(statement))
+
+
+def ddl_statements(dialect: str) -> tuple[str, ...]:
+    """Sentencias que crean el indice y su mantenimiento para `dialect`."""
+    if dialect == "sqlite":
+        return SQLITE_DDL
+    if dialect == "postgresql":
+        return POSTGRES_DDL
+    return ()
+
+
+def match_terms(query: str) -> list[str]:
+    """Palabras de la busqueda, sin operadores ni comillas del usuario."""
+    return re.findall(r"\w+", query.lower())[:MAX_TERMS]
+
+
+def match_expression(terms: list[str], dialect: str) -> str:
+    """Consulta de texto completo: todas las palabras, la ultima como prefijo.
+
+    Cada palabra ya viene filtrada por `match_terms`, por lo que no puede
+    inyectar sintaxis de FTS5 ni de tsquery.
+    """
+    if dialect == "postgresql":
+        return " & ".join(terms[:-1] + [f"{terms[-1]}:*"])
+    return " ".join([f'"{term}"' for term in terms[:-1]] + [f'"{terms[-1]}"*'])
+
+
+def rebuild_search_index(conn: Connection) -> int:
+    """Vuelve a cargar el indice FTS5 desde las tablas (solo SQLite).
+
+    En Postgres la columna generada no necesita reconstruirse.
+    """
+    if conn.dialect.name != "sqlite":
+        return 0
+    conn.execute(text("DELETE FROM title_search"))
+    result = conn.execute(text(
+        "INSERT INTO title_search(rowid, title) "
+        "SELECT id * 2, title FROM movies UNION ALL SELECT id * 2 + 1, title FROM serie"
+    ))
+    return result.rowcount
+
+
+@click.group("search")
+def search_cli():
+    """Administra el indice de busqueda de titulos."""
+
+
+@search_cli.command("rebuild")
+@with_appcontext
+def rebuild_command():
+    """Regenera el indice FTS5 desde movies y serie."""
+    with db.engine.connect() as conn:
+        count = rebuild_search_index(conn)
+        conn.commit()
+    click.echo(f"title_search: {count:,} titulos indexados")
@@ -0,0 +1,360 @@
+"""Generador de datos sinteticos para reproducir volumenes de produccion.
+
+Los datos son deterministas para una misma semilla y tienen sesgos realistas:
+pocos titulos concentran la mayoria de las entradas (popularidad tipo Zipf),
+pocos usuarios concentran la mayor actividad (el usuario con menor id es el
+mas activo), las series tienen cantidades variables de temporadas y los
+titulos combinan palabras con frecuencias tipo Zipf (utiles para probar la
+busqueda). Las filas
+se escriben con INSERT multi-fila de Core en transacciones por lote.
+"""
+
+from __future__ import annotations
+
+import functools
+import itertools
+import random
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Iterable, Iterator
+
+import click
+from flask.cli import with_appcontext
+from sqlalchemy import Connection, delete, func, insert, select, text
+
+from .extensions import db
+from .models import Movie, Season, Serie, User, UserSummary, WatchEntry, WatchEvent, WatchHistoryDay
+from .summary import rebuild_summaries
+
+GENRES = ("drama", "comedy", "action", "thriller", "sci-fi", "horror", "romance", "documentary", "animation")
+# Los generos mas frecuentes primero; se usan como pesos relativos.
+GENRE_WEIGHTS = (30, 25, 15, 10, 7, 5, 4, 2, 2)
+STATUSES_MOVIE = ("plan-to-watch", "watching", "completed", "dropped")
+STATUSES_MOVIE_CUM_WEIGHTS = tuple(itertools.accumulate((50, 10, 35, 5)))
+# Fecha de referencia fija para que las fechas no dependan del dia de ejecucion.
+EPOCH = datetime(2024, 1, 1, tzinfo=timezone.utc)
+SPAN_SECONDS = 730 * 24 * 3600
+# Palabras de titulo: las reales primero (las mas frecuentes) y luego palabras
+# inventadas con silabas, para tener una cola larga de terminos poco comunes.
+TITLE_WORDS = (
+    "the", "love", "night", "last", "dark", "city", "war", "home", "king", "star", "dream", "shadow", "blood",
+    "summer", "secret", "road", "fire", "lost", "river", "ghost", "queen", "house", "world", "life", "game",
+    "winter", "time", "heart", "sea", "moon", "island", "storm", "wild", "silent", "golden", "broken", "red",
+    "noche", "amor", "ciudad", "sombra", "corazon", "guerra", "sueño", "fuego", "mar", "luna", "camino",
+)
+TITLE_SYLLABLES = ("ka", "lo", "mi", "ra", "to", "ne", "sa", "vi", "du", "re", "po", "li", "an", "el", "or", "tu")
+TITLE_VOCABULARY_SIZE = 5_000
+
+
+@dataclass(frozen=True)
+class SeedPlan:
+    """Tamaños del dataset y parametros de los sesgos."""
+
+    users: int = 1_000
+    movies: int = 20_000
+    series: int = 5_000
+    entries: int = 200_000
+    seed: int = 42
+    batch_size: int = 10_000
+    # Exponente de Zipf para la popularidad de los titulos y la actividad de los usuarios.
+    content_skew: float = 1.0
+    user_skew: float = 0.8
+
+
+@dataclass
+class SeedResult:
+    """Filas insertadas y el primer id asignado a cada tabla."""
+
+    first_user_id: int
+    first_movie_id: int
+    first_series_id: int
+    users: int = 0
+    movies: int = 0
+    series: int = 0
+    seasons: int = 0
+    entries: int = 0
+    summaries: int = 0
+
+
+def seed_database(conn: Connection, plan: SeedPlan, echo: Callable[[str], None] = lambda message: None) -> SeedResult:
+    """Agrega el dataset descrito por `plan` a la base de `conn`.
+
+    Los ids nuevos continuan los existentes, por lo que puede ejecutarse sobre
+    una base con datos. Las entradas de watchlist solo referencian usuarios y
+    contenidos creados en esta corrida y son unicas por (usuario, contenido).
+    """
+    rng = random.Random(plan.seed)
+    result = SeedResult(
+        first_user_id=_next_id(conn, User.id),
+        first_movie_id=_next_id(conn, Movie.id),
+        first_series_id=_next_id(conn, Serie.id),
+    )
+
+    result.users = _timed(echo, "users", lambda: _insert_batches(
+        conn, User.__table__, _user_rows(plan, result, rng), plan.batch_size
+    ))
+    result.movies = _timed(echo, "movies", lambda: _insert_batches(
+        conn, Movie.__table__, _movie_rows(plan, result, rng), plan.batch_size
+    ))
+
+    series_rows, season_rows = _series_rows(plan, result, rng)
+    result.series = _timed(echo, "serie", lambda: _insert_batches(conn, Serie.__table__, series_rows, plan.batch_size))
+    result.seasons = _timed(echo, "season", lambda: _insert_batches(conn, Season.__table__, season_rows, plan.batch_size))
+
+    _sync_sequences(conn, (User.__table__, Movie.__table__, Serie.__table__))
+
+    episodes = [row["total_episodes"] for row in series_rows]
+    result.entries = _timed(echo, "watch_entries", lambda: _insert_batches(
+        conn, WatchEntry.__table__, _entry_rows(plan, result, episodes, rng), plan.batch_size
+    ))
+    # Los INSERT de Core no pasan por la sesion: el resumen se calcula al final.
+    result.summaries = _timed(echo, "user_summary", lambda: rebuild_summaries(conn, from_user_id=result.first_user_id))
+    return result
+
+
+def clear_database(conn: Connection) -> None:
+    """Borra el contenido de las tablas del dominio, respetando las FK."""
+    tables = (
+        WatchHistoryDay.__table__, WatchEvent.__table__, UserSummary.__table__, WatchEntry.__table__,
+        Season.__table__, Serie.__table__, Movie.__table__, User.__table__,
+    )
+    for table in tables:
+        conn.execute(delete(table))
+    conn.commit()
+
+
+def _next_id(conn: Connection, column) -> int:
+    return (conn.execute(select(func.max(column))).scalar() or 0) + 1
+
+
+def _sync_sequences(conn: Connection, tables) -> None:
+    """Adelanta las secuencias de Postgres hasta el mayor id insertado a mano.
+
+    Las filas se insertan con ids explicitos, que no consumen la secuencia
+    SERIAL: sin esto el siguiente INSERT del ORM repetiria un id existente.
+    """
+    if conn.dialect.name != "postgresql":
+        return
+    for table in tables:
+        conn.execute(
+            text("SELECT setval(pg_get_serial_sequence(:table, 'id'), max(id)) FROM " + table.name),
+            {"table": table.name},
+        )
+    conn.commit()
+
+
+def _timed(echo: Callable[[str], None], name: str, insert_rows: Callable[[], int]) -> int:
+    start = time.perf_counter()
+    count = insert_rows()
+    elapsed = time.perf_counter() - start
+    echo(f"{name}: {count:,} filas en {elapsed:.1f} s ({count / max(elapsed, 1e-9):,.0f} filas/s)")
+    return count
+
+
+def _insert_batches(conn: Connection, table, rows: Iterable[dict], batch_size: int) -> int:
+    """Inserta en lotes de `batch_size`; cada lote es una transaccion."""
+    stmt = insert(table)
+    count = 0
+    iterator = iter(rows)
+    while batch := list(itertools.islice(iterator, batch_size)):
+        conn.execute(stmt, batch)
+        conn.commit()
+        count += len(batch)
+    return count
+
+
+def _timestamp(rng: random.Random) -> datetime:
+    return EPOCH + timedelta(seconds=rng.randrange(SPAN_SECONDS))
+
+
+@functools.cache
+def _title_vocabulary() -> tuple[tuple[str, ...], tuple[float, ...]]:
+    """Vocabulario fijo (independiente de la semilla) y sus pesos acumulados tipo Zipf."""
+    rng = random.Random(0)
+    words = dict.fromkeys(TITLE_WORDS)
+    while len(words) < TITLE_VOCABULARY_SIZE:
+        words.setdefault("".join(rng.choices(TITLE_SYLLABLES, k=rng.randint(2, 4))))
+    return tuple(words), tuple(itertools.accumulate(1 / rank for rank in range(1, len(words) + 1)))
+
+
+def _titles(rng: random.Random) -> Iterator[str]:
+    """Titulos de 1 a 4 palabras; algunos con numero de secuela."""
+    vocabulary, cum_weights = _title_vocabulary()
+    while True:
+        size = rng.choices((1, 2, 3, 4), weights=(20, 40, 30, 10))[0]
+        title = " ".join(rng.choices(vocabulary, cum_weights=cum_weights, k=size)).title()
+        if rng.random() < 0.05:
+            title += f" {rng.randint(2, 5)}"
+        yield title
+
+
+def _user_rows(plan: SeedPlan, result: SeedResult, rng: random.Random) -> Iterator[dict]:
+    for user_id in range(result.first_user_id, result.first_user_id + plan.users):
+        yield {
+            "id": user_id,
+            "name": f"User {user_id}",
+            "email": f"user{user_id}@example.com",
+            "created_at": _timestamp(rng),
+        }
+
+
+def _movie_rows(plan: SeedPlan, result: SeedResult, rng: random.Random) -> Iterator[dict]:
+    genres = rng.choices(GENRES, weights=GENRE_WEIGHTS, k=plan.movies)
+    titles = _titles(rng)
+    for offset, genre in enumerate(genres):
+        movie_id = result.first_movie_id + offset
+        created_at = _timestamp(rng)
+        yield {
+            "id": movie_id,
+            "title": next(titles),
+            "genre": genre,
+            # Estrenos recientes mas frecuentes que los antiguos.
+            "release_year": 2025 - min(int(rng.expovariate(1 / 15)), 75),
+            "created_at": created_at,
+            "updated_at": created_at,
+        }
+
+
+def _series_rows(plan: SeedPlan, result: SeedResult, rng: random.Random) -> tuple[list[dict], list[dict]]:
+    """Series con 1 a 15 temporadas (la mayoria con pocas) y sus temporadas."""
+    series = []
+    seasons = []
+    titles = _titles(rng)
+    for offset in range(plan.series):
+        series_id = result.first_series_id + offset
+        season_count = min(1 + int(rng.expovariate(1 / 2.5)), 15)
+        counts = [rng.randint(6, 24) for _ in range(season_count)]
+        created_at = _timestamp(rng)
+        series.append({
+            "id": series_id,
+            "title": next(titles),
+            "total_seasons": season_count,
+            "total_episodes": sum(counts),
+            "created_at": created_at,
+            "updated_at": created_at,
+        })
+        seasons.extend(
+            {"series_id": series_id, "number": number, "episodes_count": count}
+            for number, count in enumerate(counts, start=1)
+        )
+    return series, seasons
+
+
+def _user_quotas(plan: SeedPlan, capacity: int) -> list[int]:
+    """Entradas por usuario segun Zipf; ningun usuario supera `capacity`."""
+    weights = [1 / (rank ** plan.user_skew) for rank in range(1, plan.users + 1)]
+    total = sum(weights)
+    return [min(max(round(plan.entries * weight / total), 1), capacity) for weight in weights]
+
+
+def _entry_rows(plan: SeedPlan, result: SeedResult, episodes: list[int], rng: random.Random) -> Iterator[dict]:
+    """Watchlists con titulos populares sobrerrepresentados.
+
+    El espacio de contenidos se numera 0..movies+series-1 (primero peliculas).
+    Cada contenido recibe un rango de popularidad aleatorio y un peso 1/rango^s;
+    cada usuario toma su cuota de contenidos distintos segun esos pesos.
+    """
+    size = plan.movies + plan.series
+    if size == 0 or plan.users == 0:
+        return
+
+    ranks = list(range(1, size + 1))
+    rng.shuffle(ranks)
+    cum_weights = list(itertools.accumulate(1 / (rank ** plan.content_skew) for rank in ranks))
+    population = range(size)
+
+    for offset, quota in enumerate(_user_quotas(plan, capacity=max(size // 2, 1))):
+        user_id = result.first_user_id + offset
+        chosen: set[int] = set()
+        # Con sesgo alto los titulos raros casi no salen: tras unas rondas se completa al azar.
+        for _ in range(4):
+            missing = quota - len(chosen)
+            if missing <= 0:
+                break
+            chosen.update(rng.choices(population, cum_weights=cum_weights, k=missing * 2))
+        while len(chosen) < quota:
+            chosen.add(rng.randrange(size))
+
+        # Las rondas pueden pasarse de la cuota: se descarta el excedente al azar y
+        # se ordena por contenido para que las inserciones recorran el indice unico en secuencia.
+        picked = sorted(rng.sample(sorted(chosen), quota)) if len(chosen) > quota else sorted(chosen)
+        for index in picked:
+            if index < plan.movies:
+                yield _movie_entry(user_id, result.first_movie_id + index, rng)
+            else:
+                series_index = index - plan.movies
+                yield _series_entry(user_id, result.first_series_id + series_index, episodes[series_index], rng)
+
+
+def _movie_entry(user_id: int, movie_id: int, rng: random.Random) -> dict:
+    return {
+        "user_id": user_id,
+        "content_type": "movie",
+        "content_id": movie_id,
+        "status": rng.choices(STATUSES_MOVIE, cum_weights=STATUSES_MOVIE_CUM_WEIGHTS)[0],
+        "current_season": None,
+        "current_episode": None,
+        "watched_episodes": 0,
+        "total_episodes": None,
+        "updated_at": _timestamp(rng),
+    }
+
+
+def _series_entry(user_id: int, series_id: int, total_episodes: int, rng: random.Random) -> dict:
+    roll = rng.random()
+    if roll < 0.25:
+        watched = total_episodes
+    elif roll < 0.45:
+        watched = 0
+    else:
+        watched = rng.randint(1, total_episodes - 1)
+
+    if watched == total_episodes:
+        status, season, episode = "completed", None, None
+    elif watched == 0:
+        status, season, episode = "plan-to-watch", None, None
+    else:
+        status = "dropped" if rng.random() < 0.1 else "watching"
+        # Aproximacion: temporadas de ~12 episodios para ubicar el episodio actual.
+        season, episode = watched // 12 + 1, watched % 12 + 1
+
+    return {
+        "user_id": user_id,
+        "content_type": "serie",
+        "content_id": series_id,
+        "status": status,
+        "current_season": season,
+        "current_episode": episode,
+        "watched_episodes": watched,
+        "total_episodes": total_episodes,
+        "updated_at": _timestamp(rng),
+    }
+
+
+@click.command("seed")
+@click.option("--users", type=int, default=SeedPlan.users, show_default=True, help="Usuarios a crear.")
+@click.option("--movies", type=int, default=SeedPlan.movies, show_default=True, help="Peliculas a crear.")
+@click.option("--series", type=int, default=SeedPlan.series, show_default=True, help="Series a crear.")
+@click.option("--entries", type=int, default=SeedPlan.entries, show_default=True, help="Entradas de watchlist (aprox.).")
+@click.option("--seed", "seed_value", type=int, default=SeedPlan.seed, show_default=True, help="Semilla aleatoria.")
+@click.option("--batch-size", type=int, default=SeedPlan.batch_size, show_default=True, help="Filas por transaccion.")
+@click.option("--reset", is_flag=True, help="Borra los datos existentes antes de generar.")
+@with_appcontext
+def seed_command(users, movies, series, entries, seed_value, batch_size, reset):
+    """Genera un dataset sintetico grande y determinista."""
+    if min(users, movies, series, entries) < 0 or batch_size < 1:
+        raise click.BadParameter("Los tamaños deben ser positivos.")
+
+    plan = SeedPlan(
+        users=users, movies=movies, series=series, entries=entries, seed=seed_value, batch_size=batch_size
+    )
+    start = time.perf_counter()
+    with db.engine.connect() as conn:
+        if reset:
+            clear_database(conn)
+            click.echo("datos existentes borrados")
+        result = seed_database(conn, plan, echo=click.echo)
+
+    total = result.users + result.movies + result.series + result.seasons + result.entries + result.summaries
+    click.echo(f"total: {total:,} filas en {time.perf_counter() - start:.1f} s")
@@ -0,0 +1,230 @@
+"""Mantenimiento incremental de `user_summary`.
+
+Antes de cada flush se comparan los valores anteriores y nuevos de `status`
+y `watched_episodes` de las `WatchEntry` creadas, modificadas o borradas, y
+las diferencias por usuario se aplican con un unico UPSERT en la misma
+transaccion. Asi `ProgressService.add_movie`, `add_series`,
+`update_series_progress` (incluido `WatchEntry.mark_as_watched`) y la
+actualizacion por lotes mantienen el resumen sin consultas agregadas.
+
+Las escrituras con Core que no pasan por la sesion deben llamar a
+`rebuild_summaries` (por ejemplo `flask seed`) o, si conocen las diferencias
+por usuario, a `apply_summary_deltas` (por ejemplo `SeriesService.add_season`). `flask summary check` compara la tabla con
+un agregado sobre `watch_entries` y `flask summary rebuild` la regenera.
+"""
+
+from __future__ import annotations
+
+import sys
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Optional
+
+import click
+from flask import Flask
+from flask.cli import with_appcontext
+from sqlalchemy import Connection, case, delete, event, func, insert, inspect, literal, select, update
+from sqlalchemy.orm import Session
+
+from .extensions import db
+from .models import UserSummary, WatchEntry
+
+COUNTERS = ("entries", "watching", "completed", "episodes_watched")
+ZERO = (0, 0, 0, 0)
+
+
+def init_app(app: Flask) -> None:
+    """Conecta el mantenimiento del resumen a los flush de todas las sesiones."""
+    if not event.contains(Session, "before_flush", _apply_summary_deltas):
+        event.listen(Session, "before_flush", _apply_summary_deltas)
+
+
+def _contribution(status: Optional[str], watched_episodes: Optional[int]) -> tuple[int, int, int, int]:
+    """Aporte de una entrada a cada contador de COUNTERS."""
+    if status is None:
+        # Entrada nueva sin estado explicito: se insertara con el default de la columna.
+        status = WatchEntry.__table__.c.status.default.arg
+    return (1, int(status == "watching"), int(status == "completed"), watched_episodes or 0)
+
+
+def _previous(state, key: str):
+    """Valor confirmado de un atributo (antes de los cambios pendientes)."""
+    history = state.attrs[key].load_history()
+    if history.deleted:
+        return history.deleted[0]
+    if history.unchanged:
+        return history.unchanged[0]
+    return None
+
+
+def _current(state, key: str):
+    history = state.attrs[key].history
+    if history.added:
+        return history.added[0]
+    return getattr(state.obj(), key)
+
+
+def _apply_summary_deltas(session: Session, flush_context, instances) -> None:
+    deltas: dict[int, list[int]] = defaultdict(lambda: [0, 0, 0, 0])
+
+    def add(user_id: int, values: tuple, sign: int) -> None:
+        delta = deltas[user_id]
+        for i, value in enumerate(values):
+            delta[i] += sign * value
+
+    for obj in session.new:
+        if isinstance(obj, WatchEntry):
+            add(obj.user_id, _contribution(obj.status, obj.watched_episodes), 1)
+
+    for obj in session.deleted:
+        if isinstance(obj, WatchEntry):
+            state = inspect(obj)
+            add(_previous(state, "user_id"), _contribution(_previous(state, "status"), _previous(state, "watched_episodes")), -1)
+
+    for obj in session.dirty:
+        if not isinstance(obj, WatchEntry):
+            continue
+        state = inspect(obj)
+        if not (state.attrs.status.history.has_changes() or state.attrs.watched_episodes.history.has_changes()):
+            continue
+        add(obj.user_id, _contribution(_previous(state, "status"), _previous(state, "watched_episodes")), -1)
+        add(obj.user_id, _contribution(_current(state, "status"), _current(state, "watched_episodes")), 1)
+
+    apply_summary_deltas(session.connection(), deltas)
+
+
+def apply_summary_deltas(conn: Connection, deltas: dict[int, tuple[int, ...] | list[int]]) -> None:
+    """Suma a `user_summary` las diferencias por usuario, en el orden de COUNTERS.
+
+    No confirma: corre en la transaccion de `conn`, junto a la escritura que
+    las origina.
+    """
+    rows = [
+        dict(zip(("user_id",) + COUNTERS, (user_id, *delta)))
+        for user_id, delta in deltas.items()
+        if any(delta)
+    ]
+    if rows:
+        _upsert_deltas(conn, rows)
+
+
+def _upsert_deltas(conn: Connection, rows: list[dict]) -> None:
+    """Suma las diferencias a las filas existentes o las crea."""
+    table = UserSummary.__table__
+    now = datetime.now(timezone.utc)
+    for row in rows:
+        row["updated_at"] = now
+
+    dialect = conn.dialect.name
+    if dialect in ("sqlite", "postgresql"):
+        if dialect == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert as upsert
+        else:
+            from sqlalchemy.dialects.postgresql import insert as upsert
+        stmt = upsert(table).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c.user_id],
+            set_={
+                **{name: table.c[name] + stmt.excluded[name] for name in COUNTERS},
+                "updated_at": stmt.excluded.updated_at,
+            },
+        )
+        conn.execute(stmt)
+        return
+
+    # Motores sin ON CONFLICT: UPDATE y, si no existia la fila, INSERT.
+    for row in rows:
+        result = conn.execute(
+            update(table)
+            .where(table.c.user_id == row["user_id"])
+            .values({name: table.c[name] + row[name] for name in COUNTERS}, updated_at=row["updated_at"])
+        )
+        if result.rowcount == 0:
+            conn.execute(insert(table).values(row))
+
+
+def _aggregate(from_user_id: Optional[int] = None):
+    """Resumen calculado desde `watch_entries`, una fila por usuario con entradas."""
+    stmt = select(
+        WatchEntry.user_id,
+        func.count().label("entries"),
+        func.coalesce(func.sum(case((WatchEntry.status == "watching", 1), else_=0)), 0).label("watching"),
+        func.coalesce(func.sum(case((WatchEntry.status == "completed", 1), else_=0)), 0).label("completed"),
+        func.coalesce(func.sum(WatchEntry.watched_episodes), 0).label("episodes_watched"),
+    ).group_by(WatchEntry.user_id)
+    if from_user_id is not None:
+        stmt = stmt.where(WatchEntry.user_id >= from_user_id)
+    return stmt
+
+
+def rebuild_summaries(conn: Connection, from_user_id: Optional[int] = None) -> int:
+    """Regenera `user_summary` con un INSERT ... SELECT y confirma la transaccion.
+
+    Con `from_user_id` solo se regeneran los usuarios con id mayor o igual.
+    Devuelve la cantidad de filas escritas.
+    """
+    table = UserSummary.__table__
+    clear = delete(table)
+    if from_user_id is not None:
+        clear = clear.where(table.c.user_id >= from_user_id)
+    conn.execute(clear)
+
+    aggregate = _aggregate(from_user_id).add_columns(literal(datetime.now(timezone.utc)).label("updated_at"))
+    result = conn.execute(
+        insert(table).from_select(["user_id", *COUNTERS, "updated_at"], aggregate)
+    )
+    conn.commit()
+    return result.rowcount
+
+
+def check_summaries(conn: Connection) -> list[dict]:
+    """Compara `user_summary` con el agregado real y devuelve las diferencias."""
+    table = UserSummary.__table__
+    expected = {row[0]: tuple(row[1:]) for row in conn.execute(_aggregate())}
+    stored = {
+        row[0]: tuple(row[1:])
+        for row in conn.execute(select(table.c.user_id, *(table.c[name] for name in COUNTERS)))
+    }
+
+    mismatches = []
+    for user_id in sorted(expected.keys() | stored.keys()):
+        want, have = expected.get(user_id, ZERO), stored.get(user_id)
+        # Un usuario sin entradas puede no tener fila o tenerla en cero.
+        if (have or ZERO) != want:
+            mismatches.append({
+                "user_id": user_id,
+                "expected": dict(zip(COUNTERS, want)),
+                "stored": dict(zip(COUNTERS, have)) if have else None,
+            })
+    return mismatches
+
+
+@click.group("summary")
+def summary_cli():
+    """Administra la tabla user_summary."""
+
+
+@summary_cli.command("rebuild")
+@with_appcontext
+def rebuild_command():
+    """Regenera el resumen de todos los usuarios desde watch_entries."""
+    with db.engine.connect() as conn:
+        count = rebuild_summaries(conn)
+    click.echo(f"user_summary: {count:,} filas regeneradas")
+
+
+@summary_cli.command("check")
+@click.option("--limit", type=int, default=20, show_default=True, help="Diferencias a mostrar.")
+@with_appcontext
+def check_command(limit):
+    """Verifica el resumen contra watch_entries; termina con codigo 1 si difiere."""
+    with db.engine.connect() as conn:
+        mismatches = check_summaries(conn)
+    if not mismatches:
+        click.echo("user_summary consistente")
+        return
+
+    for mismatch in mismatches[:limit]:
+        click.echo(f"usuario {mismatch['user_id']}: esperado {mismatch['expected']}, guardado {mismatch['stored']}")
+    click.echo(f"{len(mismatches):,} usuarios con diferencias; ejecutar `flask summary rebuild`")
+    sys.exit(1)
@@ -0,0 +1,56 @@
+"""Fixtures comunes: una app con SQLite en memoria por test y su cliente."""
+
+import pytest
+from sqlalchemy import event
+
+from src import create_app
+from src.config import TestingConfig
+from src.extensions import db
+
+
+@pytest.fixture
+def app():
+    app = create_app(TestingConfig)
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def capture_queries():
+    """Devuelve una funcion que ejecuta `action` y retorna las sentencias SQL emitidas.
+
+    Cada sentencia viene con sus parametros, `(statement, parameters)`, y se
+    escucha el engine de la app activa al llamarla.
+    """
+
+    def capture(action) -> list[tuple[str, object]]:
+        statements = []
+
+        def on_execute(conn, cursor, statement, parameters, context, executemany):
+            statements.append((statement, parameters))
+
+        event.listen(db.engine, "before_cursor_execute", on_execute)
+        try:
+            action()
+        finally:
+            event.remove(db.engine, "before_cursor_execute", on_execute)
+        return statements
+
+    return capture
+
+
+@pytest.fixture
+def count_queries(app, capture_queries):
+    """Devuelve una funcion que ejecuta `action` y cuenta las sentencias SQL emitidas."""
+
+    def count(action) -> int:
+        return len(capture_queries(action))
+
+    return count
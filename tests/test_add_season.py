@@ -0,0 +1,64 @@
+"""Agregar una temporada propaga el total a la watchlist sin reordenarla."""
+
+import pytest
+
+from src.extensions import db
+from src.models import Movie, Season, Serie, User, WatchEntry
+from src.summary import check_summaries
+
+
+@pytest.fixture
+def serie(app):
+    """Serie de 10 episodios: Ana la termino, Beto va por el 3 y Caro la termino pero no la ve en la watchlist."""
+    serie = Serie(title="Serie", total_seasons=1, total_episodes=10)
+    other = Serie(title="Otra", total_seasons=1, total_episodes=10)
+    movie = Movie(title="Pelicula", genre="drama", release_year=2000)
+    db.session.add_all([User(id=1, name="Ana"), User(id=2, name="Beto"), User(id=3, name="Caro"), serie, other, movie])
+    db.session.flush()
+    db.session.add(Season(series_id=serie.id, number=1, episodes_count=10))
+    db.session.add_all([
+        WatchEntry(user_id=1, content_type="serie", content_id=serie.id, status="completed",
+                   watched_episodes=10, total_episodes=10),
+        WatchEntry(user_id=2, content_type="serie", content_id=serie.id, status="watching",
+                   watched_episodes=3, total_episodes=10),
+        WatchEntry(user_id=3, content_type="serie", content_id=other.id, status="completed",
+                   watched_episodes=10, total_episodes=10),
+    ])
+    db.session.commit()
+    # Entrada mas reciente de Ana: debe seguir primera despues de agregar la temporada.
+    db.session.add(WatchEntry(user_id=1, content_type="movie", content_id=movie.id, status="watching"))
+    db.session.commit()
+    return serie.id
+
+
+def entries() -> dict:
+    return {
+        (entry.user_id, entry.content_type): (entry.status, entry.total_episodes, entry.updated_at)
+        for entry in db.session.scalars(db.select(WatchEntry))
+    }
+
+
+def test_new_season_reopens_completed_entries_without_reordering(client, serie):
+    before = entries()
+    response = client.post(f"/series/{serie}/seasons", json={"number": 2, "episodes_count": 5})
+    assert response.status_code == 201
+    db.session.expire_all()
+    after = entries()
+
+    assert after[(1, "serie")] == ("watching", 15, before[(1, "serie")][2])
+    assert after[(2, "serie")] == ("watching", 15, before[(2, "serie")][2])
+    assert after[(3, "serie")] == before[(3, "serie")]
+
+    watchlist = client.get("/me/watchlist", headers={"X-User-Id": "1"}).get_json()["items"]
+    assert [item["content_type"] for item in watchlist] == ["movie", "serie"]
+    with db.engine.connect() as conn:
+        assert check_summaries(conn) == []
+
+
+def test_new_season_without_episodes_keeps_completed_entries(client, serie):
+    before = entries()
+    response = client.post(f"/series/{serie}/seasons", json={"number": 2, "episodes_count": 0})
+    assert response.status_code == 201
+    db.session.expire_all()
+
+    assert entries()[(1, "serie")] == before[(1, "serie")]
@@ -0,0 +1,44 @@
+"""Carga masiva de peliculas desde CSV."""
+
+
+def post_csv(client, body: bytes):
+    return client.post("/movies/bulk", data=body, content_type="text/csv")
+
+
+def test_bad_csv_row_does_not_stop_the_import(client):
+    body = (
+        b"title,genre,release_year\n"
+        b"Uno,drama,2000\n"
+        b"D\xffos,drama,2001\n"
+        b"Tres,drama,2002\n"
+        b"Cuatro,comedy,2003\n"
+    )
+
+    response = post_csv(client, body)
+
+    assert response.status_code == 200
+    report = response.get_json()
+    assert report["inserted"] == 3
+    assert report["failed"] == 1
+    assert [error["line"] for error in report["errors"]] == [3]
+    assert report["errors"][0]["error"].startswith("CSV invalido")
+    titles = [movie["title"] for movie in client.get("/movies/").get_json()["items"]]
+    assert titles == ["Uno", "Tres", "Cuatro"]
+
+
+def test_oversized_field_is_reported_and_import_continues(client):
+    body = b"title,genre,release_year\n\"" + b"x" * 200_000 + b"\",drama,2000\nOtra,drama,2001\n"
+
+    report = post_csv(client, body).get_json()
+
+    assert report["inserted"] == 1
+    assert report["failed"] == 1
+    assert report["errors"][0]["line"] == 2
+
+
+def test_unreadable_header_reports_skipped_lines(client):
+    report = post_csv(client, b"ti\xfftle,genre,release_year\nUno,drama,2000\nDos,drama,2001\n").get_json()
+
+    assert report["inserted"] == 0
+    assert report["failed"] == 1
+    assert "2 lineas sin procesar" in report["errors"][0]["error"]
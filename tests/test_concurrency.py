@@ -0,0 +1,85 @@
+"""PATCH de progreso simultaneos sobre un archivo SQLite con los PRAGMA de BaseConfig."""
+
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+
+from src import create_app
+from src.config import BaseConfig, TestingConfig
+from src.extensions import db
+from src.models import WatchEntry
+from src.seed import SeedPlan, seed_database
+
+WORKERS = 8
+REQUESTS_PER_WORKER = 10
+
+
+def make_app(path, pragmas: dict):
+    config = type("ConcurrencyConfig", (TestingConfig,), {
+        "SQLALCHEMY_DATABASE_URI": f"sqlite:///{path}",
+        "SQLITE_PRAGMAS": pragmas,
+        "DETAIL_CACHE_MAX_SIZE": 0,
+    })
+    app = create_app(config)
+    with app.app_context():
+        db.create_all()
+        with db.engine.connect() as conn:
+            seed_database(conn, SeedPlan(users=WORKERS, movies=50, series=50, entries=WORKERS * 20, user_skew=0))
+    return app
+
+
+def patch_concurrently(app, path) -> list[tuple[int, str]]:
+    """Cada hilo es un usuario con PATCH seguidos; un lector mantiene abierta una transaccion de lectura."""
+    with app.app_context():
+        targets = {
+            user_id: [
+                entry.content_id
+                for entry in WatchEntry.query.filter_by(user_id=user_id, content_type="serie").order_by(WatchEntry.id)
+            ]
+            for user_id in range(1, WORKERS + 1)
+        }
+        db.session.remove()
+
+    def patch_many(user_id: int) -> list[tuple[int, str]]:
+        client = app.test_client()
+        results = []
+        for i in range(REQUESTS_PER_WORKER):
+            series_id = targets[user_id][i % len(targets[user_id])]
+            response = client.patch(
+                f"/progress/series/{series_id}",
+                json={"watched_episodes": i % 2, "current_episode": 1},
+                headers={"X-User-Id": str(user_id)},
+            )
+            results.append((response.status_code, response.get_data(as_text=True)))
+        return results
+
+    # Un cliente lento en medio de un listado: la lectura sigue abierta mientras llegan los PATCH.
+    reader = sqlite3.connect(path, isolation_level=None)
+    try:
+        reader.execute("BEGIN")
+        reader.execute("SELECT count(*) FROM watch_entries").fetchone()
+        with ThreadPoolExecutor(max_workers=WORKERS) as pool:
+            return [result for results in pool.map(patch_many, targets) for result in results]
+    finally:
+        reader.execute("COMMIT")
+        reader.close()
+
+
+def test_simultaneous_progress_patches_do_not_lock(tmp_path):
+    path = tmp_path / "concurrency.db"
+    app = make_app(path, BaseConfig.SQLITE_PRAGMAS)
+
+    results = patch_concurrently(app, path)
+
+    assert len(results) == WORKERS * REQUESTS_PER_WORKER
+    assert sqlite3.connect(path).execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    assert [body for status, body in results if status != 200] == []
+
+
+def test_without_wal_the_open_reader_locks_writers(tmp_path):
+    """Control: sin WAL (y con una espera corta) el mismo escenario falla."""
+    path = tmp_path / "concurrency.db"
+    app = make_app(path, {"busy_timeout": 100})
+
+    results = patch_concurrently(app, path)
+
+    assert any("database is locked" in body for status, body in results if status != 200)
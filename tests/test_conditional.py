@@ -0,0 +1,81 @@
+"""ETag de los listados: dependen solo de las filas de la pagina pedida."""
+
+import pytest
+
+from src.extensions import db
+from src.models import Movie, Serie
+
+
+@pytest.fixture
+def movies(app):
+    rows = [Movie(title=f"Pelicula {i}", genre="drama", release_year=2000 + i) for i in range(6)]
+    db.session.add_all(rows)
+    db.session.commit()
+    return [movie.id for movie in rows]
+
+
+def revalidate(client, url: str, etag: str) -> int:
+    return client.get(url, headers={"If-None-Match": etag}).status_code
+
+
+def test_movie_page_etag_ignores_rows_outside_the_page(client, movies):
+    url = "/movies/?limit=2&sort=-release_year"
+    etag = client.get(url).headers["ETag"].strip('"')
+
+    db.session.get(Movie, movies[0]).title = "Fuera de la pagina"
+    db.session.commit()
+    assert revalidate(client, url, etag) == 304
+
+    db.session.get(Movie, movies[5]).title = "En la pagina"
+    db.session.commit()
+    assert revalidate(client, url, etag) == 200
+
+
+@pytest.mark.parametrize("change", ["delete", "insert"])
+def test_movie_page_etag_changes_when_the_page_rows_change(client, movies, change):
+    url = "/movies/?limit=2&genre=drama"
+    etag = client.get(url).headers["ETag"].strip('"')
+
+    if change == "delete":
+        db.session.delete(db.session.get(Movie, movies[1]))
+    else:
+        db.session.add(Movie(id=0, title="Primera", genre="drama", release_year=1990))
+    db.session.commit()
+
+    assert revalidate(client, url, etag) == 200
+
+
+def test_movie_page_etag_tracks_next_cursor(client, movies):
+    url = "/movies/?limit=6"
+    response = client.get(url)
+    assert response.get_json()["next_cursor"] is None
+
+    db.session.add(Movie(title="Septima", genre="drama", release_year=2010))
+    db.session.commit()
+
+    assert revalidate(client, url, response.headers["ETag"].strip('"')) == 200
+
+
+def test_series_page_etag_ignores_rows_outside_the_page(client):
+    series = [Serie(title=f"Serie {i}") for i in range(4)]
+    db.session.add_all(series)
+    db.session.commit()
+    etag = client.get("/series/?limit=1").headers["ETag"].strip('"')
+
+    series[3].title = "Fuera de la pagina"
+    db.session.commit()
+    assert revalidate(client, "/series/?limit=1", etag) == 304
+
+    series[0].title = "En la pagina"
+    db.session.commit()
+    assert revalidate(client, "/series/?limit=1", etag) == 200
+
+
+def test_stream_etag_covers_every_matching_row(client, movies):
+    url = "/movies/?stream=1&genre=drama"
+    etag = client.get(url).headers["ETag"].strip('"')
+
+    db.session.delete(db.session.get(Movie, movies[2]))
+    db.session.commit()
+
+    assert revalidate(client, url, etag) == 200
@@ -0,0 +1,64 @@
+"""Cache de detalles: una escritura durante el llenado no deja datos viejos."""
+
+import pytest
+from sqlalchemy import update
+
+from src.cache import CachedDetail, _LRUStore
+from src.extensions import db, detail_cache
+from src.models import Movie, Serie
+
+DETAILS = {
+    "movie": (Movie, "/movies/{}", lambda: Movie(title="Antes", genre="drama", release_year=2000)),
+    "serie": (Serie, "/series/{}", lambda: Serie(title="Antes")),
+}
+
+
+@pytest.mark.parametrize("kind", DETAILS)
+def test_write_between_read_and_fill_is_not_cached(client, monkeypatch, kind):
+    model, path, build = DETAILS[kind]
+    row = build()
+    db.session.add(row)
+    db.session.commit()
+    object_id = row.id
+
+    original = model.to_dict
+
+    def write_while_reading(self, *args, **kwargs):
+        # Otro request actualiza e invalida despues de la lectura y antes del set.
+        payload = original(self, *args, **kwargs)
+        monkeypatch.setattr(model, "to_dict", original)
+        db.session.execute(update(model).where(model.id == object_id).values(title="Despues"))
+        db.session.commit()
+        detail_cache.invalidate(kind, object_id)
+        return payload
+
+    monkeypatch.setattr(model, "to_dict", write_while_reading)
+    assert client.get(path.format(object_id)).get_json()["title"] == "Antes"
+
+    assert detail_cache.get(kind, object_id) is None
+    assert client.get(path.format(object_id)).get_json()["title"] == "Despues"
+    assert detail_cache.stats()["stale_fills"] == 1
+
+
+def test_fill_without_invalidation_is_cached(client):
+    movie = Movie(title="Amelie", genre="comedy", release_year=2001)
+    db.session.add(movie)
+    db.session.commit()
+
+    client.get(f"/movies/{movie.id}")
+
+    assert detail_cache.get("movie", movie.id).payload["title"] == "Amelie"
+
+
+def test_trimmed_invalidation_log_rejects_older_generations():
+    store = _LRUStore(max_size=1, ttl=60)
+    value = CachedDetail(payload={}, etag="x", last_modified=None)
+    generation = store.generation()
+
+    store.delete(("movie", 1))
+    store.delete(("movie", 2))  # descarta la marca de ("movie", 1)
+    store.set(("movie", 1), value, generation)
+    store.set(("movie", 3), value, store.generation())
+
+    assert store.get(("movie", 1)) is None
+    assert store.get(("movie", 3)) is value
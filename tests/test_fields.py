@@ -0,0 +1,83 @@
+"""Proyeccion parcial con `?fields=` en listados y detalles."""
+
+import pytest
+
+from src.extensions import db
+from src.models import Movie, Season, Serie, User, WatchEntry
+
+
+@pytest.fixture
+def catalog(app):
+    movie = Movie(title="Amelie", genre="comedy", release_year=2001)
+    serie = Serie(title="Dark", total_seasons=1, total_episodes=10, seasons=[Season(number=1, episodes_count=10)])
+    db.session.add_all([User(id=1, name="Ana"), movie, serie])
+    db.session.flush()
+    db.session.add_all([
+        WatchEntry(user_id=1, content_type="movie", content_id=movie.id, status="completed"),
+        WatchEntry(user_id=1, content_type="serie", content_id=serie.id, status="watching",
+                   watched_episodes=5, total_episodes=10),
+    ])
+    db.session.commit()
+    return {"movie": movie.id, "serie": serie.id}
+
+
+def test_movie_list_returns_only_requested_fields(client, catalog):
+    items = client.get("/movies/?fields=title,release_year").get_json()["items"]
+
+    assert items == [{"title": "Amelie", "release_year": 2001}]
+
+
+def test_movie_list_without_fields_matches_to_dict(client, catalog):
+    item = client.get("/movies/").get_json()["items"][0]
+
+    assert set(item) == set(db.session.get(Movie, catalog["movie"]).to_dict())
+
+
+def test_movie_detail_projection(client, catalog):
+    response = client.get(f"/movies/{catalog['movie']}?fields=genre")
+
+    assert response.get_json() == {"genre": "comedy"}
+
+
+def test_series_detail_accepts_seasons_field(client, catalog):
+    response = client.get(f"/series/{catalog['serie']}?fields=title,seasons")
+
+    body = response.get_json()
+    assert set(body) == {"title", "seasons"}
+    assert [season["number"] for season in body["seasons"]] == [1]
+
+
+def test_watchlist_projection_skips_unused_joins(client, capture_queries, catalog):
+    responses = []
+    statements = capture_queries(lambda: responses.append(
+        client.get("/me/watchlist?fields=status,percentage_watched", headers={"X-User-Id": "1"})
+    ))
+    [response] = responses
+
+    assert sorted(response.get_json()["items"], key=lambda item: item["status"]) == [
+        {"status": "completed", "percentage_watched": 0.0},
+        {"status": "watching", "percentage_watched": 50.0},
+    ]
+    page_query, _ = statements[-1]
+    assert "JOIN" not in page_query
+    assert "watch_entries.status" in page_query
+
+
+def test_watchlist_title_field_joins_content(client, catalog):
+    items = client.get("/me/watchlist?fields=content_type,title", headers={"X-User-Id": "1"}).get_json()["items"]
+
+    assert sorted((item["content_type"], item["title"]) for item in items) == [("movie", "Amelie"), ("serie", "Dark")]
+
+
+@pytest.mark.parametrize("path", [
+    "/movies/?fields=title,budget",
+    "/movies/?fields=",
+    "/movies/1?fields=seasons",
+    "/series/?fields=seasons",
+    "/me/watchlist?fields=nombre",
+])
+def test_unknown_fields_are_rejected(client, catalog, path):
+    response = client.get(path, headers={"X-User-Id": "1"})
+
+    assert response.status_code == 400
+    assert "fields" in response.get_json()["error"]
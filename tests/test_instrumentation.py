@@ -0,0 +1,44 @@
+"""Server-Timing y registro de consultas, incluidas las respuestas en streaming."""
+
+import json
+import logging
+
+import pytest
+
+from src.extensions import db
+from src.models import Movie
+
+
+@pytest.fixture
+def movies(app):
+    db.session.add_all(Movie(title=f"Pelicula {i}", genre="drama", release_year=2000) for i in range(5))
+    db.session.commit()
+
+
+def logged(caplog, event: str) -> list[dict]:
+    records = [json.loads(record.getMessage()) for record in caplog.records if record.name == "src.instrumentation"]
+    return [record for record in records if record["event"] == event]
+
+
+def test_server_timing_counts_queries(client, movies):
+    response = client.get("/movies/")
+
+    assert 'desc="2 queries"' in response.headers["Server-Timing"]
+
+
+def test_streamed_response_is_accounted_when_closed(app, client, movies, caplog):
+    app.config["SQL_SLOW_QUERY_MS"] = 0
+    caplog.set_level(logging.INFO, logger="src.instrumentation")
+
+    response = client.get("/movies/?stream=1")
+    assert "Server-Timing" not in response.headers
+    assert len(json.loads(response.get_data())) == 5
+    response.close()
+
+    [summary] = logged(caplog, "request_sql")
+    assert summary["streamed"] is True
+    assert summary["endpoint"] == "movies.list_movies"
+    # El agregado del ETag corre en la vista; el SELECT del catalogo, al generar el cuerpo.
+    assert summary["queries"] == 2
+    assert any("FROM movies" in query["statement"] and query["endpoint"] == "movies.list_movies"
+               for query in logged(caplog, "slow_query"))
@@ -0,0 +1,170 @@
+"""Filtros y orden de GET /movies/, recorriendo todas las paginas por cursor."""
+
+import itertools
+import random
+
+import pytest
+from sqlalchemy import text
+
+from src import create_app
+from src.config import TestingConfig
+from src.extensions import db
+from src.models import Movie
+from src.seed import SeedPlan, seed_database
+
+GENRES = ("drama", "comedy", "horror")
+WORDS = ("star", "Star", "stone", "dark", "Dawn", "moon", "the", "The")
+
+
+@pytest.fixture
+def movies(app):
+    """90 peliculas con titulos repetidos y mayusculas mezcladas, para ejercitar los desempates por id."""
+    rng = random.Random(7)
+    rows = [
+        Movie(
+            title=f"{rng.choice(WORDS)} {rng.choice(WORDS)}",
+            genre=rng.choice(GENRES),
+            release_year=rng.randint(1995, 2005),
+        )
+        for _ in range(90)
+    ]
+    db.session.add_all(rows)
+    db.session.commit()
+    return [(movie.id, movie.title, movie.genre, movie.release_year) for movie in rows]
+
+
+FILTERS = [
+    {},
+    {"genre": "drama"},
+    {"year_from": "1998", "year_to": "2001"},
+    {"title_prefix": "ST"},
+    {"genre": "comedy", "year_from": "2000", "title_prefix": "the "},
+]
+SORTS = ["id", "-id", "title", "-title", "release_year", "-release_year"]
+
+
+def expected_ids(movies, filters: dict, sort: str) -> list[int]:
+    def keep(movie):
+        movie_id, title, genre, year = movie
+        return (
+            filters.get("genre", genre) == genre
+            and int(filters.get("year_from", year)) <= year <= int(filters.get("year_to", year))
+            and title.lower().startswith(filters.get("title_prefix", "").lower())
+        )
+
+    column = sort.removeprefix("-")
+    key = {
+        "id": lambda movie: (movie[0],),
+        "title": lambda movie: (movie[1].lower(), movie[0]),
+        "release_year": lambda movie: (movie[3], movie[0]),
+    }[column]
+    return [movie[0] for movie in sorted(filter(keep, movies), key=key, reverse=sort.startswith("-"))]
+
+
+def fetch_all(client, params: dict) -> list[int]:
+    ids, cursor = [], None
+    for _ in range(100):
+        query = {**params, "limit": "7", **({"cursor": cursor} if cursor else {})}
+        response = client.get("/movies/", query_string=query)
+        assert response.status_code == 200, response.get_json()
+        body = response.get_json()
+        ids.extend(item["id"] for item in body["items"])
+        cursor = body["next_cursor"]
+        if cursor is None:
+            return ids
+    pytest.fail("el cursor no termino")
+
+
+@pytest.mark.parametrize("filters, sort", list(itertools.product(FILTERS, SORTS)))
+def test_filters_and_sort_page_through_every_match(client, movies, filters, sort):
+    expected = expected_ids(movies, filters, sort)
+
+    assert fetch_all(client, {**filters, "sort": sort}) == expected
+
+
+def test_filters_select_some_but_not_all_movies(movies):
+    for filters in FILTERS[1:]:
+        assert 0 < len(expected_ids(movies, filters, "id")) < len(movies)
+
+
+@pytest.mark.parametrize("query", [
+    {"sort": "genre"},
+    {"year_from": "dos mil"},
+    {"year_from": "2005", "year_to": "2000"},
+    {"title_prefix": " "},
+    {"genre": ""},
+])
+def test_invalid_filters_are_rejected(client, query):
+    assert client.get("/movies/", query_string=query).status_code == 400
+
+
+# Filtros para revisar planes sobre el dataset de `seed_database`: poco y muy
+# selectivos (casi no hay estrenos desde 2024), para que ANALYZE los distinga.
+PLAN_FILTERS = [
+    {},
+    {"genre": "horror"},
+    {"year_from": "1990", "year_to": "1999"},
+    {"year_from": "2024"},
+    {"title_prefix": "gol"},
+    {"genre": "horror", "year_from": "1990", "year_to": "1999"},
+    {"genre": "documentary", "title_prefix": "the"},
+]
+FILTER_INDEXES = ("ix_movies_genre_release_year", "ix_movies_release_year", "ix_movies_title_lower")
+
+
+class PlanConfig(TestingConfig):
+    SQL_INSTRUMENTATION = False
+    DETAIL_CACHE_MAX_SIZE = 0
+
+
+@pytest.fixture(scope="module", params=["sin stats", "ANALYZE"])
+def plan_client(request):
+    """Cliente sobre 3000 peliculas sembradas, sin estadisticas o despues de ANALYZE."""
+    app = create_app(PlanConfig)
+    with app.app_context():
+        db.create_all()
+        with db.engine.connect() as conn:
+            seed_database(conn, SeedPlan(users=1, movies=3000, series=1, entries=1))
+        if request.param == "ANALYZE":
+            db.session.execute(text("ANALYZE"))
+            db.session.commit()
+        yield app.test_client()
+        db.session.remove()
+
+
+def explain_pages(client, capture_queries, params: dict) -> list[str]:
+    """Planes (pasos unidos por " | ") de los SELECT de la primera pagina y la siguiente."""
+    query = {**params, "limit": "20"}
+
+    def fetch():
+        cursor = client.get("/movies/", query_string=query).get_json()["next_cursor"]
+        if cursor:
+            client.get("/movies/", query_string={**query, "cursor": cursor})
+
+    selects = [
+        (statement, parameters)
+        for statement, parameters in capture_queries(fetch)
+        if statement.startswith("SELECT") and "FROM movies" in statement and "count(" not in statement
+    ]
+    connection = db.session.connection()
+    plans = [
+        " | ".join(row[3] for row in connection.exec_driver_sql("EXPLAIN QUERY PLAN " + statement, parameters))
+        for statement, parameters in selects
+    ]
+    db.session.remove()
+    return plans
+
+
+@pytest.mark.parametrize("filters, sort", list(itertools.product(PLAN_FILTERS, SORTS)))
+def test_filters_and_sort_use_an_index(plan_client, capture_queries, filters, sort):
+    plans = explain_pages(plan_client, capture_queries, {**filters, "sort": sort})
+
+    assert plans
+    for plan in plans:
+        steps = plan.split(" | ")
+        if not filters and sort.removeprefix("-") == "id":
+            # Sin filtros el orden por id recorre el rowid y LIMIT lo corta.
+            assert steps[0] == "SCAN movies" or steps[0].startswith("SEARCH movies USING INTEGER PRIMARY KEY"), plan
+        else:
+            assert any(index in plan for index in FILTER_INDEXES), plan
+            assert "SCAN movies" not in steps, plan
@@ -0,0 +1,111 @@
+"""Progreso diferido: validacion al encolar y convivencia con el PATCH por lotes."""
+
+import pytest
+from flask import current_app
+from sqlalchemy import event
+
+from src import create_app
+from src.api.progress import ProgressService
+from src.config import TestingConfig
+from src.extensions import db, progress_buffer
+from src.models import Serie, User, WatchEntry
+
+
+class BufferedConfig(TestingConfig):
+    PROGRESS_BUFFER_ENABLED = True
+    # Sin vaciados de fondo durante el test: se vacia a mano.
+    PROGRESS_BUFFER_FLUSH_INTERVAL = 3600.0
+    PROGRESS_BUFFER_BATCH_SIZE = 10**9
+
+
+@pytest.fixture
+def app():
+    app = create_app(BufferedConfig)
+    with app.app_context():
+        db.create_all()
+        db.session.add(User(id=1, name="Ana"))
+        db.session.add(Serie(id=1, title="Serie", total_seasons=1, total_episodes=10))
+        db.session.add(WatchEntry(
+            user_id=1, content_type="serie", content_id=1, status="watching", watched_episodes=0, total_episodes=10,
+        ))
+        db.session.commit()
+        yield app
+        db.session.remove()
+
+
+def patch_progress(client, watched: int):
+    return client.patch("/progress/series/1", json={"watched_episodes": watched}, headers={"X-User-Id": "1"})
+
+
+def watched_episodes() -> int:
+    db.session.expire_all()
+    return WatchEntry.query.filter_by(user_id=1, content_id=1).one().watched_episodes
+
+
+def test_out_of_range_tick_is_rejected_without_losing_queued_progress(client):
+    for watched in (1, 2, 3):
+        assert patch_progress(client, watched).status_code == 202
+
+    response = patch_progress(client, 50)
+
+    assert response.status_code == 400
+    assert progress_buffer.flush() == 1
+    assert watched_episodes() == 3
+    assert progress_buffer.stats()["dropped"]["invalid"] == 0
+
+
+def test_tick_without_entry_is_rejected_when_enqueued(client):
+    response = client.patch("/progress/series/2", json={"watched_episodes": 1}, headers={"X-User-Id": "1"})
+
+    assert response.status_code == 400
+    assert progress_buffer.stats()["pending"] == 0
+
+
+def patch_batch(client, watched: int):
+    return client.patch(
+        "/progress/series", json=[{"series_id": 1, "watched_episodes": watched}], headers={"X-User-Id": "1"}
+    )
+
+
+def test_batch_write_replaces_older_queued_ticks(client):
+    assert patch_progress(client, 2).status_code == 202
+
+    assert patch_batch(client, 5).status_code == 200
+
+    assert progress_buffer.flush() == 0
+    assert watched_episodes() == 5
+
+
+def test_failed_batch_keeps_queued_ticks(client):
+    assert patch_progress(client, 2).status_code == 202
+
+    def fail(session):
+        raise RuntimeError("commit fallido")
+
+    event.listen(db.session, "before_commit", fail)
+    try:
+        assert patch_batch(client, 5).status_code == 500
+    finally:
+        event.remove(db.session, "before_commit", fail)
+    db.session.rollback()
+
+    assert progress_buffer.stats()["pending"] == 1
+    assert progress_buffer.flush() == 1
+    assert watched_episodes() == 2
+
+
+def test_ticks_queued_during_a_batch_survive_it(client, monkeypatch):
+    apply_many = ProgressService._apply_many_progress
+
+    def apply_with_concurrent_tick(self, *args):
+        # Un tick que llega mientras el lote escribe es mas nuevo que el lote.
+        assert not current_app.extensions["progress_buffer"].flush_lock.acquire(blocking=False)
+        progress_buffer.add(1, 1, {"watched_episodes": 7})
+        return apply_many(self, *args)
+
+    monkeypatch.setattr(ProgressService, "_apply_many_progress", apply_with_concurrent_tick)
+    assert patch_batch(client, 5).status_code == 200
+    assert watched_episodes() == 5
+
+    assert progress_buffer.flush() == 1
+    assert watched_episodes() == 7
@@ -0,0 +1,40 @@
+"""Carga masiva de series con temporadas anidadas."""
+
+import json
+
+from src.extensions import db
+from src.models import Season, Serie
+
+
+def ndjson(records) -> bytes:
+    return "\n".join(json.dumps(record) for record in records).encode()
+
+
+def test_each_batch_inserts_series_and_seasons_with_one_statement_each(client, count_queries):
+    records = [
+        {"title": f"Serie {i % 7}", "seasons": [{"number": n, "episodes_count": i + n} for n in range(1, i % 3 + 2)]}
+        for i in range(100)
+    ]
+    responses = []
+
+    queries = count_queries(lambda: responses.append(client.post(
+        "/series/bulk?batch_size=50", data=ndjson(records), content_type="application/x-ndjson"
+    )))
+
+    assert responses[0].get_json()["inserted"] == 100
+    # Por lote: INSERT de series y INSERT de temporadas (2 lotes).
+    assert queries == 4
+
+
+def test_seasons_belong_to_their_series(client):
+    records = [
+        {"title": "Repetida", "seasons": [{"number": 1, "episodes_count": i}]} for i in range(1, 6)
+    ] + [{"title": "Sin temporadas"}]
+
+    client.post("/series/bulk", data=ndjson(records), content_type="application/x-ndjson")
+
+    series = db.session.query(Serie).order_by(Serie.id).all()
+    assert [serie.total_episodes for serie in series] == [1, 2, 3, 4, 5, 0]
+    for serie in series:
+        seasons = db.session.query(Season).filter_by(series_id=serie.id).all()
+        assert sum(season.episodes_count for season in seasons) == serie.total_episodes
@@ -0,0 +1,50 @@
+"""La watchlist y las estadisticas emiten las mismas consultas sin importar el tamaño."""
+
+import pytest
+
+from src.extensions import db
+from src.models import Movie, Serie, User, WatchEntry
+
+
+@pytest.fixture
+def users(app):
+    """Usuario 1 con 2 entradas y usuario 2 con 200, mitad peliculas y mitad series."""
+    movies = [Movie(title=f"Pelicula {i}", genre="drama", release_year=2000 + i % 20) for i in range(100)]
+    series = [Serie(title=f"Serie {i}", total_seasons=1, total_episodes=10) for i in range(100)]
+    db.session.add_all([User(id=1, name="Ana"), User(id=2, name="Beto"), *movies, *series])
+    db.session.flush()
+
+    def entries(user_id: int, size: int) -> list[WatchEntry]:
+        half = size // 2
+        return [
+            *(WatchEntry(user_id=user_id, content_type="movie", content_id=movie.id, status="completed")
+              for movie in movies[:half]),
+            *(WatchEntry(user_id=user_id, content_type="serie", content_id=serie.id, status="watching",
+                         watched_episodes=i % 10, total_episodes=10)
+              for i, serie in enumerate(series[:size - half])),
+        ]
+
+    db.session.add_all(entries(1, 2) + entries(2, 200))
+    db.session.commit()
+    return {"small": 1, "large": 2}
+
+
+@pytest.mark.parametrize("path", ["/me/watchlist?limit=200", "/me/stats"])
+def test_query_count_does_not_grow_with_the_watchlist(client, count_queries, users, path):
+    def fetch(user_id: int):
+        def action():
+            response = client.get(path, headers={"X-User-Id": str(user_id)})
+            assert response.status_code == 200
+
+        return action
+
+    small = count_queries(fetch(users["small"]))
+    large = count_queries(fetch(users["large"]))
+
+    assert 0 < small == large
+
+
+def test_large_watchlist_is_served_in_one_page(client, users):
+    response = client.get("/me/watchlist?limit=200", headers={"X-User-Id": str(users["large"])})
+
+    assert len(response.get_json()["items"]) == 200